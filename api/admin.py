@@ -2,4 +2,9 @@ from django.contrib import admin
 # Change 'MedicalTerm' to 'Diagnosis' to match your models.py
 from .models import Diagnosis
 
-admin.site.register(Diagnosis)
\ No newline at end of file
+
+@admin.register(Diagnosis)
+class DiagnosisAdmin(admin.ModelAdmin):
+    list_display = ('term', 'namaste_code', 'icd_code')
+    ordering = ('term',)  # Served by the unique index on term
+    search_fields = ('=namaste_code', '=icd_code', 'search_key')
@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        # Register signal handlers (search index invalidation)
+        from . import signals  # noqa: F401
+        # Count database queries per request (api/metrics.py)
+        from . import metrics  # noqa: F401
+        # Fingerprint statements for N+1 / query budget checks (api/query_guard.py)
+        from . import query_guard  # noqa: F401
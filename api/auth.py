@@ -5,15 +5,50 @@ either username OR email address.
 
 Standard JWT authentication only accepts username.
 This custom implementation makes login more user-friendly.
+
+A login costs one database query: the user is found by an indexed
+case-insensitive lookup (migration 0010 adds LOWER(username) and
+LOWER(email) indexes) and the password is checked on that row, instead
+of authenticate() looking the user up a second time.
 """
 
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.contrib.auth.models import update_last_login
+from django.contrib.auth.signals import user_login_failed
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
+from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.exceptions import AuthenticationFailed
 
 
+# ============================================================================
+# USER LOOKUP
+# ============================================================================
+def find_login_user(identifier):
+    """
+    Find the user whose username or email matches, ignoring case.
+
+    Compares LOWER(column) = LOWER(identifier) so the functional indexes
+    from migration 0010 are used. (``__iexact`` compiles to LIKE on
+    SQLite and UPPER() on PostgreSQL, neither of which can use an index.)
+
+    Args:
+        identifier (str): Username or email address
+
+    Returns:
+        User: The matching user (lowest id if several match), or None
+    """
+    User = get_user_model()
+    value = Lower(Value(identifier))
+    return User.objects.filter(
+        Q(Exact(Lower('username'), value)) | Q(Exact(Lower('email'), value))
+    ).order_by('pk').first()
+
+
 # ============================================================================
 # CUSTOM JWT TOKEN SERIALIZER
 # ============================================================================
@@ -29,6 +64,13 @@ class UsernameEmailTokenObtainPairSerializer(TokenObtainPairSerializer):
     Returns standard JWT access and refresh tokens on success.
     """
 
+    # Either username or email may be given
+    email = serializers.CharField(required=False, write_only=True)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields[self.username_field].required = False
+
     def validate(self, attrs):
         """
         Custom validation to support username or email login.
@@ -42,12 +84,7 @@ class UsernameEmailTokenObtainPairSerializer(TokenObtainPairSerializer):
         Raises:
             AuthenticationFailed: If credentials are invalid or user is inactive
         """
-        # Extract username or email from request
-        request = self.context.get('request')
-        identifier = (
-            attrs.get('username')  # Try username field first
-            or (request.data.get('email') if request else None)  # Fall back to email
-        )
+        identifier = attrs.get(self.username_field) or attrs.get('email')
 
         # Validate that some identifier was provided
         if not identifier:
@@ -56,25 +93,41 @@ class UsernameEmailTokenObtainPairSerializer(TokenObtainPairSerializer):
                 code="no_credentials"
             )
 
-        # Look up user by username OR email (case-insensitive)
-        User = get_user_model()
-        user = User.objects.filter(
-            Q(username__iexact=identifier) | Q(email__iexact=identifier)
-        ).first()
+        # Look up user by username OR email (case-insensitive, indexed)
+        user = find_login_user(identifier)
 
-        # Validate user exists and is active
-        if not user or not user.is_active:
+        # Check the password on the row we already have (ModelBackend
+        # semantics) rather than calling authenticate(), which would
+        # query the user again
+        if user is None:
+            # Hash anyway, so the response time does not reveal whether
+            # the account exists
+            get_user_model()().set_password(attrs['password'])
+        elif not user.check_password(attrs['password']):
+            user = None
+
+        # Validate user exists, password matches and user is active
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            user_login_failed.send(
+                sender=__name__,
+                credentials={'username': identifier},
+                request=self.context.get('request'),
+            )
             raise AuthenticationFailed(
                 self.error_messages['no_active_account'],
                 code='no_active_account'
             )
 
-        # Convert email to username for parent serializer
-        # (SimpleJWT expects 'username' field)
-        attrs['username'] = user.username
-        
-        # Call parent validation to generate tokens
-        return super().validate(attrs)
+        # Issue the tokens (what TokenObtainPairSerializer.validate does
+        # after authenticating)
+        self.user = user
+        refresh = self.get_token(user)
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        return {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+        }
 
 
 # ============================================================================
@@ -0,0 +1,109 @@
+"""Cached JWT Authentication for Ayush Bridge
+
+CachedJWTAuthentication (the DRF default authentication class) remembers
+verified access tokens with their users, so repeat requests with the
+same token skip the signature check and the user query.
+
+Kept apart from api/auth.py: DRF imports its default authentication
+classes while rest_framework.views loads, which api/auth.py imports.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+# ============================================================================
+# CACHED JWT AUTHENTICATION
+# ============================================================================
+# Per-process LRU of verified tokens: raw token -> (expires_at, user, token).
+# Keyed by the whole encoded token, not its jti claim: the claims are only
+# trustworthy after the signature check this cache skips.
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def cached_token(raw_token):
+    """Return (user, validated token) for a remembered token, or None."""
+    with _token_cache_lock:
+        entry = _token_cache.get(raw_token)
+        if entry is None:
+            return None
+        expires_at, user, validated_token = entry
+        if expires_at <= time.time():
+            del _token_cache[raw_token]
+            return None
+        _token_cache.move_to_end(raw_token)
+    # Each request gets its own copy - views may modify request.user
+    return copy.copy(user), validated_token
+
+
+def remember_token(raw_token, user, validated_token):
+    """
+    Cache a verified token until it expires, or at most JWT_AUTH_CACHE_TTL
+    seconds (so changes to the user made by other workers are picked up).
+    """
+    size = getattr(settings, 'JWT_AUTH_CACHE_SIZE', 10_000)
+    if not size:
+        return
+    expires_at = validated_token['exp']
+    ttl = getattr(settings, 'JWT_AUTH_CACHE_TTL', None)
+    if ttl is not None:
+        expires_at = min(expires_at, time.time() + ttl)
+    with _token_cache_lock:
+        _token_cache[raw_token] = (expires_at, copy.copy(user), validated_token)
+        _token_cache.move_to_end(raw_token)
+        while len(_token_cache) > size:
+            _token_cache.popitem(last=False)
+
+
+def forget_user_tokens(user_id):
+    """Drop every cached token of a user (called when the user changes)."""
+    with _token_cache_lock:
+        for raw_token in [key for key, entry in _token_cache.items() if entry[1].pk == user_id]:
+            del _token_cache[raw_token]
+
+
+def clear_token_cache():
+    """Drop every cached token."""
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication with a bounded in-process cache of verified tokens.
+
+    The first request with an access token verifies it and loads its user
+    as usual; repeat requests with the same token are served from the
+    cache until the token expires (capped by JWT_AUTH_CACHE_TTL). Saving
+    or deleting a user drops their tokens in this process (api/signals.py).
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        cached = cached_token(raw_token)
+        if cached is not None:
+            return cached
+
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_user(validated_token)
+        remember_token(raw_token, user, validated_token)
+        return user, validated_token
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """OpenAPI (drf-spectacular): document CachedJWTAuthentication as the Bearer JWT scheme."""
+    target_class = CachedJWTAuthentication
@@ -0,0 +1,145 @@
+"""Prefix Autocomplete for Ayush Bridge
+
+Typeahead completions served from a sorted array instead of fuzzy search.
+
+Every normalised term is tokenised into words (Sanskrit name and English
+gloss alike), and each word-boundary suffix of the token sequence becomes
+one entry, e.g. "vishama jwara (malaria)" ->
+    "vishama jwara malaria", "jwara malaria", "malaria"
+
+A prefix ("jwa", "vishama jw") is answered by bisecting the sorted
+entries. Rows are ranked by (term length, term), shortest first.
+
+Prefixes matching more than SCAN_LIMIT entries have their top results
+precomputed at build time, so a lookup never touches more than
+SCAN_LIMIT entries whatever the corpus size.
+"""
+
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+
+from .normalize import fold
+from .search_index import get_search_index
+from .trigrams import WORD_SEPARATOR
+
+
+# Largest number of entries a lookup scans; bigger ranges are precomputed
+SCAN_LIMIT = 256
+
+# Sorts after any character a prefix can contain
+MAX_CHAR = chr(0x10FFFF)
+
+
+def normalize_prefix(prefix):
+    """Normalise a raw prefix the same way entries are built ("Vishama  Jw" -> "vishama jw")."""
+    return ' '.join(word for word in WORD_SEPARATOR.split(fold(prefix)) if word)
+
+
+class AutocompleteIndex:
+    """
+    Sorted word-boundary suffixes of a SearchIndex's keys.
+
+    Attributes:
+        index: SearchIndex the completions refer to
+        limit: Number of completions returned per prefix
+        entries: Sorted suffix strings
+        ranks: Rank of the row each entry belongs to (parallel to entries)
+        positions: Row position for each rank (rank -> SearchIndex position)
+        top: Prefix -> precomputed best ranks, for prefixes matching
+            more than SCAN_LIMIT entries
+    """
+    __slots__ = ('index', 'limit', 'entries', 'ranks', 'positions', 'top')
+
+    def __init__(self, index, limit):
+        self.index = index
+        self.limit = limit
+        # Two stable single-key sorts are much faster than one tuple-key sort
+        by_term = sorted(range(len(index)), key=index.terms.__getitem__)
+        self.positions = sorted(by_term, key=index.lengths.__getitem__)
+
+        entries = []
+        ranks = array('I')
+        for rank, position in enumerate(self.positions):
+            words = [word for word in WORD_SEPARATOR.split(index.keys[position]) if word]
+            suffixes = dict.fromkeys(' '.join(words[start:]) for start in range(len(words)))
+            entries.extend(suffixes)
+            ranks.extend([rank] * len(suffixes))
+        order = sorted(range(len(entries)), key=entries.__getitem__)
+        self.entries = [entries[i] for i in order]
+        self.ranks = array('I', [ranks[i] for i in order])
+
+        self.top = {}
+        self._precompute('', 0, len(self.entries))
+
+    def _precompute(self, prefix, lo, hi):
+        """Store the best ranks for ``prefix`` and its children if their range is large."""
+        if hi - lo <= SCAN_LIMIT:
+            return
+        self.top[prefix] = heapq.nsmallest(self.limit, set(self.ranks[lo:hi]))
+
+        depth = len(prefix)
+        entries = self.entries
+        start = lo
+        while start < hi and len(entries[start]) == depth:
+            start += 1  # Entry equal to the prefix itself
+        while start < hi:
+            child = prefix + entries[start][depth]
+            end = bisect_left(entries, child + MAX_CHAR, start, hi)
+            self._precompute(child, start, end)
+            start = end
+
+    def complete(self, prefix):
+        """
+        Return result dicts for rows with a word sequence starting with ``prefix``.
+
+        ``prefix`` must already be normalised (see normalize_prefix).
+        """
+        ranks = self.top.get(prefix)
+        if ranks is None:
+            lo = bisect_left(self.entries, prefix)
+            hi = bisect_left(self.entries, prefix + MAX_CHAR, lo)
+            ranks = heapq.nsmallest(self.limit, set(self.ranks[lo:hi]))
+        return [self.index.result(self.positions[rank]) for rank in ranks]
+
+
+# ============================================================================
+# PER-PROCESS AUTOCOMPLETE INDEX CACHE
+# ============================================================================
+_autocomplete = None
+_autocomplete_lock = threading.Lock()
+
+
+def get_autocomplete_index():
+    """Return the autocomplete index for the current search index, rebuilding it if needed."""
+    global _autocomplete
+
+    index = get_search_index()
+    autocomplete = _autocomplete
+    if autocomplete is not None and autocomplete.index is index:
+        return autocomplete
+
+    with _autocomplete_lock:
+        if _autocomplete is None or _autocomplete.index is not index:
+            _autocomplete = AutocompleteIndex(index, getattr(settings, 'AUTOCOMPLETE_LIMIT', 10))
+        return _autocomplete
+
+
+def autocomplete(prefix):
+    """
+    Return up to AUTOCOMPLETE_LIMIT diagnoses whose words start with ``prefix``.
+
+    Args:
+        prefix (str): Raw text typed so far (e.g. "jwa", "Vishama Jw")
+
+    Returns:
+        list[dict]: Results with term, NAMASTE code and ICD-11 code,
+        shortest term first. Empty for an empty prefix.
+    """
+    prefix = normalize_prefix(prefix)
+    if not prefix:
+        return []
+    return get_autocomplete_index().complete(prefix)
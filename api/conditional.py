@@ -0,0 +1,111 @@
+"""Conditional GET Support for Ayush Bridge API
+
+ETag / Last-Modified / Cache-Control decorators for read-only dataset
+views (sync and async).
+
+Validators are derived from the DatasetVersion stamp (plus the request URL
+for the ETag), so they can be computed - and a 304 returned - before any
+search scoring or index lookup happens. Only successful responses (200,
+or the 304 answering a revalidation) are given validators and public
+caching: a 400 for a bad cursor or a 404 for an unknown code must not be
+stored by browsers and CDNs as if it were the dataset.
+"""
+
+import functools
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .search_index import adataset_stamp, dataset_stamp
+
+
+def make_etag(request, version):
+    """
+    Hash of the full request path (query string included) and the
+    dataset version: it changes whenever the Diagnosis data changes.
+    """
+    key = f'{request.get_full_path()}|v{version}'
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+def is_cacheable(response):
+    """True if ``response`` may carry dataset validators and public caching."""
+    return response.status_code in (200, 304)
+
+
+def add_validators(request, response, etag, last_modified):
+    """Set ETag / Last-Modified on a GET or HEAD response, as condition() does."""
+    if request.method in ('GET', 'HEAD'):
+        if last_modified is not None and not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(last_modified)
+        response.headers.setdefault('ETag', etag)
+
+
+def dataset_validators(request):
+    """Quoted ETag and Last-Modified timestamp (None if unknown) for ``request``."""
+    version, updated_at = dataset_stamp()
+    return quote_etag(make_etag(request, version)), int(updated_at.timestamp()) if updated_at else None
+
+
+def dataset_conditional(view):
+    """
+    Conditional GET decorator for sync dataset views.
+
+    Equivalent of condition() with the dataset ETag / Last-Modified,
+    except that error responses are returned without validators.
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        etag, last_modified = dataset_validators(request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = view(request, *args, **kwargs)
+        if is_cacheable(response):
+            add_validators(request, response, etag, last_modified)
+        return response
+    return wrapper
+
+
+def dataset_cache_control(max_age):
+    """
+    cache_control(public=True, max_age=max_age) for sync dataset views,
+    applied to successful responses only.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            if is_cacheable(response):
+                patch_cache_control(response, public=True, max_age=max_age)
+            return response
+        return wrapper
+    return decorator
+
+
+def async_dataset_conditional(max_age):
+    """
+    Conditional GET + Cache-Control decorator for async (ASGI) dataset views.
+
+    Async equivalent of dataset_conditional combined with cache_control(public=True, max_age=max_age): the
+    dataset stamp is read without blocking the event loop. Errors (400,
+    404, 503 under backpressure) get neither validators nor caching.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            version, updated_at = await adataset_stamp()  # dataset_validators() without blocking
+            etag = quote_etag(make_etag(request, version))
+            last_modified = int(updated_at.timestamp()) if updated_at else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if not is_cacheable(response):
+                return response
+
+            add_validators(request, response, etag, last_modified)
+            patch_cache_control(response, public=True, max_age=max_age)
+            return response
+        return wrapper
+    return decorator
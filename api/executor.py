@@ -0,0 +1,89 @@
+"""Bounded Executor for Async Views in Ayush Bridge
+
+CPU-heavy work (fuzzy scoring) must not run on the ASGI event loop, and
+must not pile up without limit when traffic exceeds what the CPUs can
+score. BoundedExecutor runs jobs on a fixed thread pool and refuses new
+jobs (Saturated) once SEARCH_ASYNC_MAX_PENDING are queued or running,
+so views can answer 503 + Retry-After instead of queueing forever.
+
+Jobs may query the database (index reload, FTS5 shortlist). Each worker
+thread keeps its own connection, so old and broken connections are
+closed around every job, as Django does around each request.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+class Saturated(Exception):
+    """Raised when the executor already has max_pending jobs in flight."""
+
+
+def _run_job(func, *args, **kwargs):
+    """Run a job with the connection housekeeping of a request thread."""
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a hard limit on queued + running jobs.
+
+    Args:
+        workers (int): Worker threads
+        max_pending (int): Jobs allowed in flight before submissions are refused
+    """
+
+    def __init__(self, workers, max_pending):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='search')
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run ``func(*args, **kwargs)`` on the pool and await its result.
+
+        Raises:
+            Saturated: If max_pending jobs are already in flight
+        """
+        if not self._slots.acquire(blocking=False):
+            raise Saturated()
+        try:
+            # Run in a copy of the caller's context, like sync_to_async, so
+            # request-scoped state (api/metrics.py stats) reaches the job
+            context = contextvars.copy_context()
+            future = self._executor.submit(context.run, _run_job, func, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Release the slot when the job really finishes - not when the
+        # awaiting request is cancelled (e.g. the client disconnected)
+        future.add_done_callback(lambda _future: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_search_executor():
+    """Return this process's search executor, created on first use from settings."""
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = getattr(settings, 'SEARCH_ASYNC_WORKERS', None) or os.cpu_count() or 1
+                max_pending = getattr(settings, 'SEARCH_ASYNC_MAX_PENDING', None) or workers * 8
+                _executor = BoundedExecutor(workers, max_pending)
+    return _executor
@@ -0,0 +1,127 @@
+"""SQLite FTS5 Search Backend for Ayush Bridge
+
+Alternative to the in-process engine (settings.SEARCH_ENGINE = 'fts5'):
+the database returns a shortlist of candidate rows from an FTS5 table
+(trigram tokenizer) ranked by bm25, and only that shortlist is fuzzy
+re-ranked in Python with the usual scoring (api/scoring.py).
+
+The FTS5 table is an external-content index over Diagnosis.search_key,
+kept in sync by SQLite triggers - so bulk_create / bulk_update / raw SQL
+writes are covered too, not just model saves.
+
+The index is optional: migration 0008 creates it only when SEARCH_ENGINE
+is 'fts5' and the SQLite build has FTS5 with the trigram tokenizer
+(3.34+), so the triggers cost nothing otherwise. `python manage.py
+fts_index` creates (or with --drop removes) it later.
+
+Note: on SQLite, migrations that rebuild the api_diagnosis table (some
+AlterField operations) drop its triggers. Such a migration must re-create
+them from its own copy of the SQL (as 0009 does) when the index exists.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connection
+
+
+FTS_TABLE = 'api_diagnosis_fts'
+
+# Smallest query the trigram tokenizer can match
+MIN_QUERY_LENGTH = 3
+
+CREATE_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        search_key, content='api_diagnosis', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON api_diagnosis BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, search_key) VALUES (new.id, new.search_key);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON api_diagnosis BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_key) VALUES ('delete', old.id, old.search_key);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF search_key ON api_diagnosis BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_key) VALUES ('delete', old.id, old.search_key);
+        INSERT INTO {FTS_TABLE}(rowid, search_key) VALUES (new.id, new.search_key);
+    END""",
+    # Index the rows that already exist
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_STATEMENTS = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def create_fts_index(cursor):
+    """Create (or re-create the triggers of) the FTS5 index and fill it."""
+    for statement in CREATE_STATEMENTS:
+        cursor.execute(statement)
+
+
+def fts_index_exists(cursor):
+    """Return True if the FTS5 table has been created."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+    return cursor.fetchone() is not None
+
+
+def drop_fts_index(cursor):
+    """Remove the FTS5 index and its triggers."""
+    for statement in DROP_STATEMENTS:
+        cursor.execute(statement)
+
+
+def match_expression(query):
+    """
+    Build an FTS5 query matching any trigram of a normalised query.
+
+    Example:
+        "jwara" -> '"jwa" OR "war" OR "ara"'
+    """
+    grams = dict.fromkeys(query[i:i + 3] for i in range(len(query) - 2))
+    return ' OR '.join('"{}"'.format(gram.replace('"', '""')) for gram in grams)
+
+
+def shortlist(query, size=None, phonetic=None):
+    """
+    Return up to ``size`` candidate rows for a normalised query, best bm25
+    first, plus every row whose phonetic_key is ``phonetic`` - in one query.
+
+    Returns:
+        list[tuple]: (term, namaste_code, icd_code, search_key, phonetic_key) rows
+    """
+    if connection.vendor != 'sqlite':
+        raise ImproperlyConfigured("SEARCH_ENGINE = 'fts5' requires the SQLite database backend")
+    if size is None:
+        size = getattr(settings, 'SEARCH_FTS_SHORTLIST', 200)
+
+    with connection.cursor() as cursor:
+        # UNION drops shortlisted rows that are phonetic hits too; an empty
+        # key is passed as NULL, which matches nothing
+        try:
+            cursor.execute(
+                f"""
+                SELECT term, namaste_code, icd_code, search_key, phonetic_key
+                FROM api_diagnosis
+                WHERE phonetic_key = %s
+                UNION
+                SELECT * FROM (
+                    SELECT d.term, d.namaste_code, d.icd_code, d.search_key, d.phonetic_key
+                    FROM {FTS_TABLE} AS f
+                    JOIN api_diagnosis AS d ON d.id = f.rowid
+                    WHERE {FTS_TABLE} MATCH %s
+                    ORDER BY f.rank
+                    LIMIT %s
+                )
+                """,
+                [phonetic or None, match_expression(query), size],
+            )
+        except OperationalError as exc:
+            if FTS_TABLE not in str(exc):
+                raise
+            raise ImproperlyConfigured(
+                "SEARCH_ENGINE = 'fts5' needs the FTS5 index: run `python manage.py fts_index`"
+            ) from exc
+        return cursor.fetchall()
@@ -0,0 +1,249 @@
+"""Bulk Diagnosis Importer for Ayush Bridge
+
+Streams a NAMASTE / ICD-11 mapping CSV (term, namaste_code, icd_code)
+into the Diagnosis table in batches, inside a single transaction.
+
+Two modes:
+1. Full import (import_rows) - upserts every row, so stored terms take
+   the file's codes (the old get_or_create loader kept the first codes it
+   saw); memory is bounded by the batch size, so multi-million-row
+   releases can be imported
+2. Incremental import (sync_rows) - compares a content hash per row with
+   the stored one and only inserts, updates or retires (deletes) rows
+   that differ; an unchanged release performs zero writes. Retiring can
+   be turned off, and a dry run counts the changes without writing
+
+If a term appears more than once in a file, its last row wins in both
+modes.
+
+Either way the dataset version is bumped at most once per run.
+"""
+
+import csv
+import time
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from .models import Diagnosis
+from .signals import deferred_dataset_changes, notify_dataset_changed
+
+
+# Rows written per bulk_create() / bulk_update() call
+DEFAULT_BATCH_SIZE = 1000
+
+
+@dataclass
+class ImportResult:
+    """Summary of an import run."""
+    rows: int = 0          # Valid data rows read from the file
+    created: int = 0       # Rows that did not exist before
+    updated: int = 0       # Existing rows whose codes changed (incremental mode)
+    retired: int = 0       # Rows deleted because they left the release (incremental mode)
+    seconds: float = 0.0   # Wall-clock duration
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def writes(self):
+        return self.created + self.updated + self.retired
+
+
+def read_rows(file):
+    """
+    Yield (term, namaste_code, icd_code) tuples from an open CSV file.
+
+    Mirrors the rules of the original simple_load.py:
+    - the first row (column headers) is skipped
+    - empty lines and "---" series header lines are skipped
+    - rows with fewer than 3 columns are skipped
+    """
+    reader = csv.reader(file)
+
+    # Skip the first row (headers)
+    next(reader, None)
+
+    for row in reader:
+        # Skip empty lines or Series headers
+        if not row or row[0].startswith("---"):
+            continue
+
+        # Ensure the row has enough columns (term, namaste, icd)
+        if len(row) >= 3:
+            yield row[0], row[1], row[2]
+
+
+# Columns rewritten when an existing row changes
+UPDATE_FIELDS = [
+    'namaste_code', 'icd_code', 'content_hash',
+    'search_key', 'phonetic_key',
+]
+
+
+def _build(term, namaste_code, icd_code, pk=None):
+    """Create an unsaved Diagnosis with its hash and search keys filled in."""
+    return Diagnosis(
+        pk=pk,
+        term=term,
+        namaste_code=namaste_code,
+        icd_code=icd_code,
+        **Diagnosis.derived_fields(term, namaste_code, icd_code),
+    )
+
+
+def _write_batch(batch):
+    """Upsert one batch of rows keyed on the unique term."""
+    Diagnosis.objects.bulk_create(
+        [
+            _build(term, namaste_code, icd_code)
+            for term, (namaste_code, icd_code) in batch.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['term'],
+        update_fields=UPDATE_FIELDS,
+    )
+
+
+def import_rows(rows, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Upsert an iterable of (term, namaste_code, icd_code) rows.
+
+    Args:
+        rows: Iterable of row tuples (consumed lazily)
+        batch_size (int): Rows per bulk_create() call
+        progress (callable): Optional callback receiving the ImportResult
+            after every batch
+
+    Returns:
+        ImportResult: Row counts and timing
+    """
+    result = ImportResult()
+    started = time.perf_counter()
+
+    with transaction.atomic(), deferred_dataset_changes():
+        existing = Diagnosis.objects.count()
+
+        # term -> (namaste_code, icd_code); later duplicates win, as an
+        # upsert cannot touch the same row twice in one statement
+        batch = {}
+        for term, namaste_code, icd_code in rows:
+            batch[term] = (namaste_code, icd_code)
+            result.rows += 1
+            if len(batch) >= batch_size:
+                _write_batch(batch)
+                batch = {}
+                if progress:
+                    result.seconds = time.perf_counter() - started
+                    progress(result)
+        if batch:
+            _write_batch(batch)
+
+        result.created = Diagnosis.objects.count() - existing
+
+        # bulk_create() sends no signals - report the change explicitly
+        if result.rows:
+            notify_dataset_changed()
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def sync_rows(rows, batch_size=DEFAULT_BATCH_SIZE, progress=None, retire=True, dry_run=False):
+    """
+    Incrementally apply a full release of (term, namaste_code, icd_code) rows.
+
+    Each row's content hash is compared with the stored one:
+    - unknown term          -> inserted
+    - known term, new hash  -> updated
+    - stored term not seen  -> retired (deleted), unless ``retire`` is False
+    - same hash             -> untouched
+
+    The release is read into a term -> codes dict first, so a term that
+    appears more than once takes its last occurrence, as in import_rows();
+    a full import followed by an incremental run of the same file writes
+    nothing. Memory holds the release's (term, codes) and the stored
+    rows' (term, id, hash).
+
+    Args:
+        retire (bool): Delete stored rows missing from the release
+        dry_run (bool): Count the changes without writing anything
+
+    Returns:
+        ImportResult: Row counts (what would change, for a dry run) and timing
+    """
+    result = ImportResult()
+    started = time.perf_counter()
+
+    # term -> (namaste_code, icd_code); later duplicates win
+    release = {}
+    for term, namaste_code, icd_code in rows:
+        release[term] = (namaste_code, icd_code)
+        result.rows += 1
+
+    with transaction.atomic(), deferred_dataset_changes():
+        # term -> (id, content_hash) for everything currently stored
+        stored = {
+            term: (pk, content_hash)
+            for pk, term, content_hash in Diagnosis.objects.order_by()
+            .values_list('id', 'term', 'content_hash')
+            .iterator(chunk_size=batch_size)
+        }
+        to_create = []
+        to_update = []
+
+        def flush():
+            if to_create and not dry_run:
+                Diagnosis.objects.bulk_create(to_create, batch_size=batch_size)
+            if to_update and not dry_run:
+                Diagnosis.objects.bulk_update(to_update, UPDATE_FIELDS, batch_size=batch_size)
+            result.created += len(to_create)
+            result.updated += len(to_update)
+            to_create.clear()
+            to_update.clear()
+
+        for term, (namaste_code, icd_code) in release.items():
+            current = stored.get(term)
+            content_hash = Diagnosis.compute_content_hash(term, namaste_code, icd_code)
+            if current is None:
+                to_create.append(_build(term, namaste_code, icd_code))
+            elif current[1] != content_hash:
+                to_update.append(_build(term, namaste_code, icd_code, pk=current[0]))
+
+            if len(to_create) + len(to_update) >= batch_size:
+                flush()
+                if progress:
+                    result.seconds = time.perf_counter() - started
+                    progress(result)
+        flush()
+
+        # Retire rows missing from the release (per-row delete signals
+        # are coalesced by deferred_dataset_changes())
+        if retire:
+            retired_ids = [pk for term, (pk, _) in stored.items() if term not in release]
+            if dry_run:
+                result.retired = len(retired_ids)
+            else:
+                for start in range(0, len(retired_ids), batch_size):
+                    chunk = retired_ids[start:start + batch_size]
+                    result.retired += Diagnosis.objects.filter(id__in=chunk).delete()[0]
+
+        # Bump the dataset version once, and only if something changed
+        if result.writes and not dry_run:
+            notify_dataset_changed()
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def import_csv(path, batch_size=DEFAULT_BATCH_SIZE, progress=None, incremental=False, **options):
+    """
+    Import a mapping CSV file from ``path``.
+
+    See import_rows() (default) and sync_rows() (``incremental=True``,
+    which also takes the ``retire`` and ``dry_run`` options).
+    """
+    load = sync_rows if incremental else import_rows
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        return load(read_rows(file), batch_size=batch_size, progress=progress, **options)
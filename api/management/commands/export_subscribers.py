@@ -0,0 +1,63 @@
+"""Export email subscribers as CSV or NDJSON, streaming from the database."""
+from django.core.management.base import BaseCommand, CommandError
+
+from api.streaming import BLOCK_LINES, iter_blocks, iter_csv, iter_ndjson
+from api.subscriptions import SUBSCRIBER_FIELDS, parse_date_bound, subscriber_rows
+
+
+class Command(BaseCommand):
+    help = 'Export email subscribers (oldest first) as CSV or NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=('csv', 'ndjson'),
+            default='csv',
+            help='Output format (default: csv)',
+        )
+        parser.add_argument(
+            '--since',
+            help='Only subscribers who joined at or after this date / ISO datetime',
+        )
+        parser.add_argument(
+            '--until',
+            help='Only subscribers who joined before this date / ISO datetime',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Rows fetched from the database at a time (default: SUBSCRIBER_EXPORT_CHUNK_SIZE)',
+        )
+        parser.add_argument(
+            '-o', '--output',
+            help='File to write (default: standard output)',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        if chunk_size is not None and chunk_size < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        try:
+            since = parse_date_bound(options['since']) if options['since'] else None
+            until = parse_date_bound(options['until']) if options['until'] else None
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        rows = subscriber_rows(since, until, chunk_size)
+        if options['format'] == 'csv':
+            lines = iter_csv(rows, SUBSCRIBER_FIELDS)
+        else:
+            lines = iter_ndjson(rows)
+
+        output = options['output']
+        if not output:
+            for block in iter_blocks(lines, BLOCK_LINES):
+                self.stdout.write(block, ending='')
+            return
+
+        # newline='': the CSV writer already ends lines with \r\n
+        with open(output, 'w', newline='', encoding='utf-8') as out:
+            for block in iter_blocks(lines, BLOCK_LINES):
+                out.write(block)
+        self.stderr.write(self.style.SUCCESS(f'✅ Exported subscribers to {output}'))
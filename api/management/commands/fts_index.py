@@ -0,0 +1,36 @@
+"""Create or drop the optional SQLite FTS5 index used by SEARCH_ENGINE = 'fts5'."""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, transaction
+
+from api.fts import create_fts_index, drop_fts_index
+
+
+class Command(BaseCommand):
+    help = "Create (or with --drop remove) the FTS5 index for SEARCH_ENGINE = 'fts5'"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            help='Remove the index and its triggers instead',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The FTS5 index requires the SQLite database backend')
+
+        if options['drop']:
+            with connection.cursor() as cursor:
+                drop_fts_index(cursor)
+            self.stdout.write(self.style.SUCCESS('✅ Dropped the FTS5 index'))
+            return
+
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                create_fts_index(cursor)
+        except OperationalError as exc:
+            raise CommandError(
+                f'This SQLite build cannot create the index ({exc}); '
+                'FTS5 with the trigram tokenizer needs SQLite 3.34 or later'
+            )
+        self.stdout.write(self.style.SUCCESS('✅ FTS5 index created and filled'))
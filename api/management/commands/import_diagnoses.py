@@ -0,0 +1,88 @@
+"""Import NAMASTE / ICD-11 mappings from a CSV file in batches."""
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.importer import DEFAULT_BATCH_SIZE, import_csv
+
+
+class Command(BaseCommand):
+    help = 'Import NAMASTE / ICD-11 diagnosis mappings from a CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'csv_path',
+            nargs='?',
+            default='ayush_data.csv',
+            help='CSV file with term,namaste_code,icd_code columns (default: ayush_data.csv)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per bulk insert (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only insert, update or retire rows whose content hash differs',
+        )
+        parser.add_argument(
+            '--no-retire',
+            action='store_true',
+            help='With --incremental: keep stored rows that are missing from the file',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='With --incremental: report what would change without writing',
+        )
+
+    def handle(self, *args, **options):
+        path = options['csv_path']
+        batch_size = options['batch_size']
+        verbosity = options['verbosity']
+        incremental = options['incremental']
+        retire = not options['no_retire']
+        dry_run = options['dry_run']
+
+        if not os.path.exists(path):
+            raise CommandError(f'{path} not found')
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if (dry_run or not retire) and not incremental:
+            raise CommandError('--dry-run and --no-retire require --incremental')
+
+        mode = 'incremental, dry run' if dry_run else 'incremental' if incremental else 'full'
+        self.stdout.write(f'Importing {path} ({mode}, batch size {batch_size})...')
+
+        def progress(result):
+            if verbosity >= 2:
+                self.stdout.write(
+                    f'   {result.rows} rows ({result.rows_per_second:,.0f} rows/s)'
+                )
+
+        if incremental:
+            result = import_csv(
+                path, batch_size=batch_size, progress=progress, incremental=True,
+                retire=retire, dry_run=dry_run,
+            )
+        else:
+            result = import_csv(path, batch_size=batch_size, progress=progress)
+
+        if incremental:
+            summary = f'{result.created} new, {result.updated} updated, {result.retired} retired'
+        else:
+            summary = f'{result.created} new'
+        if dry_run:
+            self.stdout.write(f'Dry run: {result.rows} rows read ({summary}) - nothing was written')
+            return
+        if result.retired:
+            self.stderr.write(self.style.WARNING(
+                f'⚠️ Retired {result.retired} stored rows missing from {path}. '
+                f'Use --dry-run to preview and --no-retire to keep them.'
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Imported {result.rows} rows ({summary}) '
+            f'in {result.seconds:.2f}s - {result.rows_per_second:,.0f} rows/s'
+        ))
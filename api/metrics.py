@@ -0,0 +1,197 @@
+"""Request Metrics for Ayush Bridge
+
+Prometheus metrics for every HTTP request, recorded by
+backend.middleware.RequestMetricsMiddleware and exposed at /metrics:
+
+- ayush_http_request_duration_seconds: latency histogram per route
+- ayush_http_response_size_bytes: response body size histogram per route
+- ayush_db_queries_per_request: database queries per request, per route
+- ayush_db_query_duration_seconds_total: time spent in the database, per route
+- ayush_search_cache_lookups_total: search result cache hits / misses
+- ayush_query_guard_violations_total: N+1 / query budget violations (api/query_guard.py)
+
+Routes are URL patterns ("api/map/namaste/<str:code>/"), not raw paths,
+so label cardinality stays bounded.
+
+Multiple gunicorn workers: when PROMETHEUS_MULTIPROC_DIR is set (see
+backend/gunicorn_metrics.py) each worker writes its samples to mmap
+files in that directory and /metrics aggregates all of them, whichever
+worker answers the scrape. Without it (runserver, tests) metrics are
+kept in-process.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+REQUEST_DURATION = Histogram(
+    'ayush_http_request_duration_seconds',
+    'Time from the request entering Django to the response leaving it',
+    ['method', 'route', 'status'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+RESPONSE_SIZE = Histogram(
+    'ayush_http_response_size_bytes',
+    'Response body size (streaming responses are not included)',
+    ['method', 'route'],
+    buckets=(100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000),
+)
+
+DB_QUERIES = Histogram(
+    'ayush_db_queries_per_request',
+    'Database queries run while handling a request',
+    ['method', 'route'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+DB_DURATION = Counter(
+    'ayush_db_query_duration_seconds',
+    'Time spent executing database queries',
+    ['method', 'route'],
+)
+
+SEARCH_CACHE_LOOKUPS = Counter(
+    'ayush_search_cache_lookups',
+    'Search result cache lookups',
+    ['result'],
+)
+
+# Label used for requests that matched no URL pattern (404s)
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+# ============================================================================
+# PER-REQUEST STATISTICS
+# ============================================================================
+class RequestStats:
+    """
+    Timing data collected while one request is handled.
+
+    Attributes:
+        started: perf_counter() value when the request entered Django
+        queries: Database queries run so far
+        db_seconds: Time spent in those queries
+        stages: Stage name -> seconds, from api.profiling.stage() blocks
+        request: The Django request
+        fingerprints: SQL fingerprint -> executions (api/query_guard.py)
+        stacks: SQL fingerprint -> call stack, for repeated statements
+        budget_stack: Call stack of the query that exceeded the budget
+    """
+    __slots__ = ('started', 'queries', 'db_seconds', 'stages', 'request', 'fingerprints', 'stacks', 'budget_stack')
+
+    def __init__(self, request=None):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.stages = {}
+        self.request = request
+        self.fingerprints = {}
+        self.stacks = {}
+        self.budget_stack = None
+
+
+# Stats of the request being handled. Context variables follow the request
+# into sync_to_async / async_to_sync threads, so queries run by async views
+# through the async ORM are counted too.
+_current = ContextVar('ayush_request_stats', default=None)
+
+
+def begin_request(request=None):
+    """Start collecting stats for a request; returns a token for end_request()."""
+    return _current.set(RequestStats(request))
+
+
+def current_stats():
+    """Return the RequestStats of the request being handled, or None."""
+    return _current.get()
+
+
+def route_of(request):
+    """Return the URL pattern a request matched (metrics label style)."""
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match is not None else UNMATCHED_ROUTE
+
+
+def end_request(token, request, response):
+    """
+    Record a finished request and add its Server-Timing header.
+
+    Args:
+        token: Value returned by begin_request()
+        request: The Django request
+        response: The response about to be returned
+    """
+    stats = _current.get()
+    _current.reset(token)
+    elapsed = time.perf_counter() - stats.started
+
+    route = route_of(request)
+    method = request.method
+
+    REQUEST_DURATION.labels(method, route, str(response.status_code)).observe(elapsed)
+    DB_QUERIES.labels(method, route).observe(stats.queries)
+    DB_DURATION.labels(method, route).inc(stats.db_seconds)
+    if not response.streaming:
+        RESPONSE_SIZE.labels(method, route).observe(len(response.content))
+
+    entries = [
+        f'total;dur={elapsed * 1000:.1f}',
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="queries={stats.queries}"',
+    ]
+    entries.extend(f'{name};dur={seconds * 1000:.1f}' for name, seconds in stats.stages.items())
+    response['Server-Timing'] = ', '.join(entries)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting queries of the current request."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver: wrap every new database connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder, dispatch_uid='ayush_metrics_query_recorder')
+
+
+# ============================================================================
+# EXPOSITION
+# ============================================================================
+def render_metrics():
+    """
+    Return (body, content_type) in the Prometheus text format.
+
+    Aggregates every worker's samples in multiprocess mode.
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.9 on 2026-10-17 00:22
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_subscriber'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0, help_text='Incremented whenever the Diagnosis dataset changes')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Date and time of the last dataset change')),
+            ],
+            options={
+                'verbose_name': 'Dataset Version',
+                'verbose_name_plural': 'Dataset Versions',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='diagnosis',
+            options={'ordering': ['term'], 'verbose_name': 'Diagnosis', 'verbose_name_plural': 'Diagnoses'},
+        ),
+        migrations.AlterModelOptions(
+            name='subscriber',
+            options={'ordering': ['-date_joined'], 'verbose_name': 'Subscriber', 'verbose_name_plural': 'Subscribers'},
+        ),
+        migrations.AlterField(
+            model_name='diagnosis',
+            name='icd_code',
+            field=models.CharField(help_text='ICD-11 standard code for this diagnosis', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='diagnosis',
+            name='namaste_code',
+            field=models.CharField(help_text='NAMASTE standard code for this diagnosis', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='diagnosis',
+            name='term',
+            field=models.CharField(help_text='Disease name in human-readable format', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='subscriber',
+            name='date_joined',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date and time when subscription was created'),
+        ),
+        migrations.AlterField(
+            model_name='subscriber',
+            name='email',
+            field=models.EmailField(help_text="Subscriber's email address", max_length=254, unique=True),
+        ),
+    ]
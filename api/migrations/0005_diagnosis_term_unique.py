@@ -0,0 +1,62 @@
+# Generated by Django 5.2.9 on 2026-10-17 00:37
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def remove_duplicate_terms(apps, schema_editor):
+    """
+    Make term unique: drop exact duplicate rows (same term and codes),
+    keeping the oldest. Terms mapped to different codes are not guessed
+    at - the migration stops and lists them for manual cleanup.
+    """
+    Diagnosis = apps.get_model('api', 'Diagnosis')
+    duplicated = (
+        Diagnosis.objects.values('term')
+        .annotate(rows=Count('id'))
+        .filter(rows__gt=1)
+        .values_list('term', flat=True)
+    )
+    rows_by_term = {}
+    for row in Diagnosis.objects.filter(term__in=list(duplicated)).order_by('id'):
+        rows_by_term.setdefault(row.term, []).append(row)
+    if not rows_by_term:
+        return
+
+    conflicts = {
+        term: sorted({(row.namaste_code, row.icd_code) for row in rows})
+        for term, rows in rows_by_term.items()
+        if len({(row.namaste_code, row.icd_code) for row in rows}) > 1
+    }
+    if conflicts:
+        listing = '\n'.join(
+            f'  {term!r}: ' + ', '.join(f'{namaste} -> {icd}' for namaste, icd in codes)
+            for term, codes in sorted(conflicts.items())
+        )
+        raise RuntimeError(
+            f'{len(conflicts)} terms are mapped to different codes and cannot be made unique '
+            f'automatically. Delete the wrong rows, then migrate again:\n{listing}'
+        )
+
+    extra_ids = [row.id for rows in rows_by_term.values() for row in rows[1:]]
+    Diagnosis.objects.filter(id__in=extra_ids).delete()
+    print(
+        f'\n  Removed {len(extra_ids)} exact duplicate Diagnosis rows: '
+        + ', '.join(repr(term) for term in sorted(rows_by_term))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_datasetversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_terms, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='diagnosis',
+            name='term',
+            field=models.CharField(help_text='Disease name in human-readable format', max_length=255, unique=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-17 00:39
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def fill_content_hashes(apps, schema_editor):
+    """Compute content_hash for existing rows (same digest as Diagnosis.compute_content_hash)."""
+    Diagnosis = apps.get_model('api', 'Diagnosis')
+    batch = []
+    for row in Diagnosis.objects.only('id', 'term', 'namaste_code', 'icd_code').iterator(chunk_size=2000):
+        content = '\x1f'.join((row.term, row.namaste_code, row.icd_code))
+        row.content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+        batch.append(row)
+        if len(batch) >= 2000:
+            Diagnosis.objects.bulk_update(batch, ['content_hash'])
+            batch = []
+    if batch:
+        Diagnosis.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_diagnosis_term_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='diagnosis',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, help_text='Digest of term, NAMASTE code and ICD-11 code', max_length=32),
+        ),
+        migrations.RunPython(fill_content_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.9 on 2026-10-17 00:42
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+# Frozen copy of api.normalize.fold as of this migration: the backfill
+# must keep computing the same keys when that code changes.
+def fold(text):
+    """Lowercase ``text`` and strip diacritics from Latin letters."""
+    chars = []
+    base_is_ascii = False
+    for char in unicodedata.normalize('NFKD', text):
+        if unicodedata.combining(char):
+            if base_is_ascii:
+                continue
+        else:
+            base_is_ascii = char.isascii()
+        chars.append(char)
+    return unicodedata.normalize('NFC', ''.join(chars)).lower()
+
+
+def fill_search_keys(apps, schema_editor):
+    """Compute the normalised search key for existing rows."""
+    Diagnosis = apps.get_model('api', 'Diagnosis')
+    batch = []
+    for row in Diagnosis.objects.only('id', 'term').iterator(chunk_size=2000):
+        row.search_key = fold(row.term)
+        batch.append(row)
+        if len(batch) >= 2000:
+            Diagnosis.objects.bulk_update(batch, ['search_key'])
+            batch = []
+    if batch:
+        Diagnosis.objects.bulk_update(batch, ['search_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_diagnosis_content_hash'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='diagnosis',
+            options={'verbose_name': 'Diagnosis', 'verbose_name_plural': 'Diagnoses'},
+        ),
+        migrations.AddField(
+            model_name='diagnosis',
+            name='search_key',
+            field=models.CharField(blank=True, editable=False, help_text='Lowercased, accent-folded term', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='diagnosis',
+            name='icd_code',
+            field=models.CharField(db_index=True, help_text='ICD-11 standard code for this diagnosis', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='diagnosis',
+            name='namaste_code',
+            field=models.CharField(db_index=True, help_text='NAMASTE standard code for this diagnosis', max_length=50),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.9 on 2026-10-17 01:05
+
+from django.conf import settings
+from django.db import OperationalError, migrations, transaction
+
+
+# Frozen copy of the api.fts DDL as of this migration
+FTS_TABLE = 'api_diagnosis_fts'
+
+CREATE_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        search_key, content='api_diagnosis', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON api_diagnosis BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, search_key) VALUES (new.id, new.search_key);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON api_diagnosis BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_key) VALUES ('delete', old.id, old.search_key);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF search_key ON api_diagnosis BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_key) VALUES ('delete', old.id, old.search_key);
+        INSERT INTO {FTS_TABLE}(rowid, search_key) VALUES (new.id, new.search_key);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_STATEMENTS = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def create_fts(apps, schema_editor):
+    """
+    Create the FTS5 search index - SQLite only, and only when the fts5
+    engine is selected: its triggers add work to every Diagnosis write.
+    `python manage.py fts_index` creates it later.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite' or getattr(settings, 'SEARCH_ENGINE', 'python') != 'fts5':
+        return
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            for statement in CREATE_STATEMENTS:
+                cursor.execute(statement)
+    except OperationalError:
+        # SQLite built without FTS5 or the trigram tokenizer (< 3.34):
+        # leave the index out, fts_index reports the error
+        pass
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in DROP_STATEMENTS:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_diagnosis_search_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,174 @@
+# Generated by Django 5.2.9 on 2026-10-17 01:07
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+# Frozen copy of api.normalize / api.transliterate as of this migration:
+# the backfill must keep computing the same keys when that code changes.
+TERM_PARTS = re.compile(r'^\s*(?P<name>.*?)\s*\((?P<gloss>[^()]*)\)\s*$')
+WORD_SEPARATOR = re.compile(r'[\W_]+')
+
+# Independent vowels
+VOWELS = {
+    'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ii', 'उ': 'u', 'ऊ': 'uu',
+    'ऋ': 'ri', 'ॠ': 'ri', 'ऌ': 'li', 'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au',
+}
+
+# Dependent vowel signs (replace a consonant's inherent "a")
+VOWEL_SIGNS = {
+    'ा': 'aa', 'ि': 'i', 'ी': 'ii', 'ु': 'u', 'ू': 'uu', 'ृ': 'ri', 'ॄ': 'ri',
+    'ॢ': 'li', 'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au',
+}
+
+CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'n',
+    'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'n',
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n',
+    'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
+    'य': 'y', 'र': 'r', 'ल': 'l', 'ळ': 'l', 'व': 'v',
+    'श': 'sh', 'ष': 'sh', 'स': 's', 'ह': 'h',
+}
+
+VIRAMA = '्'
+
+# Other signs: anusvara, visarga; candrabindu, nukta and avagraha are dropped
+SIGNS = {'ं': 'm', 'ः': 'h', 'ँ': '', '़': '', 'ऽ': ''}
+
+
+
+def fold(text):
+    """Lowercase ``text`` and strip diacritics from Latin letters."""
+    chars = []
+    base_is_ascii = False
+    for char in unicodedata.normalize('NFKD', text):
+        if unicodedata.combining(char):
+            if base_is_ascii:
+                continue
+        else:
+            base_is_ascii = char.isascii()
+        chars.append(char)
+    return unicodedata.normalize('NFC', ''.join(chars)).lower()
+
+
+def devanagari_to_roman(text):
+    """Transliterate Devanagari to a plain ASCII romanisation."""
+    # NFD splits nukta letters (e.g. "क़" -> "क" + nukta)
+    chars = unicodedata.normalize('NFD', text)
+    out = []
+    for i, char in enumerate(chars):
+        if char in CONSONANTS:
+            out.append(CONSONANTS[char])
+            following = chars[i + 1] if i + 1 < len(chars) else ''
+            if following == '़':
+                following = chars[i + 2] if i + 2 < len(chars) else ''
+            if following != VIRAMA and following not in VOWEL_SIGNS:
+                out.append('a')  # Inherent vowel
+        elif char in VOWELS:
+            out.append(VOWELS[char])
+        elif char in VOWEL_SIGNS:
+            out.append(VOWEL_SIGNS[char])
+        elif char in SIGNS:
+            out.append(SIGNS[char])
+        elif char != VIRAMA:
+            out.append(char)
+    return ''.join(out)
+
+
+# Applied in order to each lowercased, accent-folded ASCII word
+PHONETIC_RULES = [
+    (re.compile(r'x'), 'ks'),
+    (re.compile(r'w'), 'v'),              # Jwara / Jvara
+    (re.compile(r'z'), 's'),              # Harvard-Kyoto "z" = ś
+    (re.compile(r'f'), 'ph'),
+    (re.compile(r'q'), 'k'),
+    (re.compile(r'ee'), 'i'),             # Ad-hoc long vowels
+    (re.compile(r'oo'), 'u'),
+    (re.compile(r'ri(?=[^aeiou])'), 'r'),  # ṛ typed as "ri" (Hridroga / Hṛdroga)
+    (re.compile(r'(?<=[^aeiouh])h'), ''),  # Aspirates and sh / ch: kh -> k, sh -> s
+    (re.compile(r'm(?=[^aeiouy])'), 'n'),  # Anusvara before a consonant
+    (re.compile(r'(.)\1+'), r'\1'),        # Long vowels, geminates: aa -> a, tt -> t
+    (re.compile(r'(?<=.)ah$'), 'a'),       # Final visarga: Nidranasah
+    (re.compile(r'(?<=..)a$'), ''),        # Final schwa: Jwara / Jwar
+]
+
+
+
+def sanskrit_phonetic_key(term):
+    """Phonetic key of the Sanskrit name part of ``term`` ("Jwara (Fever)" -> "jvar")."""
+    match = TERM_PARTS.match(term)
+    name = match.group('name') if match else term.strip()
+    words = WORD_SEPARATOR.split(fold(devanagari_to_roman(name)))
+    keys = []
+    for word in words:
+        if word:
+            for pattern, replacement in PHONETIC_RULES:
+                word = pattern.sub(replacement, word)
+            keys.append(word)
+    return ' '.join(keys)
+
+
+def fill_phonetic_keys(apps, schema_editor):
+    """Compute phonetic_key for existing rows."""
+    Diagnosis = apps.get_model('api', 'Diagnosis')
+    batch = []
+    for row in Diagnosis.objects.only('id', 'term').iterator(chunk_size=2000):
+        row.phonetic_key = sanskrit_phonetic_key(row.term)
+        batch.append(row)
+        if len(batch) >= 2000:
+            Diagnosis.objects.bulk_update(batch, ['phonetic_key'])
+            batch = []
+    if batch:
+        Diagnosis.objects.bulk_update(batch, ['phonetic_key'])
+
+
+# Frozen copy of the FTS5 trigger DDL of 0008
+FTS_TABLE = 'api_diagnosis_fts'
+
+TRIGGER_STATEMENTS = [
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON api_diagnosis BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, search_key) VALUES (new.id, new.search_key);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON api_diagnosis BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_key) VALUES ('delete', old.id, old.search_key);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF search_key ON api_diagnosis BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_key) VALUES ('delete', old.id, old.search_key);
+        INSERT INTO {FTS_TABLE}(rowid, search_key) VALUES (new.id, new.search_key);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+def restore_fts_triggers(apps, schema_editor):
+    """AddField rebuilds api_diagnosis on SQLite, dropping the FTS5 triggers."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        if cursor.fetchone() is None:
+            return  # FTS5 index not installed (see 0008)
+        for statement in TRIGGER_STATEMENTS:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_diagnosis_fts'),
+    ]
+
+    operations = [
+        # Runs last when migrating backwards (RemoveField rebuilds the table too)
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.AddField(
+            model_name='diagnosis',
+            name='phonetic_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Transliteration / phonetic key of the Sanskrit name', max_length=255),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+        migrations.RunPython(fill_phonetic_keys, migrations.RunPython.noop),
+    ]
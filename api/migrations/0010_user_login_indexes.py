@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-17 01:45
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Index
+from django.db.models.functions import Lower
+
+
+# Functional indexes matching the case-insensitive login lookup in
+# api/auth.py: LOWER(username) = LOWER(%s) OR LOWER(email) = LOWER(%s).
+# The user model belongs to django.contrib.auth, so the indexes are added
+# here rather than in a model's Meta. Runs after auth's last migration:
+# on SQLite an AlterField rebuilds the table and drops indexes that are
+# not part of the model state.
+LOGIN_INDEXES = [
+    Index(Lower('username'), name='auth_user_username_lower_idx'),
+    Index(Lower('email'), name='auth_user_email_lower_idx'),
+]
+
+
+def user_model(apps):
+    return apps.get_model(settings.AUTH_USER_MODEL)
+
+
+def add_login_indexes(apps, schema_editor):
+    for index in LOGIN_INDEXES:
+        schema_editor.add_index(user_model(apps), index)
+
+
+def remove_login_indexes(apps, schema_editor):
+    for index in LOGIN_INDEXES:
+        schema_editor.remove_index(user_model(apps), index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_diagnosis_phonetic_key'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_login_indexes, remove_login_indexes),
+    ]
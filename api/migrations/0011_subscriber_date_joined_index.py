@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-17 01:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_user_login_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subscriber',
+            index=models.Index(fields=['date_joined'], name='api_subscriber_joined_idx'),
+        ),
+    ]
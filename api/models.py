@@ -3,9 +3,17 @@
 This module defines the data models for:
 1. Diagnosis - Maps disease terms between NAMASTE and ICD-11 standards
 2. Subscriber - Stores email subscriptions for platform updates
+3. DatasetVersion - Change stamp used to invalidate in-process search indexes
 """
 
-from django.db import models
+import hashlib
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .normalize import fold, split_term
+from .transliterate import phonetic_key
 
 
 # ============================================================================
@@ -22,33 +30,94 @@ class Diagnosis(models.Model):
         term: Human-readable disease name (e.g., "Jwara (Fever)")
         namaste_code: NAMASTE standard code (e.g., "NAM-01-0023")
         icd_code: ICD-11 standard code (e.g., "MG26")
+        content_hash: Digest of (term, namaste_code, icd_code) used by the
+            incremental importer to detect changed rows
+        search_key: Lowercased, accent-folded term (what search matches on)
+        phonetic_key: Spelling / script independent key of the Sanskrit
+            name ("Jwara", "Jvāra", "ज्वर" -> "jvar"), see api/transliterate.py
     """
     # Disease name (supports both English and traditional terms)
     term = models.CharField(
         max_length=255,
+        unique=True,  # Natural key used by the CSV importer
         help_text="Disease name in human-readable format"
     )
     
     # NAMASTE coding system identifier
     namaste_code = models.CharField(
         max_length=50,
+        db_index=True,  # Exact code lookups
         help_text="NAMASTE standard code for this diagnosis"
     )
     
     # ICD-11 coding system identifier
     icd_code = models.CharField(
         max_length=50,
+        db_index=True,  # Exact / reverse code lookups
         help_text="ICD-11 standard code for this diagnosis"
     )
+    
+    # Change detection for incremental imports (filled automatically)
+    content_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        editable=False,
+        help_text="Digest of term, NAMASTE code and ICD-11 code"
+    )
+    
+    # Precomputed normalised search keys (filled automatically, see api/normalize.py)
+    search_key = models.CharField(
+        max_length=255,
+        blank=True,
+        editable=False,
+        help_text="Lowercased, accent-folded term"
+    )
+    phonetic_key = models.CharField(
+        max_length=255,
+        blank=True,
+        editable=False,
+        db_index=True,  # Hash-style lookups for the FTS5 engine
+        help_text="Transliteration / phonetic key of the Sanskrit name"
+    )
 
     def __str__(self):
         """String representation shows the disease term."""
         return self.term
+
+    @staticmethod
+    def compute_content_hash(term, namaste_code, icd_code):
+        """Return the 32-character hex digest of a mapping row."""
+        content = '\x1f'.join((term, namaste_code, icd_code))
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+    @classmethod
+    def derived_fields(cls, term, namaste_code, icd_code):
+        """
+        Return the computed column values for a mapping row.
+
+        Used by save() and by bulk importers (bulk_create skips save()).
+        """
+        return {
+            'content_hash': cls.compute_content_hash(term, namaste_code, icd_code),
+            'search_key': fold(term),
+            'phonetic_key': phonetic_key(split_term(term)[0]),
+        }
+
+    def save(self, *args, **kwargs):
+        """Keep content_hash and the search keys in sync with the mapped fields."""
+        derived = self.derived_fields(self.term, self.namaste_code, self.icd_code)
+        for field, value in derived.items():
+            setattr(self, field, value)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *derived}
+        super().save(*args, **kwargs)
     
     class Meta:
         verbose_name = "Diagnosis"
         verbose_name_plural = "Diagnoses"
-        ordering = ['term']  # Alphabetical order by default
+        # No default ordering: it would force a sort on every query.
+        # The admin orders by term (served by the unique index).
 
 
 # ============================================================================
@@ -83,4 +152,106 @@ class Subscriber(models.Model):
     class Meta:
         verbose_name = "Subscriber"
         verbose_name_plural = "Subscribers"
-        ordering = ['-date_joined']  # Newest subscribers first
\ No newline at end of file
+        ordering = ['-date_joined']  # Newest subscribers first
+        indexes = [
+            # Ordering, and date ranges of subscriber exports
+            models.Index(fields=['date_joined'], name='api_subscriber_joined_idx'),
+        ]
+
+
+# ============================================================================
+# DATASET VERSION MODEL
+# ============================================================================
+class DatasetVersion(models.Model):
+    """
+    Single-row, monotonically increasing stamp for the Diagnosis dataset.
+    
+    Bumped whenever Diagnosis rows are saved, deleted or bulk imported.
+    In-process search indexes compare their version against this stamp to
+    know when to rebuild, which also works across gunicorn workers and
+    management commands running in separate processes.
+    
+    Attributes:
+        version: Counter incremented on every dataset change
+        updated_at: Timestamp of the most recent change
+    """
+    # Primary key of the only row in this table
+    SINGLETON_ID = 1
+
+    # Monotonic counter (never decremented)
+    version = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Incremented whenever the Diagnosis dataset changes"
+    )
+    
+    # Time of the last bump
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Date and time of the last dataset change"
+    )
+
+    def __str__(self):
+        """String representation shows the version number."""
+        return f"Dataset v{self.version}"
+
+    @classmethod
+    def current(cls):
+        """
+        Return the current dataset version (0 if the dataset was never stamped).
+        """
+        version = (
+            cls.objects.filter(pk=cls.SINGLETON_ID)
+            .values_list('version', flat=True)
+            .first()
+        )
+        return version or 0
+
+    @classmethod
+    def stamp(cls):
+        """
+        Return (version, updated_at), or (0, None) if never stamped.
+        """
+        row = (
+            cls.objects.filter(pk=cls.SINGLETON_ID)
+            .values_list('version', 'updated_at')
+            .first()
+        )
+        return row or (0, None)
+
+    @classmethod
+    async def astamp(cls):
+        """Async (ASGI) variant of stamp()."""
+        row = await (
+            cls.objects.filter(pk=cls.SINGLETON_ID)
+            .values_list('version', 'updated_at')
+            .afirst()
+        )
+        return row or (0, None)
+
+    @classmethod
+    def bump(cls):
+        """
+        Atomically increment the dataset version and return the new value.
+        
+        Uses a single UPDATE ... SET version = version + 1 so concurrent
+        writers in different processes never lose an increment.
+        """
+        updated = cls.objects.filter(pk=cls.SINGLETON_ID).update(
+            version=F('version') + 1,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    cls.objects.create(pk=cls.SINGLETON_ID, version=1)
+            except IntegrityError:
+                # Another process created the row first - increment it instead
+                cls.objects.filter(pk=cls.SINGLETON_ID).update(
+                    version=F('version') + 1,
+                    updated_at=timezone.now(),
+                )
+        return cls.current()
+    
+    class Meta:
+        verbose_name = "Dataset Version"
+        verbose_name_plural = "Dataset Versions"
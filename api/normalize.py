@@ -0,0 +1,48 @@
+"""Term Normalisation for Ayush Bridge
+
+Builds the search key stored on each Diagnosis row, and normalises
+queries the same way so both sides of a comparison match:
+
+- lowercased
+- accent / diacritic folded for Latin script ("Jvāra" -> "jvara");
+  combining marks on other scripts (e.g. Devanagari vowel signs) are kept
+- split into the Sanskrit name and the parenthesised English gloss
+  (the name is what phonetic keys are built from):
+  "Jwara (Fever)" -> ("Jwara", "Fever")
+"""
+
+import re
+import unicodedata
+
+
+# "Name (Gloss)" - the gloss is the last parenthesised group
+TERM_PARTS = re.compile(r'^\s*(?P<name>.*?)\s*\((?P<gloss>[^()]*)\)\s*$')
+
+
+def fold(text):
+    """Lowercase ``text`` and strip diacritics from Latin letters."""
+    chars = []
+    base_is_ascii = False
+    for char in unicodedata.normalize('NFKD', text):
+        if unicodedata.combining(char):
+            if base_is_ascii:
+                continue
+        else:
+            base_is_ascii = char.isascii()
+        chars.append(char)
+    return unicodedata.normalize('NFC', ''.join(chars)).lower()
+
+
+def split_term(term):
+    """
+    Split a term into (name, gloss); gloss is '' when there is none.
+
+    Example:
+        "Vishama Jwara (Malaria / Intermittent Fever)"
+        -> ("Vishama Jwara", "Malaria / Intermittent Fever")
+    """
+    match = TERM_PARTS.match(term)
+    if not match:
+        return term.strip(), ''
+    return match.group('name'), match.group('gloss').strip()
+
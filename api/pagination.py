@@ -0,0 +1,69 @@
+"""Search Pagination for Ayush Bridge
+
+Cursor pagination for /api/search/. A cursor is the rank key of the
+last result on a page - (score, term length, term) - so the next page
+starts strictly after it. Because the key is unique and stable, pages
+never repeat or skip results as long as the dataset does not change.
+
+Cursors are opaque URL-safe strings: base64 of a small JSON array.
+"""
+
+import base64
+import binascii
+import json
+
+from django.conf import settings
+
+
+class InvalidPage(ValueError):
+    """Raised for a malformed limit or cursor parameter."""
+
+
+def encode_cursor(score, length, term):
+    """Encode the rank key of a result as an opaque cursor string."""
+    raw = json.dumps([score, length, term], ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor into a scoring.rank_key() tuple: (-score, length, term).
+
+    Raises:
+        InvalidPage: If the cursor was not produced by encode_cursor()
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        score, length, term = json.loads(raw.decode('utf-8'))
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise InvalidPage('Invalid cursor')
+    if not (isinstance(score, int) and isinstance(length, int) and isinstance(term, str)):
+        raise InvalidPage('Invalid cursor')
+    return (-score, length, term)
+
+
+def next_page_link(request, cursor):
+    """Return a ``Link`` header value pointing to the page starting at ``cursor``."""
+    params = request.GET.copy()
+    params['cursor'] = cursor
+    url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+    return f'<{url}>; rel="next"'
+
+
+def parse_limit(value, default):
+    """
+    Validate a ``limit`` query parameter against settings.SEARCH_MAX_LIMIT.
+
+    Raises:
+        InvalidPage: If the value is not an integer in 1..SEARCH_MAX_LIMIT
+    """
+    maximum = getattr(settings, 'SEARCH_MAX_LIMIT', 100)
+    if value in (None, ''):
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= maximum:
+        raise InvalidPage(f'limit must be an integer between 1 and {maximum}')
+    return limit
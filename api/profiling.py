@@ -0,0 +1,165 @@
+"""Request Profiling for Ayush Bridge
+
+Three tools for finding where a slow request spent its time:
+
+1. Stage timers - ``with stage('score'): ...`` blocks in the search
+   pipeline (index, cache, normalize, phonetic, prefilter, score, rank,
+   format, serialize). Times are added to the current request's stats
+   (api/metrics.py) and appear in its Server-Timing header.
+2. Structured stage log - with PROFILE_STAGE_LOG on, every request is
+   logged to the "api.profiling" logger as one JSON line (JsonFormatter)
+   with its route, status, duration, database time and stage times.
+3. Sampled cProfile dumps - PROFILE_SAMPLE_RATE of the requests, and with
+   PROFILE_SLOW_MS set every request slower than that, are written as
+   pstats files to PROFILE_DIR. Inspect them offline with
+   ``python -m pstats <file>`` or snakeviz.
+
+All of it is driven by backend.middleware.RequestProfilingMiddleware.
+"""
+
+import cProfile
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from .metrics import current_stats, route_of
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# STAGE TIMERS
+# ============================================================================
+@contextmanager
+def stage(name):
+    """
+    Time a block as a named stage of the current request.
+
+    Repeated stages add up. Outside a request (management commands,
+    benchmarks) the block just runs.
+    """
+    stats = current_stats()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.stages[name] = stats.stages.get(name, 0.0) + time.perf_counter() - started
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """DRF JSON renderer recording serialisation as the "serialize" stage."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with stage('serialize'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+# ============================================================================
+# STRUCTURED LOGGING
+# ============================================================================
+# LogRecord attributes that are not ``extra`` fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def log_stages(request, response, stats, elapsed):
+    """Log one request's timings as a structured record (PROFILE_STAGE_LOG)."""
+    logger.info('request', extra={
+        'method': request.method,
+        'route': route_of(request),
+        'status': response.status_code,
+        'duration_ms': round(elapsed * 1000, 3),
+        'db_ms': round(stats.db_seconds * 1000, 3),
+        'queries': stats.queries,
+        'stages': {name: round(seconds * 1000, 3) for name, seconds in stats.stages.items()},
+    })
+
+
+# ============================================================================
+# SAMPLED CPROFILE DUMPS
+# ============================================================================
+# One profiled request at a time per process (a thread cannot run two
+# profilers, and concurrent profiles would distort each other)
+_profile_lock = threading.Lock()
+
+
+def start_profile():
+    """
+    Start profiling the current request if it is sampled.
+
+    Requests are profiled with probability PROFILE_SAMPLE_RATE, or always
+    when PROFILE_SLOW_MS is set (only slow ones are kept).
+
+    Returns:
+        tuple: (cProfile.Profile, sampled) or (None, False) if not profiled
+    """
+    sampled = random.random() < getattr(settings, 'PROFILE_SAMPLE_RATE', 0.0)
+    if not sampled and getattr(settings, 'PROFILE_SLOW_MS', None) is None:
+        return None, False
+    if not _profile_lock.acquire(blocking=False):
+        return None, False
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler is active in this thread (e.g. a debugger)
+        _profile_lock.release()
+        return None, False
+    return profiler, sampled
+
+
+def finish_profile(profiler, sampled, request, elapsed):
+    """
+    Stop a profiler from start_profile() and dump it if the request qualifies.
+
+    Returns:
+        Path: The written pstats file, or None
+    """
+    profiler.disable()
+    try:
+        slow_ms = getattr(settings, 'PROFILE_SLOW_MS', None)
+        if not sampled and elapsed * 1000 < slow_ms:
+            return None
+        return dump_profile(profiler, request, elapsed)
+    finally:
+        _profile_lock.release()
+
+
+def dump_profile(profiler, request, elapsed):
+    """Write a profile to PROFILE_DIR as <time>-<method>-<route>-<ms>ms-<pid>.prof."""
+    directory = Path(getattr(settings, 'PROFILE_DIR', 'profiles'))
+    directory.mkdir(parents=True, exist_ok=True)
+    route = re.sub(r'[^A-Za-z0-9]+', '_', route_of(request)).strip('_') or 'root'
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.method}-{route}-{elapsed * 1000:.0f}ms-{os.getpid()}.prof"
+    path = directory / name
+    profiler.dump_stats(path)
+    logger.warning('profile written', extra={'path': str(path), 'duration_ms': round(elapsed * 1000, 3)})
+    return path
@@ -0,0 +1,178 @@
+"""SQL Query Guard for Ayush Bridge
+
+Per-request guardrails against queries creeping into views, serializers
+and middleware:
+
+- Every SQL statement is fingerprinted (literals and placeholders
+  replaced by "?", IN lists collapsed), so the same query with different
+  parameters counts as one statement
+- Repeated statements: a fingerprint run QUERY_REPEAT_THRESHOLD or more
+  times in one request is flagged as an N+1 pattern
+- Query budgets: QUERY_BUDGETS maps URL patterns (route, as in the
+  Prometheus labels) to the most queries a request may run; routes not
+  listed use QUERY_BUDGET_DEFAULT (None = no budget)
+
+Transaction control statements (BEGIN, SAVEPOINT, RELEASE, ...) are not
+counted, so a request counts the same inside a test's transaction as in
+production.
+
+Offending requests are logged to the "api.query_guard" logger with the
+project call stack that issued the repeated / over-budget query, and
+counted in ayush_query_guard_violations_total. With QUERY_GUARD_STRICT
+(on in the API tests) they raise QueryBudgetExceeded instead, so a test
+fails as soon as an endpoint goes over budget.
+
+Driven by backend.middleware.QueryGuardMiddleware; per-request state is
+kept on the api/metrics.py RequestStats.
+"""
+
+import logging
+import re
+import traceback
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from prometheus_client import Counter
+
+from .metrics import current_stats, route_of
+
+
+logger = logging.getLogger(__name__)
+
+VIOLATIONS = Counter(
+    'ayush_query_guard_violations',
+    'Requests that ran repeated statements or exceeded their query budget',
+    ['route', 'kind'],
+)
+
+# Frames from these paths are not project code
+LIBRARY_PATHS = ('site-packages', 'dist-packages', '/lib/python')
+
+# Project call stack depth kept for offending queries
+STACK_DEPTH = 8
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request breaks a query guard rule."""
+
+
+# ============================================================================
+# FINGERPRINTS
+# ============================================================================
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+_TRANSACTION = re.compile(r'\s*(?:BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b', re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """
+    Normalise a SQL statement so only its shape remains.
+
+    Example:
+        'SELECT ... WHERE "id" IN (%s, %s, %s) LIMIT 21'
+        -> 'SELECT ... WHERE "id" IN (...) LIMIT ?'
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def project_stack():
+    """Return the innermost project frames of the current call stack as "file:line in function"."""
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if not any(path in frame.filename for path in LIBRARY_PATHS)
+        and not frame.filename.endswith(('metrics.py', 'query_guard.py'))
+    ]
+    return [f'{frame.filename}:{frame.lineno} in {frame.name}' for frame in frames[-STACK_DEPTH:]]
+
+
+def budget_for(route):
+    """Return the query budget of a route (None = unlimited)."""
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(route, getattr(settings, 'QUERY_BUDGET_DEFAULT', None))
+
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+def record_statement(execute, sql, params, many, context):
+    """
+    Database execute wrapper fingerprinting the current request's statements.
+
+    The call stack is captured only for the statement that first reaches
+    the repeat threshold or exceeds the budget.
+    """
+    stats = current_stats()
+    if stats is not None and not _TRANSACTION.match(sql):
+        key = fingerprint(sql)
+        count = stats.fingerprints[key] = stats.fingerprints.get(key, 0) + 1
+        if count == getattr(settings, 'QUERY_REPEAT_THRESHOLD', 3):
+            stats.stacks[key] = project_stack()
+        if stats.budget_stack is None and stats.request is not None:
+            budget = budget_for(route_of(stats.request))
+            if budget is not None and sum(stats.fingerprints.values()) > budget:
+                stats.budget_stack = project_stack()
+    return execute(sql, params, many, context)
+
+
+def install_statement_recorder(sender, connection, **kwargs):
+    """connection_created receiver: wrap every new database connection."""
+    if record_statement not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_statement)
+
+
+connection_created.connect(install_statement_recorder, dispatch_uid='ayush_query_guard_recorder')
+
+
+# ============================================================================
+# CHECKS
+# ============================================================================
+def check_request(request, stats):
+    """
+    Apply the repeat and budget rules to a finished request.
+
+    Logs (and counts) each violation; raises QueryBudgetExceeded in
+    strict mode.
+
+    Returns:
+        list[str]: Descriptions of the violations (empty if none)
+    """
+    route = route_of(request)
+    threshold = getattr(settings, 'QUERY_REPEAT_THRESHOLD', 3)
+    budget = budget_for(route)
+    total = sum(stats.fingerprints.values())
+
+    problems = []
+    repeated = [(key, count) for key, count in stats.fingerprints.items() if count >= threshold]
+    for key, count in repeated:
+        VIOLATIONS.labels(route, 'repeated').inc()
+        problems.append(f'{count}x {key}')
+        logger.warning('repeated query', extra={
+            'method': request.method,
+            'route': route,
+            'count': count,
+            'sql': key,
+            'stack': stats.stacks.get(key, []),
+        })
+    if budget is not None and total > budget:
+        VIOLATIONS.labels(route, 'budget').inc()
+        problems.append(f'{total} queries, budget {budget}')
+        logger.warning('query budget exceeded', extra={
+            'method': request.method,
+            'route': route,
+            'queries': total,
+            'budget': budget,
+            'statements': stats.fingerprints,
+            'stack': stats.budget_stack or [],
+        })
+
+    if problems and getattr(settings, 'QUERY_GUARD_STRICT', False):
+        raise QueryBudgetExceeded(f'{request.method} {route}: ' + '; '.join(problems))
+    return problems
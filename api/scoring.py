@@ -0,0 +1,190 @@
+"""Fuzzy Scoring Engine for Ayush Bridge
+
+Scores search queries against the in-process search index using
+RapidFuzz batch primitives instead of one Python call per term pair.
+
+Scoring rules (unchanged from the original search_api loop):
+    - score = max(ratio, partial_ratio), rounded to an integer
+    - only scores above MIN_SCORE are kept
+    - ranking: score descending, term length ascending, term alphabetical
+      (rank_key); pages continue after the rank_key of the previous page
+"""
+
+import heapq
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from .profiling import stage
+
+
+# Matches must score strictly above this value (0-100)
+MIN_SCORE = 60
+
+# Default number of results returned per query
+DEFAULT_LIMIT = 10
+
+# Upper bound on score matrix cells computed per cdist call in batch mode
+# (float64, so 2M cells = 16 MB per scorer)
+MAX_MATRIX_CELLS = 2_000_000
+
+
+def score_matrix(queries, keys, workers=1):
+    """
+    Score every query against every key in one pass.
+
+    Args:
+        queries (list[str]): Normalised query strings
+        keys (list[str]): Normalised index terms
+        workers (int): RapidFuzz worker threads (-1 = all cores)
+
+    Returns:
+        numpy.ndarray: (len(queries), len(keys)) matrix of combined scores,
+        rounded half-to-even exactly like thefuzz's int(round(score)).
+        Scores below the cutoff are 0.
+    """
+    ratio = process.cdist(
+        queries, keys,
+        scorer=fuzz.ratio,
+        processor=None,
+        score_cutoff=MIN_SCORE,
+        dtype=np.float64,
+        workers=workers,
+    )
+    partial = process.cdist(
+        queries, keys,
+        scorer=fuzz.partial_ratio,
+        processor=None,
+        score_cutoff=MIN_SCORE,
+        dtype=np.float64,
+        workers=workers,
+    )
+    np.maximum(ratio, partial, out=ratio)
+    return np.rint(ratio, out=ratio)
+
+
+def rank_key(score, length, term):
+    """Sort key of a match: score descending, then shorter term, then alphabetical."""
+    return (-score, length, term)
+
+
+def rank_row(scores, index, limit=DEFAULT_LIMIT, positions=None, after=None):
+    """
+    Select the best ``limit`` rows from one row of a score matrix.
+
+    Uses a bounded heap (heapq.nsmallest) over the rows that passed the
+    threshold, so cost grows with the page size, not a full sort.
+
+    Args:
+        scores (numpy.ndarray): One row of score_matrix()
+        index (SearchIndex): Index the scores refer to
+        limit (int): Maximum number of results
+        positions (numpy.ndarray): Index row position of each score column,
+            when only a subset of the index was scored (None = all rows)
+        after (tuple): rank_key() of the last match already returned; only
+            matches ranked after it are selected (None = from the start)
+
+    Returns:
+        list[tuple[int, int]]: (row_position, score) pairs in ranking order
+    """
+    if after is not None:
+        # Rows scoring higher than the cursor are on earlier pages
+        scores = np.where(scores > -after[0], 0, scores)
+    columns = np.flatnonzero(scores > MIN_SCORE)
+    values = scores[columns].astype(np.int64).tolist()
+    if positions is not None:
+        columns = positions[columns]
+    positions = columns.tolist()
+    score_of = dict(zip(positions, values))
+    terms = index.terms
+    lengths = index.lengths
+
+    def key(i):
+        return rank_key(score_of[i], lengths[i], terms[i])
+
+    if after is not None:
+        positions = [i for i in positions if key(i) > after]
+    best = heapq.nsmallest(limit, positions, key=key)
+    return [(i, score_of[i]) for i in best]
+
+
+def top_matches(query, index, limit=DEFAULT_LIMIT, candidates=None, after=None):
+    """
+    Return the ranked (row_position, score) pairs for one normalised query.
+
+    Args:
+        query (str): Normalised query string
+        index (SearchIndex): Index to search
+        limit (int): Maximum number of results
+        candidates (numpy.ndarray): Row positions to score (e.g. from the
+            trigram prefilter), or None to score the whole index
+        after (tuple): Cursor position, see rank_row()
+    """
+    if candidates is None:
+        keys = index.keys
+    else:
+        keys = [index.keys[i] for i in candidates.tolist()]
+    if not keys:
+        return []
+    with stage('score'):
+        scores = score_matrix([query], keys)[0]
+    with stage('rank'):
+        return rank_row(scores, index, limit, positions=candidates, after=after)
+
+
+def batch_top_matches(queries, index, limit=DEFAULT_LIMIT, workers=-1, candidates=None):
+    """
+    Rank many normalised queries against the index at once.
+
+    Queries are scored together with process.cdist using ``workers``
+    threads. Very large batches are split into row blocks of at most
+    MAX_MATRIX_CELLS cells so memory stays bounded.
+
+    Args:
+        candidates (list): Per query, the row positions to rank (as in
+            top_matches()) or None for all rows. A block is only scored
+            against the union of its queries' candidates (every row if
+            one of them is None); each query then ranks its own columns,
+            exactly as top_matches() would
+
+    Returns:
+        list[list[tuple[int, int]]]: Ranked (row_position, score) pairs
+        for each query, in input order
+    """
+    keys = index.keys
+    if not keys:
+        return [[] for _ in queries]
+    if candidates is None:
+        candidates = [None] * len(queries)
+
+    # Size blocks by the widest column set any block can score
+    if any(positions is None for positions in candidates):
+        width = len(keys)
+    else:
+        width = len(np.unique(np.concatenate(candidates))) if candidates else 0
+    block_size = max(1, MAX_MATRIX_CELLS // max(1, width))
+    results = []
+    for start in range(0, len(queries), block_size):
+        block = queries[start:start + block_size]
+        block_candidates = candidates[start:start + block_size]
+        if any(positions is None for positions in block_candidates):
+            columns = None
+            with stage('score'):
+                scores = score_matrix(block, keys, workers=workers)
+        else:
+            columns = np.unique(np.concatenate(block_candidates))
+            if not len(columns):
+                results.extend([] for _ in block)
+                continue
+            with stage('score'):
+                scores = score_matrix(block, [keys[i] for i in columns.tolist()], workers=workers)
+        with stage('rank'):
+            for row, positions in zip(scores, block_candidates):
+                if positions is None:
+                    results.append(rank_row(row, index, limit))
+                elif columns is None:
+                    results.append(rank_row(row[positions], index, limit, positions=positions))
+                else:
+                    # Score columns follow the sorted union of the block
+                    results.append(rank_row(row[np.searchsorted(columns, positions)], index, limit, positions=positions))
+    return results
@@ -0,0 +1,251 @@
+"""Search Service for Ayush Bridge
+
+Single entry point used by the API views to run a diagnosis search
+against the in-process index (api/search_index.py) with the RapidFuzz
+scoring engine (api/scoring.py).
+
+Results of search_page() / search_diagnoses() are cached per dataset version
+(api/search_cache.py).
+
+Large datasets are prefiltered with a character-trigram inverted index
+(api/trigrams.py) so only plausible candidates are fuzzy scored.
+
+Each step is timed as a named stage of the current request
+(api/profiling.py): index, cache, normalize, phonetic, prefilter,
+score, rank, format (fts for the FTS5 shortlist).
+
+Sanskrit names typed in another spelling or script ("Jvara", "ज्वर")
+resolve through a phonetic key hash lookup (api/transliterate.py): those
+rows rank first, followed by the usual fuzzy matches.
+
+settings.SEARCH_ENGINE selects how search_page() finds candidates:
+- 'python': in-process index (default)
+- 'fts5':   SQLite FTS5 shortlist, fuzzy re-ranked in Python (api/fts.py)
+"""
+
+from django.conf import settings
+
+from . import fts
+from .normalize import fold
+from .pagination import decode_cursor, encode_cursor
+from .scoring import DEFAULT_LIMIT, batch_top_matches, rank_key, top_matches
+from .search_cache import get_or_compute
+from .profiling import stage
+from .search_index import SearchIndex, dataset_stamp, get_search_index, normalize_code
+from .transliterate import phonetic_key
+
+
+def normalize_query(query):
+    """Normalise a raw query string the same way index keys are normalised."""
+    return fold(query)
+
+
+def candidate_positions(query, index):
+    """
+    Return the row positions worth scoring for ``query``.
+
+    Returns None (score everything) when the index has no trigram index
+    or the query is too short for trigrams to be selective.
+    """
+    min_length = getattr(settings, 'SEARCH_TRIGRAM_MIN_QUERY_LENGTH', 4)
+    if index.trigrams is None or len(query) < min_length:
+        return None
+    min_overlap = getattr(settings, 'SEARCH_TRIGRAM_MIN_OVERLAP', 0.25)
+    return index.trigrams.candidates(query, min_overlap)
+
+
+def phonetic_matches(query, index):
+    """
+    Return the row positions whose Sanskrit name sounds like ``query``.
+
+    Empty when the query is not a variant of a known name.
+    """
+    return index.by_phonetic.get(phonetic_key(query), ())
+
+
+def hit_page(hits, index, limit=DEFAULT_LIMIT, after=None):
+    """
+    Return the phonetic hits of one page as score-100 matches.
+
+    Hits (already in (length, term) order) come before every fuzzy match.
+    A cursor on a hit continues with the hits after it; any other cursor
+    is a position in the fuzzy ranking, past all hits.
+
+    Returns:
+        tuple: (matches, cursor to continue the fuzzy ranking from)
+    """
+    start = 0
+    if after is not None:
+        keys = [rank_key(100, index.lengths[i], index.terms[i]) for i in hits]
+        if after not in keys:
+            return [], after
+        start = keys.index(after) + 1
+        after = None
+    return [(position, 100) for position in hits[start:start + limit]], after
+
+
+def fill_page(matches, fuzzy, hits, limit=DEFAULT_LIMIT):
+    """Fill a page of phonetic hits with the fuzzy matches that are not hits."""
+    shown = set(hits)
+    return (matches + [match for match in fuzzy if match[0] not in shown])[:limit]
+
+
+def rank_query(query, index, limit=DEFAULT_LIMIT, after=None):
+    """
+    Return ranked (row_position, score) pairs for a raw query on ``index``.
+
+    Phonetic hits come first (score 100), then the fuzzy ranking of the
+    other rows. ``after`` is a cursor position (see scoring.rank_row()).
+    """
+    with stage('normalize'):
+        query = normalize_query(query)
+    with stage('phonetic'):
+        hits = phonetic_matches(query, index)
+        matches, after = hit_page(hits, index, limit, after)
+    if len(matches) < limit:
+        with stage('prefilter'):
+            candidates = candidate_positions(query, index)
+        # Hits may also rank as fuzzy matches - fetch enough to skip them
+        fuzzy = top_matches(query, index, limit - len(matches) + len(hits), candidates=candidates, after=after)
+        matches = fill_page(matches, fuzzy, hits, limit)
+    return matches
+
+
+def fts_search(query, limit=DEFAULT_LIMIT, after=None):
+    """
+    Rank a normalised query with the FTS5 engine.
+
+    The rows sharing the query's phonetic key and the bm25 shortlist come
+    from one query (fts.shortlist()). They are loaded into a throwaway
+    SearchIndex so results are ranked and tie-broken exactly like the
+    in-process engine.
+
+    Returns:
+        tuple: (SearchIndex, ranked (row_position, score) pairs on it)
+    """
+    with stage('fts'):
+        shortlist = SearchIndex(fts.shortlist(query, phonetic=phonetic_key(query)))
+    return shortlist, rank_query(query, shortlist, limit, after)
+
+
+def make_page(index, matches, limit):
+    """
+    Format ``limit`` + 1 ranked matches as (results, next_cursor).
+
+    next_cursor is None on the last page.
+    """
+    with stage('format'):
+        results = [index.result(position) for position, _score in matches[:limit]]
+        next_cursor = None
+        if len(matches) > limit:
+            position, score = matches[limit - 1]
+            next_cursor = encode_cursor(score, index.lengths[position], index.terms[position])
+    return results, next_cursor
+
+
+def search_page(query, limit=DEFAULT_LIMIT, cursor=None):
+    """
+    Fuzzy search the Diagnosis dataset, one page at a time.
+
+    Args:
+        query (str): Raw search query (e.g. "Fever", "Jwara")
+        limit (int): Page size
+        cursor (str): Cursor returned with the previous page (None = first page)
+
+    Returns:
+        tuple: (results, next_cursor) - ranked result dicts with term,
+        NAMASTE code and ICD-11 code, and the cursor of the next page
+        (None if this is the last one)
+
+    Raises:
+        InvalidPage: If the cursor is malformed
+    """
+    after = decode_cursor(cursor) if cursor else None
+    normalized = normalize_query(query)
+    engine = getattr(settings, 'SEARCH_ENGINE', 'python')
+    if engine == 'fts5' and len(normalized) >= fts.MIN_QUERY_LENGTH:
+        # No in-process index needed - the version only keys the cache
+        with stage('index'):
+            version, _updated_at = dataset_stamp()
+        return get_or_compute(
+            version, normalized, limit,
+            lambda: make_page(*fts_search(normalized, limit + 1, after), limit),
+            cursor=cursor,
+        )
+
+    with stage('index'):
+        index = get_search_index()
+
+    def compute():
+        # One extra match tells whether there is a next page
+        return make_page(index, rank_query(query, index, limit + 1, after), limit)
+
+    return get_or_compute(index.version, normalized, limit, compute, cursor=cursor)
+
+
+def search_diagnoses(query, limit=DEFAULT_LIMIT):
+    """
+    Fuzzy search the Diagnosis dataset.
+
+    Args:
+        query (str): Raw search query (e.g. "Fever", "Jwara")
+        limit (int): Maximum number of results
+
+    Returns:
+        list[dict]: Ranked results with term, NAMASTE code and ICD-11 code
+    """
+    return search_page(query, limit)[0]
+
+
+def batch_search_diagnoses(queries, limit=DEFAULT_LIMIT):
+    """
+    Fuzzy search many queries in one matrix pass, ranked like search_page().
+
+    Args:
+        queries (list[str]): Raw search queries
+        limit (int): Maximum number of results per query
+
+    Returns:
+        list[list[dict]]: Ranked results for each query, in input order.
+        Empty queries get an empty list, as in search_api.
+    """
+    index = get_search_index()
+    normalized = [normalize_query(query) for query in queries]
+    hits = [phonetic_matches(query, index) if query else () for query in normalized]
+    pending = [query for query, hit in zip(normalized, hits) if query and len(hit) < limit]
+    # Enough fuzzy matches to fill every page after skipping its hits
+    extra = max((len(hit) for hit in hits if len(hit) < limit), default=0)
+    # Same trigram prefilter as search_page(), so each query ranks the same
+    candidates = [candidate_positions(query, index) for query in pending]
+    workers = getattr(settings, 'SEARCH_BATCH_WORKERS', -1)
+    ranked = iter(batch_top_matches(pending, index, limit + extra, workers=workers, candidates=candidates))
+
+    results = []
+    for query, hit in zip(normalized, hits):
+        matches, _after = hit_page(hit, index, limit)
+        if query and len(matches) < limit:
+            matches = fill_page(matches, next(ranked), hit, limit)
+        results.append([index.result(position) for position, _score in matches])
+    return results
+
+
+def lookup_namaste(code):
+    """
+    Return the mapping for a NAMASTE code, or None if it is unknown.
+
+    Served from the index's hash table - no table scan, no fuzzy scoring.
+    """
+    index = get_search_index()
+    position = index.by_namaste.get(normalize_code(code))
+    return None if position is None else index.result(position)
+
+
+def lookup_icd(code):
+    """
+    Return every mapping for an ICD-11 code (empty list if unknown).
+
+    Results are ordered by term length, then alphabetically.
+    """
+    index = get_search_index()
+    positions = index.by_icd.get(normalize_code(code), ())
+    return [index.result(position) for position in positions]
@@ -0,0 +1,96 @@
+"""Search Result Cache for Ayush Bridge
+
+Caches ranked search results in front of the fuzzy scoring step, using a
+dedicated Django cache alias (settings.SEARCH_CACHE_ALIAS).
+
+- Keys include the dataset version, so a Diagnosis change can never
+  serve stale results (and all workers agree once the version changes)
+- Size (MAX_ENTRIES) and TTL (TIMEOUT) come from the CACHES
+  configuration of the alias. What is dropped once MAX_ENTRIES is
+  reached depends on the backend - 1/CULL_FREQUENCY (default 1/3) of
+  the entries each time:
+  - LocMemCache: the least recently used entries (true LRU)
+  - FileBasedCache: a random sample of the files
+  - DatabaseCache: expired rows, then the rows with the lowest keys -
+    effectively random, since keys are hashes
+- Hit / miss counters are kept per process (and in the Prometheus
+  ayush_search_cache_lookups_total counter, aggregated across workers
+  at /metrics), so a lookup costs no extra cache write - with
+  DatabaseCache that would be an SQLite write per search
+"""
+
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .metrics import SEARCH_CACHE_LOOKUPS
+from .profiling import stage
+
+
+# Hit / miss counters of this process
+_stats = {'hit': 0, 'miss': 0}
+_stats_lock = threading.Lock()
+
+
+def get_search_cache():
+    """Return the Django cache backend used for search results."""
+    return caches[getattr(settings, 'SEARCH_CACHE_ALIAS', 'search')]
+
+
+def make_key(version, query, limit, cursor=None):
+    """Build a backend-safe cache key for a normalised query (and page cursor)."""
+    digest = hashlib.sha1(f'{limit}:{cursor or ""}:{query}'.encode('utf-8')).hexdigest()
+    return f'search:v{version}:{digest}'
+
+
+def _count(result):
+    """Count a lookup ('hit' or 'miss') in this process and in Prometheus."""
+    with _stats_lock:
+        _stats[result] += 1
+    SEARCH_CACHE_LOOKUPS.labels(result).inc()
+
+
+def get_or_compute(version, query, limit, compute, cursor=None):
+    """
+    Return cached results for (version, query, limit, cursor), computing them on a miss.
+
+    Args:
+        version (int): Dataset version the results are valid for
+        query (str): Normalised query
+        limit (int): Number of results requested
+        compute (callable): Zero-argument function producing the results
+        cursor (str): Page cursor (None = first page)
+    """
+    cache = get_search_cache()
+    key = make_key(version, query, limit, cursor)
+
+    with stage('cache'):
+        results = cache.get(key)
+    if results is not None:
+        _count('hit')
+        return results
+
+    _count('miss')
+    results = compute()
+    with stage('cache'):
+        cache.set(key, results)
+    return results
+
+
+def clear_search_cache():
+    """Drop every cached search result (counters are kept)."""
+    get_search_cache().clear()
+
+
+def cache_stats():
+    """Return this process's hit / miss counters and the hit ratio."""
+    with _stats_lock:
+        hits, misses = _stats['hit'], _stats['miss']
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+    }
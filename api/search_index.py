@@ -0,0 +1,189 @@
+"""In-Process Search Index for Ayush Bridge
+
+Keeps every Diagnosis row in memory as compact parallel arrays so that
+search requests can be scored without touching the ORM, plus hash
+indexes for exact NAMASTE and ICD-11 code lookups.
+
+The index is built lazily, once per worker process, and rebuilt when:
+1. A Diagnosis row is saved or deleted in this process (via signals)
+2. The DatasetVersion stamp changes (e.g. an import ran in another process)
+"""
+
+import threading
+import time
+from array import array
+
+from django.conf import settings
+
+from .models import DatasetVersion, Diagnosis
+from .normalize import fold, split_term
+from .transliterate import phonetic_key
+from .trigrams import TrigramIndex
+
+
+# ============================================================================
+# SEARCH INDEX
+# ============================================================================
+def normalize_code(code):
+    """Normalise a NAMASTE / ICD-11 code for lookups (" mg26 " -> "MG26")."""
+    return code.strip().upper()
+
+
+class SearchIndex:
+    """
+    Immutable snapshot of the Diagnosis table optimised for search.
+
+    Row ``i`` of the dataset is spread over the parallel arrays at position
+    ``i``, so scoring code can work on plain lists of strings and only
+    materialise result dictionaries for the handful of rows it returns.
+
+    Attributes:
+        version: DatasetVersion the snapshot was built from
+        terms: Original disease names (e.g. "Jwara (Fever)")
+        keys: Normalised terms used for matching (Diagnosis.search_key)
+        namaste_codes: NAMASTE code per row
+        icd_codes: ICD-11 code per row
+        lengths: Length of each original term (secondary sort key)
+        trigrams: TrigramIndex over ``keys`` for candidate prefiltering,
+            or None when the dataset is smaller than SEARCH_TRIGRAM_MIN_CORPUS
+        by_namaste: Normalised NAMASTE code -> row position
+        by_icd: Normalised ICD-11 code -> tuple of row positions
+            (one ICD-11 code can map several NAMASTE diagnoses)
+        by_phonetic: Phonetic key of the Sanskrit name -> tuple of row
+            positions, so spelling / script variants resolve by hash lookup
+    """
+    __slots__ = (
+        'version', 'terms', 'keys', 'namaste_codes', 'icd_codes', 'lengths',
+        'trigrams', 'by_namaste', 'by_icd', 'by_phonetic',
+    )
+
+    def __init__(self, rows, version=0):
+        """
+        Build the index from an iterable of (term, namaste_code, icd_code)
+        tuples, optionally followed by the stored search_key and phonetic_key.
+
+        A missing or empty search_key and a missing phonetic_key are
+        computed from the term.
+        """
+        self.version = version
+        self.terms = []
+        self.keys = []
+        self.namaste_codes = []
+        self.icd_codes = []
+        by_phonetic = {}
+
+        for position, (term, namaste_code, icd_code, *stored) in enumerate(rows):
+            self.terms.append(term)
+            self.keys.append(stored[0] if stored and stored[0] else fold(term))
+            self.namaste_codes.append(namaste_code)
+            self.icd_codes.append(icd_code)
+            phonetic = stored[1] if len(stored) > 1 else phonetic_key(split_term(term)[0])
+            if phonetic:
+                by_phonetic.setdefault(phonetic, []).append(position)
+
+        self.lengths = array('I', map(len, self.terms))
+
+        # Small datasets are cheaper to scan exhaustively than to prefilter
+        min_corpus = getattr(settings, 'SEARCH_TRIGRAM_MIN_CORPUS', 5000)
+        self.trigrams = TrigramIndex(self.keys) if len(self.keys) >= min_corpus else None
+
+        # Exact code lookups (first row wins for duplicate NAMASTE codes)
+        self.by_namaste = {}
+        by_icd = {}
+        for position, (namaste_code, icd_code) in enumerate(zip(self.namaste_codes, self.icd_codes)):
+            self.by_namaste.setdefault(normalize_code(namaste_code), position)
+            by_icd.setdefault(normalize_code(icd_code), []).append(position)
+        self.by_icd = {
+            code: tuple(sorted(positions, key=lambda i: (self.lengths[i], self.terms[i])))
+            for code, positions in by_icd.items()
+        }
+        self.by_phonetic = {
+            key: tuple(sorted(positions, key=lambda i: (self.lengths[i], self.terms[i])))
+            for key, positions in by_phonetic.items()
+        }
+
+    @classmethod
+    def load(cls, version):
+        """Build an index from the current contents of the Diagnosis table."""
+        rows = (
+            Diagnosis.objects.order_by()
+            .values_list('term', 'namaste_code', 'icd_code', 'search_key', 'phonetic_key')
+            .iterator(chunk_size=2000)
+        )
+        return cls(rows, version=version)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def result(self, i):
+        """Format row ``i`` the way the search API returns it."""
+        return {
+            'term': self.terms[i],
+            'namaste': self.namaste_codes[i],
+            'icd': self.icd_codes[i],
+        }
+
+
+# ============================================================================
+# PER-PROCESS INDEX CACHE
+# ============================================================================
+_index = None
+_index_lock = threading.Lock()
+_stamp = None  # (version, updated_at) last read from DatasetVersion
+_stamp_checked_at = 0.0
+
+
+def dataset_stamp():
+    """
+    Return this worker's view of the (version, updated_at) dataset stamp.
+
+    The DatasetVersion row is re-read at most once every
+    SEARCH_INDEX_VERSION_CHECK_INTERVAL seconds, so the hot path is a
+    couple of attribute reads. Local writes reset it immediately.
+    """
+    global _stamp, _stamp_checked_at
+
+    interval = getattr(settings, 'SEARCH_INDEX_VERSION_CHECK_INTERVAL', 1.0)
+    stamp = _stamp
+    if stamp is None or time.monotonic() - _stamp_checked_at >= interval:
+        stamp = _stamp = DatasetVersion.stamp()
+        _stamp_checked_at = time.monotonic()
+    return stamp
+
+
+async def adataset_stamp():
+    """
+    Async variant of dataset_stamp() for ASGI views.
+
+    Same cache; a due re-check uses the async ORM instead of blocking
+    the event loop.
+    """
+    global _stamp, _stamp_checked_at
+
+    interval = getattr(settings, 'SEARCH_INDEX_VERSION_CHECK_INTERVAL', 1.0)
+    stamp = _stamp
+    if stamp is None or time.monotonic() - _stamp_checked_at >= interval:
+        stamp = _stamp = await DatasetVersion.astamp()
+        _stamp_checked_at = time.monotonic()
+    return stamp
+
+
+def get_search_index():
+    """Return the search index for this worker, rebuilding it if needed."""
+    global _index
+
+    version = dataset_stamp()[0]
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = SearchIndex.load(version)
+        return _index
+
+
+def invalidate_search_index():
+    """Force the next get_search_index() call in this process to re-check."""
+    global _stamp
+    _stamp = None
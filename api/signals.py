@@ -0,0 +1,79 @@
+"""Signal Handlers for Ayush Bridge API
+
+Keeps derived data (dataset version stamp, in-process search index,
+search result cache) consistent with the Diagnosis table, and drops
+cached JWT authentications (api/authentication.py) of users that change.
+
+Note: bulk operations (bulk_create, QuerySet.update) do not send model
+signals - code using them must call notify_dataset_changed() itself.
+Wrap bulk jobs in deferred_dataset_changes() so the version is bumped
+once per job instead of once per row.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import forget_user_tokens
+from .models import DatasetVersion, Diagnosis
+from .search_cache import clear_search_cache
+from .search_index import invalidate_search_index
+
+
+# Per-thread "changes pending" flag while inside deferred_dataset_changes()
+_deferred = threading.local()
+
+
+def dataset_changed():
+    """Bump the dataset version, drop this worker's index and cached results."""
+    DatasetVersion.bump()
+    # Rebuild only once the change is visible to other connections
+    transaction.on_commit(invalidate_search_index)
+    transaction.on_commit(clear_search_cache)
+
+
+def notify_dataset_changed():
+    """Report a Diagnosis change now, or at the end of the enclosing deferral."""
+    if getattr(_deferred, 'pending', None) is None:
+        dataset_changed()
+    else:
+        _deferred.pending = True
+
+
+@contextmanager
+def deferred_dataset_changes():
+    """
+    Coalesce every Diagnosis change made in the block into one
+    dataset_changed() call at the end (none if nothing changed).
+    """
+    if getattr(_deferred, 'pending', None) is not None:
+        # Nested - the outermost block reports the changes
+        yield
+        return
+
+    _deferred.pending = False
+    try:
+        yield
+        changed = _deferred.pending
+    finally:
+        _deferred.pending = None
+    if changed:
+        dataset_changed()
+
+
+@receiver(post_save, sender=Diagnosis)
+@receiver(post_delete, sender=Diagnosis)
+def diagnosis_changed(sender, **kwargs):
+    """Keep derived data in sync with single-row Diagnosis writes."""
+    notify_dataset_changed()
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_changed(sender, instance, **kwargs):
+    """Re-check a changed user (deactivated, password changed...) on their next request."""
+    forget_user_tokens(instance.pk)
@@ -0,0 +1,97 @@
+"""Streaming Helpers for Ayush Bridge API
+
+Utilities to read and write large CSV / NDJSON payloads one row at a
+time, so memory use stays constant regardless of payload size.
+
+Used with Django's StreamingHttpResponse, e.g.:
+    StreamingHttpResponse(
+        streaming_content(request, iter_csv(rows, fields)),
+        content_type='text/csv',
+    )
+"""
+
+import codecs
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+
+
+# Content types for the supported streaming formats
+CSV_CONTENT_TYPE = 'text/csv'
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+# Lines joined into one write by iter_blocks() for large exports
+BLOCK_LINES = 1000
+
+
+class Echo:
+    """File-like object whose write() returns the value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def iter_lines(stream, encoding='utf-8'):
+    """
+    Yield decoded text lines from a binary file-like object (e.g. a request).
+
+    Uses an incremental decoder so multi-byte characters split across
+    reads are handled correctly.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for chunk in iter(stream.readline, b''):
+        yield decoder.decode(chunk)
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_csv(rows, fieldnames):
+    """Yield a CSV header followed by one encoded line per dict in ``rows``."""
+    writer = csv.DictWriter(Echo(), fieldnames=fieldnames, extrasaction='ignore')
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_ndjson(rows):
+    """Yield one JSON document per line for each dict in ``rows``."""
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def iter_blocks(chunks, size):
+    """Join every ``size`` consecutive strings of ``chunks`` into one (fewer, larger writes)."""
+    chunks = iter(chunks)
+    while block := ''.join(islice(chunks, size)):
+        yield block
+
+
+async def aiter_sync(iterator):
+    """
+    Async iterator over a sync iterator, advanced in Django's sync thread.
+
+    For StreamingHttpResponse under ASGI, which otherwise reads a sync
+    iterator into a list before sending anything. Each step runs with
+    thread_sensitive=True, so a database cursor the iterator holds stays
+    on one thread.
+    """
+    iterator = iter(iterator)
+    step = sync_to_async(next, thread_sensitive=True)
+    while (item := await step(iterator, None)) is not None:
+        yield item
+
+
+def streaming_content(request, chunks):
+    """
+    Return ``chunks`` as StreamingHttpResponse content for ``request``'s server.
+
+    Under ASGI (the request has an ASGI ``scope``) the sync iterator is
+    wrapped with aiter_sync(), so it is streamed instead of read into
+    memory first. Accepts Django and DRF requests (DRF proxies ``scope``).
+    """
+    if getattr(request, 'scope', None) is not None:
+        return aiter_sync(chunks)
+    return chunks
@@ -0,0 +1,229 @@
+"""Email Subscriptions for Ayush Bridge
+
+subscribe() records a subscription for the subscribe views in one of two
+modes:
+
+- Direct (default): Subscriber.objects.get_or_create per request
+- Buffered (SUBSCRIBE_BUFFERED): new emails are queued in memory and
+  written in batches with bulk_create(ignore_conflicts=True) once
+  SUBSCRIBE_FLUSH_SIZE are pending or every SUBSCRIBE_FLUSH_INTERVAL
+  seconds, by a background thread in each worker. On SQLite every write
+  takes the database-wide lock, so a sign-up spike then costs one write
+  per batch instead of one per request, and searches are not blocked
+  behind it.
+
+Buffered mode keeps the "already subscribed" answer: emails pending in
+this worker or recently seen by it are answered from memory, others by
+an indexed lookup on the unique email column. Caveats:
+- Two workers given the same new email within one flush interval both
+  answer "Subscribed successfully!" (the duplicate row is dropped)
+- Pending emails are written at process exit, but lost if the worker is
+  killed (at most SUBSCRIBE_FLUSH_SIZE / one interval's worth)
+- date_joined is the time of the flush, not of the request
+
+subscriber_rows() reads subscribers for export (export_subscribers
+command, /api/subscribers/export/) in chunks, so memory use does not
+grow with the table.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime, time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Subscriber
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_valid_email(email):
+    """Return True if ``email`` is a syntactically valid email address."""
+    try:
+        validate_email(email)
+    except ValidationError:
+        return False
+    return True
+
+
+def subscribe(email):
+    """
+    Subscribe an (already validated) email address.
+
+    Returns:
+        bool: True if newly subscribed, False if already subscribed
+    """
+    if getattr(settings, 'SUBSCRIBE_BUFFERED', False):
+        return _buffer.add(email)
+    obj, created = Subscriber.objects.get_or_create(email=email)
+    return created
+
+
+async def asubscribe(email):
+    """
+    Async variant of subscribe().
+
+    Direct mode uses the async ORM (aget_or_create); the buffer is
+    synchronous and runs in a worker thread.
+    """
+    if getattr(settings, 'SUBSCRIBE_BUFFERED', False):
+        return await sync_to_async(_buffer.add)(email)
+    obj, created = await Subscriber.objects.aget_or_create(email=email)
+    return created
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+# Columns of exported rows (CSV header / NDJSON keys)
+SUBSCRIBER_FIELDS = ['email', 'date_joined']
+
+
+def parse_date_bound(value):
+    """
+    Parse an export range bound: an ISO date ("2026-01-31", midnight) or
+    datetime. Times without an offset are in the current time zone.
+
+    Raises:
+        ValueError: If ``value`` is neither
+    """
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Invalid date: {value!r} (use YYYY-MM-DD or an ISO 8601 datetime)')
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def subscriber_rows(since=None, until=None, chunk_size=None):
+    """
+    Yield subscribers as dicts (SUBSCRIBER_FIELDS), oldest first.
+
+    Rows are fetched ``chunk_size`` at a time from one query (a server-side
+    cursor on PostgreSQL) instead of loading the table. The date_joined
+    range - ``since`` inclusive, ``until`` exclusive - and the ordering
+    are served by the date_joined index.
+    """
+    queryset = Subscriber.objects.order_by('date_joined')
+    if since is not None:
+        queryset = queryset.filter(date_joined__gte=since)
+    if until is not None:
+        queryset = queryset.filter(date_joined__lt=until)
+    chunk_size = chunk_size or getattr(settings, 'SUBSCRIBER_EXPORT_CHUNK_SIZE', 2000)
+    for email, date_joined in queryset.values_list('email', 'date_joined').iterator(chunk_size=chunk_size):
+        yield {'email': email, 'date_joined': date_joined.isoformat()}
+
+
+# ============================================================================
+# WRITE BUFFER
+# ============================================================================
+class SubscriptionBuffer:
+    """
+    Per-process queue of new subscriptions, flushed in batches.
+
+    Args:
+        flush_size (int): Pending emails that trigger an immediate flush
+        flush_interval (float): Seconds between background flushes
+        known_size (int): Most already-subscribed emails remembered
+    """
+
+    def __init__(self, flush_size, flush_interval, known_size):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.known_size = known_size
+        self.pending = {}   # Email -> None, in arrival order
+        self.known = {}     # Emails known to be stored, oldest first
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher_pid = None
+
+    def add(self, email):
+        """Queue ``email`` unless it is already subscribed; returns True if queued."""
+        with self._lock:
+            if email in self.pending or email in self.known:
+                return False
+        if Subscriber.objects.filter(email=email).exists():  # Unique index
+            self._remember([email])
+            return False
+        with self._lock:
+            if email in self.pending:
+                return False
+            self.pending[email] = None
+            full = len(self.pending) >= self.flush_size
+        self._ensure_flusher()
+        if full:
+            self._wake.set()
+        return True
+
+    def flush(self):
+        """
+        Write the pending emails now.
+
+        Returns:
+            int: Emails written (0 if none were pending or the write failed
+            - failed batches are put back and retried)
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self.pending = list(self.pending), {}
+            if not batch:
+                return 0
+            try:
+                Subscriber.objects.bulk_create(
+                    [Subscriber(email=email) for email in batch],
+                    ignore_conflicts=True,  # Subscribed meanwhile by another worker
+                )
+            except DatabaseError:
+                logger.exception('subscription flush failed', extra={'pending': len(batch)})
+                with self._lock:
+                    self.pending = dict.fromkeys(batch) | self.pending
+                return 0
+            self._remember(batch)
+            return len(batch)
+
+    def _remember(self, emails):
+        with self._lock:
+            self.known.update(dict.fromkeys(emails))
+            while len(self.known) > self.known_size:
+                del self.known[next(iter(self.known))]
+
+    def _ensure_flusher(self):
+        # One flusher thread per process, started on first use - after
+        # the fork when gunicorn preloads the app
+        if self._flusher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._run, name='subscribe-flush', daemon=True).start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            close_old_connections()
+            self.flush()
+
+
+_buffer = SubscriptionBuffer(
+    flush_size=getattr(settings, 'SUBSCRIBE_FLUSH_SIZE', 100),
+    flush_interval=getattr(settings, 'SUBSCRIBE_FLUSH_INTERVAL', 1.0),
+    known_size=getattr(settings, 'SUBSCRIBE_KNOWN_SIZE', 100_000),
+)
+
+# Do not drop queued subscriptions on a graceful shutdown
+atexit.register(_buffer.flush)
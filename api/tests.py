@@ -1,3 +1,1139 @@
-from django.test import TestCase
+"""Tests for the Ayush Bridge API.
 
-# Create your tests here.
+Search tests run against ayush_data.csv and compare with the ranking of
+the original thefuzz search loop (baseline_ranking()).
+
+Every test runs with QUERY_GUARD_STRICT, so a request that repeats a
+statement or exceeds its route's QUERY_BUDGETS entry fails the test
+(api/query_guard.py).
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import pstats
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import path
+from drf_yasg import openapi
+from drf_yasg.generators import OpenAPISchemaGenerator
+from prometheus_client.parser import text_string_to_metric_families
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+from thefuzz import fuzz
+
+from . import autocomplete as autocomplete_module, fts, scoring, search_index
+from .autocomplete import autocomplete, get_autocomplete_index
+from .authentication import CachedJWTAuthentication, cached_token, clear_token_cache
+from .executor import BoundedExecutor, Saturated
+from .importer import import_csv, import_rows, read_rows, sync_rows
+from .models import DatasetVersion, Diagnosis, Subscriber
+from .normalize import fold, split_term
+from .pagination import InvalidPage, decode_cursor, encode_cursor
+from .query_guard import QueryBudgetExceeded
+from .scoring import DEFAULT_LIMIT, MIN_SCORE, rank_key, top_matches
+from .search import batch_search_diagnoses, candidate_positions, lookup_namaste, normalize_query, search_diagnoses, search_page
+from .search_cache import cache_stats, clear_search_cache, get_search_cache, make_key
+from .subscriptions import SubscriptionBuffer, asubscribe
+from .transliterate import phonetic_key
+from .trigrams import WORD_SEPARATOR
+from .views import search_api, search_api_async, subscribe_api, subscribe_api_async
+
+
+DATA_CSV = settings.BASE_DIR / 'ayush_data.csv'
+
+
+def baseline_scores(query):
+    """(term, score) pairs ranked by the original search_api loop (thefuzz, score > 60)."""
+    scored = []
+    for term in Diagnosis.objects.values_list('term', flat=True):
+        score = max(fuzz.ratio(query.lower(), term.lower()), fuzz.partial_ratio(query.lower(), term.lower()))
+        if score > 60:
+            scored.append((-score, len(term), term))
+    return [(term, -score) for score, _length, term in sorted(scored)]
+
+
+def baseline_ranking(query):
+    """Terms ranked by the original search_api loop."""
+    return [term for term, _score in baseline_scores(query)]
+
+
+@override_settings(
+    QUERY_GUARD_STRICT=True,
+    # Fast hashing for test users; not what is being tested
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class DatasetTestCase(TestCase):
+    """TestCase with ayush_data.csv imported and this process's search state reset."""
+
+    @classmethod
+    def setUpTestData(cls):
+        import_csv(DATA_CSV)
+
+    def setUp(self):
+        # Transaction rollbacks send no signals: drop the index and cached
+        # results another test built for the same dataset version
+        search_index._index = None
+        search_index.invalidate_search_index()
+        clear_search_cache()
+
+
+# ============================================================================
+# SCORING
+# ============================================================================
+class ScoringTests(DatasetTestCase):
+    """The RapidFuzz engine scores and ranks exactly like the original thefuzz loop."""
+
+    def queries(self):
+        """Names, glosses, prefixes and one-letter typos of every term, plus odd cases."""
+        queries = {'fever', 'FEVER', 'cough', 'pain', 'vata', 'roga', 'a', 'zz', 'xyzzy', 'Jwara (Fever)'}
+        for term in Diagnosis.objects.values_list('term', flat=True):
+            name, gloss = split_term(term)
+            queries.update({name, gloss, name[:4], name[:2] + name[3:]})
+        return sorted(query for query in queries if query)
+
+    def test_matches_baseline_scores_and_order(self):
+        index = search_index.get_search_index()
+        queries = self.queries()
+        self.assertGreater(len(queries), 150)
+        for query in queries:
+            with self.subTest(query=query):
+                matches = top_matches(normalize_query(query), index, limit=len(index))
+                ranked = [(index.terms[position], score) for position, score in matches]
+                self.assertEqual(ranked, baseline_scores(query))
+
+    def test_sort_order_and_cutoff(self):
+        index = search_index.get_search_index()
+        for query in ('jwara', 'fever', 'kas', 'vata'):
+            with self.subTest(query=query):
+                matches = top_matches(normalize_query(query), index, limit=len(index))
+                keys = [rank_key(score, index.lengths[i], index.terms[i]) for i, score in matches]
+                self.assertEqual(keys, sorted(keys))
+                self.assertTrue(all(score > MIN_SCORE for _i, score in matches))
+
+    def test_scores_at_the_cutoff_are_dropped(self):
+        index = search_index.get_search_index()
+        terms = list(Diagnosis.objects.values_list('term', flat=True))
+        for query in ('jwara', 'kapha', 'fever'):
+            with self.subTest(query=query):
+                at_cutoff = {
+                    term for term in terms
+                    if max(fuzz.ratio(query, term.lower()), fuzz.partial_ratio(query, term.lower())) == MIN_SCORE
+                }
+                self.assertTrue(at_cutoff)
+                matches = top_matches(query, index, limit=len(index))
+                self.assertFalse(at_cutoff & {index.terms[i] for i, _score in matches})
+
+    def test_limit_keeps_the_best(self):
+        index = search_index.get_search_index()
+        full = top_matches('fever', index, limit=len(index))
+        self.assertEqual(top_matches('fever', index, limit=3), full[:3])
+
+
+# ============================================================================
+# DATASET CHANGES
+# ============================================================================
+class DatasetChangeTests(DatasetTestCase):
+    """Each worker's search index and result cache follow the Diagnosis table."""
+
+    def test_index_rebuilt_after_save_and_delete(self):
+        self.assertIsNone(lookup_namaste('NAM-99-0001'))
+        with self.captureOnCommitCallbacks(execute=True):
+            row = Diagnosis.objects.create(term='Santapa (Fever)', namaste_code='NAM-99-0001', icd_code='MG26')
+        self.assertEqual(lookup_namaste('NAM-99-0001')['term'], 'Santapa (Fever)')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            row.icd_code = 'MG27'
+            row.save()
+        self.assertEqual(lookup_namaste('NAM-99-0001')['icd'], 'MG27')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            row.delete()
+        self.assertIsNone(lookup_namaste('NAM-99-0001'))
+
+    def test_cached_results_dropped_on_change(self):
+        self.assertEqual(search_diagnoses('kasa')[0], {'term': 'Kasa (Cough)', 'namaste': 'NAM-04-1102', 'icd': 'MD21'})
+        self.assertEqual(search_diagnoses('kasa')[0]['icd'], 'MD21')  # Served from the cache
+        key = make_key(search_index.get_search_index().version, normalize_query('kasa'), DEFAULT_LIMIT)
+        self.assertIsNotNone(get_search_cache().get(key))
+        hits = cache_stats()['hits']
+        with self.captureOnCommitCallbacks(execute=True):
+            row = Diagnosis.objects.get(term='Kasa (Cough)')
+            row.icd_code = 'MD12'
+            row.save()
+        self.assertIsNone(get_search_cache().get(key))  # Cleared, not just keyed by the old version
+        self.assertEqual(search_diagnoses('kasa')[0]['icd'], 'MD12')
+        self.assertEqual(cache_stats()['hits'], hits)  # Recomputed, not a stale hit
+
+    @override_settings(SEARCH_INDEX_VERSION_CHECK_INTERVAL=60)
+    def test_index_rebuilt_after_version_bump_elsewhere(self):
+        index = search_index.get_search_index()
+        # Another process: bulk write (no signals here) and version bump
+        Diagnosis.objects.bulk_create([Diagnosis(
+            term='Santapa (Fever)', namaste_code='NAM-99-0001', icd_code='MG26',
+            **Diagnosis.derived_fields('Santapa (Fever)', 'NAM-99-0001', 'MG26'),
+        )])
+        DatasetVersion.bump()
+
+        self.assertIs(search_index.get_search_index(), index)  # Stamp re-read at most every interval
+        self.assertIsNone(lookup_namaste('NAM-99-0001'))
+        later = time.monotonic() + 61
+        with mock.patch('api.search_index.time.monotonic', return_value=later):
+            self.assertIsNot(search_index.get_search_index(), index)
+            self.assertEqual(lookup_namaste('NAM-99-0001')['term'], 'Santapa (Fever)')
+
+
+# ============================================================================
+# PAGINATION
+# ============================================================================
+class PaginationTests(DatasetTestCase):
+    """Cursor pages concatenate to the full ranking, with no repeats or gaps."""
+
+    def all_pages(self, query, limit):
+        results, cursor = [], None
+        while True:
+            page, cursor = search_page(query, limit=limit, cursor=cursor)
+            self.assertLessEqual(len(page), limit)
+            results.extend(page)
+            if cursor is None:
+                return results
+
+    def test_pages_round_trip(self):
+        for query in ('fever', 'kas', 'vata', 'jwara'):
+            expected, cursor = search_page(query, limit=100)
+            self.assertIsNone(cursor)
+            for limit in (1, 3, 10):
+                with self.subTest(query=query, limit=limit):
+                    self.assertEqual(self.all_pages(query, limit), expected)
+
+    def test_cursor_encoding(self):
+        self.assertEqual(decode_cursor(encode_cursor(87, 13, 'Jwara (Fever)')), (-87, 13, 'Jwara (Fever)'))
+        for cursor in ('', 'not-a-cursor', encode_cursor('87', 13, 'x'), 'WzEsMl0'):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidPage):
+                    decode_cursor(cursor)
+
+    def test_link_header_round_trip(self):
+        expected = self.client.get('/api/search/', {'q': 'fever', 'limit': 100}).json()
+        results, url = [], '/api/search/?q=fever&limit=4'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            results.extend(response.json())
+            link = response.headers.get('Link')
+            url = link[1:link.index('>')] if link else None
+        self.assertEqual(results, expected)
+
+    def test_invalid_limit_and_cursor(self):
+        for params in ({'limit': 0}, {'limit': 101}, {'limit': 'ten'}, {'cursor': 'bogus'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/search/', {'q': 'fever', **params})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+
+# ============================================================================
+# EXACT CODE MAPPING
+# ============================================================================
+class CodeMappingTests(DatasetTestCase):
+    """/api/map/ lookups agree with the CSV rows they were imported from."""
+
+    def setUp(self):
+        super().setUp()
+        with open(DATA_CSV, encoding='utf-8') as file:
+            self.rows = list(read_rows(file))
+
+    def test_namaste_lookup(self):
+        for term, namaste, icd in self.rows:
+            for code in (namaste, namaste.lower()):
+                with self.subTest(code=code):
+                    response = self.client.get(f'/api/map/namaste/{code}/')
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response.json(), {'term': term, 'namaste': namaste, 'icd': icd})
+
+    def test_icd_lookup_lists_every_diagnosis(self):
+        by_icd = {}
+        for term, namaste, icd in self.rows:
+            by_icd.setdefault(icd, []).append(term)
+        for code, terms in by_icd.items():
+            with self.subTest(code=code):
+                response = self.client.get(f'/api/map/icd/{code.lower()}/')
+                self.assertEqual(response.status_code, 200)
+                expected = sorted(terms, key=lambda term: (len(term), term))
+                self.assertEqual([mapping['term'] for mapping in response.json()], expected)
+
+    def test_icd_lookup_order(self):
+        response = self.client.get('/api/map/icd/7A00/')
+        self.assertEqual([mapping['namaste'] for mapping in response.json()], ['NAM-06-0800', 'AAB-50', 'AAB-9'])
+
+    def test_unknown_codes(self):
+        for url in ('/api/map/namaste/NAM-00-0000/', '/api/map/icd/ZZ99/'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 404)
+                self.assertIn('error', response.json())
+
+
+# ============================================================================
+# HTTP CACHING
+# ============================================================================
+class HttpCachingTests(DatasetTestCase):
+    """Only successful dataset responses carry validators and public caching."""
+
+    def test_success_is_cacheable(self):
+        for url in ('/api/search/?q=fever', '/api/map/namaste/NAM-06-0800/', '/api/map/icd/7A00/'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('public', response.headers['Cache-Control'])
+                self.assertIn('ETag', response.headers)
+                revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=response.headers['ETag'])
+                self.assertEqual(revalidated.status_code, 304)
+                self.assertIn('public', revalidated.headers['Cache-Control'])
+
+    def test_errors_are_not_cached(self):
+        for url in ('/api/search/?q=fever&cursor=bogus', '/api/search/?q=fever&limit=0',
+                    '/api/map/namaste/NAM-00-0000/', '/api/map/icd/ZZ99/'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn(response.status_code, (400, 404))
+                self.assertNotIn('ETag', response.headers)
+                self.assertNotIn('Last-Modified', response.headers)
+                self.assertNotIn('public', response.headers.get('Cache-Control', ''))
+
+
+# ============================================================================
+# PHONETIC SEARCH
+# ============================================================================
+class PhoneticSearchTests(DatasetTestCase):
+    """Phonetic hits rank first; the fuzzy ranking fills the rest of the page."""
+
+    QUERIES = [
+        'jwara', 'Jvara', 'kasa', 'kas', 'atisara', 'amlapitta',
+        'Shwasa', 'arsha', 'prameha', 'grahani', 'fever',
+    ]
+
+    def phonetic_hits(self, query):
+        key = phonetic_key(query)
+        terms = Diagnosis.objects.values_list('term', flat=True)
+        return sorted((t for t in terms if phonetic_key(split_term(t)[0]) == key), key=lambda t: (len(t), t))
+
+    def test_matches_baseline_after_phonetic_hits(self):
+        for query in self.QUERIES:
+            with self.subTest(query=query):
+                hits = self.phonetic_hits(query)
+                expected = (hits + [t for t in baseline_ranking(query) if t not in hits])[:10]
+                results = [row['term'] for row in search_diagnoses(query)]
+                self.assertEqual(results, expected)
+
+    def test_phonetic_hit_does_not_truncate_results(self):
+        results = [row['term'] for row in search_diagnoses('jwara')]
+        self.assertEqual(results[0], 'Jwara (Fever)')
+        self.assertEqual(len(results), len(baseline_ranking('jwara')[:10]))
+        self.assertEqual(len(search_diagnoses('kasa')), 10)
+        self.assertEqual(len(search_diagnoses('kas')), 10)
+
+    def test_spelling_and_script_variants(self):
+        for query in ('Jvara', 'jvAra', 'Jwar', 'ज्वर'):
+            with self.subTest(query=query):
+                self.assertEqual(search_diagnoses(query)[0]['term'], 'Jwara (Fever)')
+
+    def test_pages_continue_past_phonetic_hits(self):
+        expected, _cursor = search_page('jwara', limit=100)
+        pages, cursor = [], None
+        while True:
+            page, cursor = search_page('jwara', limit=1, cursor=cursor)
+            pages.extend(page)
+            if cursor is None:
+                break
+        self.assertEqual(pages, expected)
+
+
+# ============================================================================
+# FTS5 ENGINE
+# ============================================================================
+class FtsSearchTests(TransactionTestCase):
+    """
+    The optional FTS5 engine. SQLite cannot roll back a virtual table
+    created inside a transaction cleanly, so the index is created and
+    dropped around each test instead of inside TestCase's transaction.
+    """
+
+    def setUp(self):
+        import_csv(DATA_CSV)
+        search_index._index = None
+        search_index.invalidate_search_index()
+        clear_search_cache()
+        call_command('fts_index', stdout=io.StringIO())
+
+    def tearDown(self):
+        call_command('fts_index', '--drop', stdout=io.StringIO())
+
+    @override_settings(SEARCH_ENGINE='fts5')
+    def test_ranks_phonetic_hits_first(self):
+        results = [row['term'] for row in search_diagnoses('jvara')]
+        self.assertEqual(results[0], 'Jwara (Fever)')
+        self.assertGreater(len(results), 1)
+
+    @override_settings(SEARCH_ENGINE='fts5', QUERY_GUARD_STRICT=True)
+    def test_search_within_budget(self):
+        for query in ('fever', 'jvara'):
+            with self.subTest(query=query):
+                clear_search_cache()
+                response = self.client.get('/api/search/', {'q': query})
+                self.assertEqual(response.status_code, 200)
+
+    @override_settings(SEARCH_ENGINE='fts5')
+    def test_missing_index(self):
+        call_command('fts_index', '--drop', stdout=io.StringIO())
+        with self.assertRaisesMessage(ImproperlyConfigured, 'manage.py fts_index'):
+            fts.shortlist('fever')
+
+    def test_index_follows_writes(self):
+        self.assertIn('Jwara (Fever)', [row[0] for row in fts.shortlist('jwara')])
+        row = Diagnosis.objects.get(term='Jwara (Fever)')
+        row.term = 'Santapa (Fever)'
+        row.save()
+        self.assertNotIn('Jwara (Fever)', [row[0] for row in fts.shortlist('jwara')])
+        self.assertIn('Santapa (Fever)', [row[0] for row in fts.shortlist('santapa')])
+        row.delete()
+        self.assertNotIn('Santapa (Fever)', [row[0] for row in fts.shortlist('santapa')])
+
+
+# ============================================================================
+# BATCH SEARCH
+# ============================================================================
+class BatchSearchTests(DatasetTestCase):
+    """Batch search ranks every query exactly like /api/search/."""
+
+    QUERIES = ['fever', 'jwara', 'kas', 'vata roga', 'feve', 'Jvara', 'cough', 'zzzz', '']
+
+    def assert_same_as_search(self):
+        expected = [search_diagnoses(query) if query else [] for query in self.QUERIES]
+        self.assertEqual(batch_search_diagnoses(self.QUERIES), expected)
+
+    def test_same_ranking_as_search(self):
+        self.assert_same_as_search()
+
+    @override_settings(SEARCH_TRIGRAM_MIN_CORPUS=1)
+    def test_same_ranking_as_search_with_trigram_prefilter(self):
+        self.assert_same_as_search()
+
+    @override_settings(SEARCH_TRIGRAM_MIN_CORPUS=1)
+    def test_scores_only_candidate_union(self):
+        queries = ['fever', 'jwara', 'vata roga', 'zzzz']
+        index = search_index.get_search_index()
+        union = set()
+        for query in queries:
+            union.update(candidate_positions(normalize_query(query), index).tolist())
+        expected = [search_diagnoses(query) for query in queries]
+        with mock.patch('api.scoring.score_matrix', wraps=scoring.score_matrix) as score:
+            self.assertEqual(batch_search_diagnoses(queries), expected)
+        self.assertEqual(score.call_count, 1)
+        self.assertEqual(sorted(score.call_args.args[1]), sorted(index.keys[i] for i in union))
+        self.assertLess(len(union), len(index.keys))
+
+    @override_settings(SEARCH_TRIGRAM_MIN_CORPUS=1)
+    def test_same_ranking_in_small_blocks(self):
+        with mock.patch('api.scoring.MAX_MATRIX_CELLS', 1):  # One query per block
+            self.assert_same_as_search()
+
+    def test_api(self):
+        response = self.client.post('/api/search/batch/', {'queries': ['fever', '']}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [
+            {'query': 'fever', 'results': search_diagnoses('fever')},
+            {'query': '', 'results': []},
+        ])
+
+    def test_invalid_bodies(self):
+        for body in ([], ['fever'], 'fever', 1, {'queries': 'fever'}, {'queries': [1]}):
+            with self.subTest(body=body):
+                response = self.client.post('/api/search/batch/', json.dumps(body), content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': 'queries must be a list of strings'})
+
+
+# ============================================================================
+# AUTOCOMPLETE
+# ============================================================================
+class AutocompleteTests(DatasetTestCase):
+    """Completions match a brute-force scan of ayush_data.csv."""
+
+    def setUp(self):
+        super().setUp()
+        autocomplete_module._autocomplete = None
+        with open(DATA_CSV, encoding='utf-8') as file:
+            self.rows = [
+                (term, [word for word in WORD_SEPARATOR.split(fold(term)) if word], namaste, icd)
+                for term, namaste, icd in read_rows(file)
+            ]
+
+    def expected(self, prefix, limit):
+        matches = [
+            (term, namaste, icd) for term, words, namaste, icd in self.rows
+            if any(' '.join(words[start:]).startswith(prefix) for start in range(len(words)))
+        ]
+        matches.sort(key=lambda row: (len(row[0]), row[0]))
+        return [{'term': term, 'namaste': namaste, 'icd': icd} for term, namaste, icd in matches[:limit]]
+
+    def prefixes(self):
+        prefixes = set()
+        for term, words, namaste, icd in self.rows:
+            for start, word in enumerate(words):
+                prefixes.update(word[:size] for size in (1, 2, 3))
+                if start + 1 < len(words):
+                    prefixes.add(f'{word} {words[start + 1][:2]}')
+        return sorted(prefixes)
+
+    def assert_matches_scan(self, limit):
+        for prefix in self.prefixes():
+            with self.subTest(prefix=prefix):
+                self.assertEqual(autocomplete(prefix), self.expected(prefix, limit))
+
+    def test_prefix_order_and_limit(self):
+        self.assertEqual(len(autocomplete('a')), settings.AUTOCOMPLETE_LIMIT)
+        self.assert_matches_scan(settings.AUTOCOMPLETE_LIMIT)
+
+    @override_settings(AUTOCOMPLETE_LIMIT=3)
+    def test_precomputed_prefixes(self):
+        with mock.patch('api.autocomplete.SCAN_LIMIT', 4):
+            self.assertTrue(get_autocomplete_index().top)  # Large ranges precomputed
+            self.assert_matches_scan(3)
+
+    def test_folded_input(self):
+        for raw, prefix in (('JWĀ', 'jwa'), ('  Vishama   Jw', 'vishama jw'), ('ｊｗａ', 'jwa'), ('Jwara (', 'jwara')):
+            with self.subTest(raw=raw):
+                self.assertEqual(autocomplete(raw), self.expected(prefix, settings.AUTOCOMPLETE_LIMIT))
+                self.assertTrue(autocomplete(raw))
+        self.assertEqual(autocomplete(' ( '), [])
+        self.assertEqual(self.client.get('/api/autocomplete/', {'prefix': 'Jwā'}).json(), autocomplete('jwa'))
+
+
+# ============================================================================
+# QUERY BUDGETS
+# ============================================================================
+class QueryBudgetTests(DatasetTestCase):
+    """
+    Call every route of QUERY_BUDGETS; strict mode raises QueryBudgetExceeded
+    if one runs more queries than its budget.
+
+    Each request is the first after setUp() dropped the index, so it also
+    pays the dataset stamp check and the index load.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        User = get_user_model()
+        cls.user = User.objects.create_user('reader', 'reader@example.org', 'pass-12345')
+        cls.staff = User.objects.create_user('admin', 'admin@example.org', 'pass-12345', is_staff=True)
+        Subscriber.objects.create(email='known@example.org')
+
+    def bearer(self, user):
+        return {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+    def test_every_budgeted_route_is_covered(self):
+        tested = {
+            'api/search/', 'api/search/batch/', 'api/autocomplete/',
+            'api/map/namaste/<str:code>/', 'api/map/icd/<str:code>/',
+            'api/translate/bulk/', 'api/subscribe/', 'api/subscribers/export/',
+            'api/auth/token/', 'api/auth/token/refresh/', 'api/auth/token/verify/',
+            'metrics',
+        }
+        self.assertEqual(set(settings.QUERY_BUDGETS), tested)
+
+    def test_search(self):
+        response = self.client.get('/api/search/', {'q': 'fever'})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(CACHES={**settings.CACHES, 'search': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'search_cache_test',
+    }})
+    def test_cached_search_database_cache(self):
+        call_command('createcachetable', stdout=io.StringIO())
+        search_diagnoses('fever')  # Warm the cache outside the request
+        before = cache_stats()
+        response = self.client.get('/api/search/', {'q': 'fever'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(cache_stats()['hits'], before['hits'] + 1)
+        self.assertEqual(get_search_cache().get_many(['search:stats:hits', 'search:stats:misses']), {})
+
+    def test_batch_search(self):
+        response = self.client.post('/api/search/batch/', {'queries': ['fever', 'kasa']}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_autocomplete(self):
+        response = self.client.get('/api/autocomplete/', {'prefix': 'jwa'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_code_mappings(self):
+        self.assertEqual(self.client.get('/api/map/namaste/NAM-01-0023/').status_code, 200)
+        search_index._index = None
+        self.assertEqual(self.client.get('/api/map/icd/MG26/').status_code, 200)
+
+    def test_bulk_translate(self):
+        response = self.client.post(
+            '/api/translate/bulk/', 'code\nNAM-01-0023\nKasa\n',
+            content_type='text/csv', headers=self.bearer(self.user),
+        )
+        self.assertEqual(response.status_code, 200)
+        b''.join(response.streaming_content)
+
+    def test_subscribe(self):
+        for email in ('new@example.org', 'known@example.org'):
+            with self.subTest(email=email):
+                response = self.client.post('/api/subscribe/', {'email': email}, content_type='application/json')
+                self.assertEqual(response.status_code, 200)
+
+    def test_subscriber_export(self):
+        response = self.client.get('/api/subscribers/export/', headers=self.bearer(self.staff))
+        self.assertEqual(response.status_code, 200)
+        b''.join(response.streaming_content)
+
+    def test_token_endpoints(self):
+        for identifier in ('reader', 'READER@example.org'):
+            with self.subTest(identifier=identifier):
+                response = self.client.post('/api/auth/token/', {'username': identifier, 'password': 'pass-12345'})
+                self.assertEqual(response.status_code, 200)
+        tokens = response.json()
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post('/api/auth/token/verify/', {'token': tokens['access']})
+        self.assertEqual(response.status_code, 200)
+
+    def test_metrics(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    @override_settings(QUERY_BUDGETS={'api/search/': 0})
+    def test_over_budget_request_fails_in_strict_mode(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/api/search/', {'q': 'fever'})
+
+
+# ============================================================================
+# REQUEST METRICS
+# ============================================================================
+def server_timing(response):
+    """Parse a Server-Timing header into {name: (milliseconds, description)}."""
+    entries = {}
+    for entry in response['Server-Timing'].split(', '):
+        name, *params = entry.split(';')
+        params = dict(param.split('=', 1) for param in params)
+        entries[name] = (float(params['dur']), params.get('desc', '').strip('"'))
+    return entries
+
+
+def scraped_samples(response):
+    """Parse a /metrics response into {(sample name, labels): value}."""
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(response.content.decode())
+        for sample in family.samples
+    }
+
+
+class RequestMetricsTests(DatasetTestCase):
+    """Server-Timing headers and the Prometheus output at /metrics."""
+
+    def test_server_timing_stages(self):
+        response = self.client.get('/api/search/', {'q': 'fever'})
+        timing = server_timing(response)
+        for name in ('total', 'db', 'index', 'cache', 'normalize', 'score', 'rank', 'format', 'serialize'):
+            self.assertIn(name, timing)
+            self.assertGreaterEqual(timing[name][0], 0)
+        self.assertGreater(int(timing['db'][1].removeprefix('queries=')), 0)
+        self.assertLessEqual(timing['score'][0], timing['total'][0])
+
+        # Cache hit on an already loaded index: neither scored nor queried
+        timing = server_timing(self.client.get('/api/search/', {'q': 'fever'}))
+        self.assertIn('cache', timing)
+        self.assertNotIn('score', timing)
+        self.assertEqual(timing['db'][1], 'queries=0')
+
+    def test_server_timing_on_unmatched_route(self):
+        response = self.client.get('/no-such-page/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(set(server_timing(response)), {'total', 'db'})
+
+    def test_metrics_output(self):
+        duration = ('ayush_http_request_duration_seconds_count', (('method', 'GET'), ('route', 'api/search/'), ('status', '200')))
+        queries = ('ayush_db_queries_per_request_count', (('method', 'GET'), ('route', 'api/search/')))
+        cache = {
+            result: ('ayush_search_cache_lookups_total', (('result', result),))
+            for result in ('hit', 'miss')
+        }
+        before = scraped_samples(self.client.get('/metrics'))
+        self.client.get('/api/search/', {'q': 'fever'})
+        self.client.get('/api/search/', {'q': 'fever'})
+        self.client.get('/no-such-page/')
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        after = scraped_samples(response)
+        self.assertEqual(after[duration] - before.get(duration, 0), 2)
+        self.assertEqual(after[queries] - before.get(queries, 0), 2)
+        self.assertEqual(after[cache['miss']] - before.get(cache['miss'], 0), 1)
+        self.assertEqual(after[cache['hit']] - before.get(cache['hit'], 0), 1)
+        unmatched = ('ayush_http_request_duration_seconds_count', (('method', 'GET'), ('route', '<unmatched>'), ('status', '404')))
+        self.assertGreaterEqual(after[unmatched], 1)
+
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+class ProfilingTests(DatasetTestCase):
+    """Sampled cProfile dumps land in PROFILE_DIR, and only when enabled."""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.profile_dir = Path(directory.name) / 'profiles'
+
+    def search(self, **overrides):
+        with self.settings(PROFILE_DIR=self.profile_dir, **overrides):
+            response = self.client.get('/api/search/', {'q': 'fever'})
+        self.assertEqual(response.status_code, 200)
+        return sorted(self.profile_dir.glob('*.prof')) if self.profile_dir.exists() else []
+
+    def test_sampled_request_is_dumped(self):
+        with self.assertLogs('api.profiling', 'WARNING') as logs:
+            dumps = self.search(PROFILE_SAMPLE_RATE=1.0, PROFILE_SLOW_MS=None)
+        self.assertEqual(len(dumps), 1)
+        self.assertIn('-GET-api_search-', dumps[0].name)
+        self.assertEqual(logs.records[0].path, str(dumps[0]))
+        stats = pstats.Stats(str(dumps[0]))
+        self.assertTrue(any(function == 'search_page' for _, _, function in stats.stats))
+
+    def test_slow_request_is_dumped(self):
+        with self.assertLogs('api.profiling', 'WARNING'):
+            self.assertEqual(len(self.search(PROFILE_SAMPLE_RATE=0.0, PROFILE_SLOW_MS=0)), 1)
+
+    def test_disabled_writes_nothing(self):
+        self.assertEqual(self.search(PROFILE_SAMPLE_RATE=0.0, PROFILE_SLOW_MS=None), [])
+        self.assertFalse(self.profile_dir.exists())
+        self.assertEqual(self.search(PROFILE_SAMPLE_RATE=0.0, PROFILE_SLOW_MS=60_000), [])
+
+
+# ============================================================================
+# STREAMING RESPONSES
+# ============================================================================
+class BulkTranslateTests(DatasetTestCase):
+    """Rows are translated as the response streams; under ASGI with an async iterator."""
+
+    BODY = 'code\nNAM-01-0023\nKasa\nzzzz\n'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = get_user_model().objects.create_user('reader', 'reader@example.org', 'pass-12345')
+
+    def setUp(self):
+        super().setUp()
+        self.headers = {'Authorization': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+
+    def test_wsgi_translation_streams_sync_iterator(self):
+        response = self.client.post('/api/translate/bulk/', self.BODY, content_type='text/csv', headers=self.headers)
+        self.assertFalse(response.is_async)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines, [
+            'row,input,status,term,namaste,icd',
+            '1,NAM-01-0023,mapped,Jwara (Fever),NAM-01-0023,MG26',
+            '2,Kasa,matched,Kasa (Cough),NAM-04-1102,MD21',
+            '3,zzzz,unmapped,,,',
+        ])
+
+    async def test_asgi_translation_streams_async_iterator(self):
+        response = await self.async_client.post(
+            '/api/translate/bulk/?output=ndjson', self.BODY, content_type='text/csv', headers=self.headers,
+        )
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.splitlines()), 3)
+
+
+class SubscribeTests(DatasetTestCase):
+    """asubscribe() writes through the async ORM in direct mode."""
+
+    async def test_asubscribe_direct(self):
+        self.assertTrue(await asubscribe('new@example.org'))
+        self.assertFalse(await asubscribe('new@example.org'))
+        self.assertEqual(await Subscriber.objects.filter(email='new@example.org').acount(), 1)
+
+    async def test_async_subscribe_view(self):
+        factory = AsyncRequestFactory()
+        for message in ('Subscribed successfully!', 'You are already subscribed.'):
+            request = factory.post('/api/subscribe/', {'email': 'async@example.org'}, content_type='application/json')
+            response = await subscribe_api_async(request)
+            self.assertEqual(json.loads(response.content), {'message': message})
+        self.assertEqual(await Subscriber.objects.filter(email='async@example.org').acount(), 1)
+
+
+class SubscriptionBufferTests(TransactionTestCase):
+    """
+    Buffered mode. The flusher thread writes through its own connection,
+    so these tests commit for real instead of running in a transaction.
+    """
+
+    def make_buffer(self, flush_size=100, flush_interval=3600):
+        buffer = SubscriptionBuffer(flush_size=flush_size, flush_interval=flush_interval, known_size=100)
+        # Park the flusher thread so it outlives the test harmlessly
+        self.addCleanup(buffer._wake.set)
+        self.addCleanup(setattr, buffer, 'flush_interval', 3600)
+        return buffer
+
+    def wait_for_subscribers(self, count):
+        deadline = time.monotonic() + 5
+        while Subscriber.objects.count() < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(Subscriber.objects.count(), count)
+
+    def test_flush_when_full(self):
+        buffer = self.make_buffer(flush_size=2)
+        self.assertTrue(buffer.add('a@example.org'))
+        self.assertEqual(Subscriber.objects.count(), 0)
+        self.assertTrue(buffer.add('b@example.org'))
+        self.wait_for_subscribers(2)
+
+    def test_flush_on_interval(self):
+        buffer = self.make_buffer(flush_interval=0.05)
+        self.assertTrue(buffer.add('a@example.org'))
+        self.wait_for_subscribers(1)
+
+    def test_already_subscribed(self):
+        Subscriber.objects.create(email='stored@example.org')
+        buffer = self.make_buffer()
+        with mock.patch.object(buffer, '_ensure_flusher'):
+            self.assertTrue(buffer.add('new@example.org'))
+            self.assertFalse(buffer.add('new@example.org'))  # Pending
+            self.assertFalse(buffer.add('stored@example.org'))  # Unique index lookup
+            self.assertEqual(buffer.flush(), 1)
+            with self.assertNumQueries(0):  # Both now remembered
+                self.assertFalse(buffer.add('new@example.org'))
+                self.assertFalse(buffer.add('stored@example.org'))
+
+    def test_failed_batch_is_put_back(self):
+        buffer = self.make_buffer()
+        with mock.patch.object(buffer, '_ensure_flusher'):
+            buffer.add('a@example.org')
+            with mock.patch.object(Subscriber.objects, 'bulk_create', side_effect=DatabaseError('locked')), \
+                    self.assertLogs('api.subscriptions', 'ERROR'):
+                self.assertEqual(buffer.flush(), 0)
+            buffer.add('b@example.org')
+            self.assertEqual(list(buffer.pending), ['a@example.org', 'b@example.org'])
+            self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(Subscriber.objects.count(), 2)
+
+
+class SubscriberExportTests(DatasetTestCase):
+    """The export streams; under ASGI with an async iterator."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.staff = get_user_model().objects.create_user('admin', 'admin@example.org', 'pass-12345', is_staff=True)
+        Subscriber.objects.bulk_create(Subscriber(email=f'user{n}@example.org') for n in range(3))
+
+    def setUp(self):
+        super().setUp()
+        self.headers = {'Authorization': f'Bearer {RefreshToken.for_user(self.staff).access_token}'}
+
+    def test_wsgi_export_streams_sync_iterator(self):
+        response = self.client.get('/api/subscribers/export/', headers=self.headers)
+        self.assertFalse(response.is_async)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'email,date_joined')
+        self.assertEqual(len(lines), 4)
+
+    async def test_asgi_export_streams_async_iterator(self):
+        response = await self.async_client.get('/api/subscribers/export/?output=ndjson', headers=self.headers)
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.splitlines()), 3)
+
+    def test_export_requires_staff(self):
+        user = get_user_model().objects.create_user('reader', 'reader@example.org', 'pass-12345')
+        headers = {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        self.assertEqual(self.client.get('/api/subscribers/export/', headers=headers).status_code, 403)
+
+
+# ============================================================================
+# ASYNC VIEWS
+# ============================================================================
+class BoundedExecutorTests(TestCase):
+    """Backpressure and connection housekeeping of the async search pool."""
+
+    async def test_saturated_search_answers_503(self):
+        executor = BoundedExecutor(workers=1, max_pending=0)
+        request = AsyncRequestFactory().get('/api/search/', {'q': 'fever'})
+        with mock.patch('api.views.get_search_executor', return_value=executor):
+            response = await search_api_async(request)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], str(settings.SEARCH_ASYNC_RETRY_AFTER))
+        self.assertIn('error', json.loads(response.content))
+
+    async def test_slot_released_when_job_finishes(self):
+        executor = BoundedExecutor(workers=1, max_pending=1)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+            return 'done'
+
+        job = asyncio.ensure_future(executor.run(blocking))
+        await asyncio.to_thread(started.wait, 5)
+        with self.assertRaises(Saturated):
+            await executor.run(str, 'refused')
+        release.set()
+        self.assertEqual(await job, 'done')
+        self.assertEqual(await executor.run(str, 'accepted'), 'accepted')
+
+    async def test_connections_closed_around_each_job(self):
+        executor = BoundedExecutor(workers=1, max_pending=1)
+        with mock.patch('api.executor.close_old_connections') as close:
+            await executor.run(close.assert_called_once)
+        self.assertEqual(close.call_count, 2)
+
+
+class AsyncViewSchemaTests(SimpleTestCase):
+    """The async views are documented exactly like their DRF twins."""
+
+    def test_yasg_documents_async_views(self):
+        def schema(search, subscribe):
+            generator = OpenAPISchemaGenerator(
+                openapi.Info(title='Ayush Bridge API', default_version='v1'),
+                patterns=[path('api/search/', search), path('api/subscribe/', subscribe)],
+            )
+            return generator.get_schema(request=None, public=True)['paths']
+
+        self.assertEqual(schema(search_api_async, subscribe_api_async), schema(search_api, subscribe_api))
+
+
+# ============================================================================
+# AUTHENTICATION
+# ============================================================================
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class CachedJWTAuthenticationTests(TestCase):
+    """Verified tokens are reused, expire, and are dropped when their user changes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('reader', 'reader@example.org', 'pass-12345')
+
+    def setUp(self):
+        clear_token_cache()
+        self.raw = str(RefreshToken.for_user(self.user).access_token)
+
+    def authenticate(self, raw=None):
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {raw or self.raw}')
+        return CachedJWTAuthentication().authenticate(request)
+
+    def test_hit_skips_verification_and_user_query(self):
+        user, token = self.authenticate()
+        self.assertEqual(user, self.user)
+        with mock.patch.object(CachedJWTAuthentication, 'get_validated_token', side_effect=AssertionError), \
+                self.assertNumQueries(0):
+            cached_user, cached = self.authenticate()
+        self.assertEqual(cached_user, self.user)
+        self.assertIsNot(cached_user, user)  # Each request gets its own copy
+        self.assertEqual(cached['user_id'], token['user_id'])
+
+    @override_settings(JWT_AUTH_CACHE_TTL=60)
+    def test_entries_expire_after_ttl(self):
+        self.authenticate()
+        self.assertIsNotNone(cached_token(self.raw.encode()))
+        later = time.time() + 61
+        with mock.patch('api.authentication.time.time', return_value=later):
+            self.assertIsNone(cached_token(self.raw.encode()))
+            with self.assertNumQueries(1):  # Verified and loaded again
+                self.authenticate()
+
+    def test_password_change_forgets_tokens(self):
+        self.authenticate()
+        self.user.set_password('changed-12345')
+        self.user.save()
+        self.assertIsNone(cached_token(self.raw.encode()))
+
+    def test_deactivation_rejects_cached_token(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleted_user_forgotten(self):
+        self.authenticate()
+        self.user.delete()
+        self.assertIsNone(cached_token(self.raw.encode()))
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_inactive_user_rejected(self):
+        inactive = get_user_model().objects.create_user('gone', 'gone@example.org', 'pass-12345', is_active=False)
+        raw = str(RefreshToken.for_user(inactive).access_token)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(raw)
+        self.assertIsNone(cached_token(raw.encode()))
+        response = self.client.post(
+            '/api/translate/bulk/', 'Kasa', content_type='text/csv', headers={'Authorization': f'Bearer {raw}'},
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class TokenLoginTests(TestCase):
+    """POST /api/auth/token/ with a username or email identifier."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user('Reader', 'Reader@Example.org', 'pass-12345')
+        User.objects.create_user('retired', 'retired@example.org', 'pass-12345', is_active=False)
+
+    def login(self, **credentials):
+        return self.client.post('/api/auth/token/', credentials, content_type='application/json')
+
+    def test_username_and_mixed_case_email(self):
+        for credentials in ({'username': 'reader'}, {'email': 'reader@EXAMPLE.ORG'}, {'username': 'READER@example.org'}):
+            with self.subTest(credentials=credentials):
+                response = self.login(password='pass-12345', **credentials)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(set(response.json()), {'access', 'refresh'})
+
+    def test_failures_look_alike(self):
+        failures = {
+            'wrong password': {'username': 'reader', 'password': 'wrong-12345'},
+            'wrong password, mixed-case email': {'email': 'READER@example.org', 'password': 'wrong-12345'},
+            'inactive user': {'username': 'retired', 'password': 'pass-12345'},
+            'unknown username': {'username': 'nobody', 'password': 'pass-12345'},
+            'unknown email': {'email': 'nobody@example.org', 'password': 'pass-12345'},
+        }
+        bodies = set()
+        for case, credentials in failures.items():
+            with self.subTest(case=case):
+                with mock.patch('api.auth.user_login_failed.send') as failed:
+                    response = self.login(**credentials)
+                self.assertEqual(response.status_code, 401)
+                failed.assert_called_once()
+                bodies.add(response.content)
+        self.assertEqual(len(bodies), 1)  # Nothing tells the cases apart
+
+
+# ============================================================================
+# MIGRATIONS
+# ============================================================================
+class DuplicateTermMigrationTests(TransactionTestCase):
+    """0005 only drops exact duplicates; conflicting codes stop the migration."""
+
+    before = [('api', '0004_datasetversion')]
+    after = [('api', '0005_diagnosis_term_unique')]
+
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate(self.before)
+        self.Diagnosis = self.executor.loader.project_state(self.before).apps.get_model('api', 'Diagnosis')
+
+    def tearDown(self):
+        self.Diagnosis.objects.all().delete()
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def migrate(self):
+        self.executor.loader.build_graph()
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.executor.migrate(self.after)
+        return out.getvalue()
+
+    def test_exact_duplicates_removed(self):
+        first = self.Diagnosis.objects.create(term='Kasa (Cough)', namaste_code='N1', icd_code='MD12')
+        self.Diagnosis.objects.create(term='Kasa (Cough)', namaste_code='N1', icd_code='MD12')
+        self.Diagnosis.objects.create(term='Jwara (Fever)', namaste_code='N2', icd_code='MG26')
+        self.assertIn("1 exact duplicate Diagnosis rows: 'Kasa (Cough)'", self.migrate())
+        self.assertEqual(
+            sorted(self.Diagnosis.objects.values_list('id', flat=True)),
+            sorted([first.id, self.Diagnosis.objects.get(term='Jwara (Fever)').id]),
+        )
+
+    def test_conflicting_codes_listed(self):
+        self.Diagnosis.objects.create(term='Kasa (Cough)', namaste_code='N1', icd_code='MD12')
+        self.Diagnosis.objects.create(term='Kasa (Cough)', namaste_code='N9', icd_code='MD12')
+        with self.assertRaisesMessage(RuntimeError, "'Kasa (Cough)': N1 -> MD12, N9 -> MD12"):
+            self.migrate()
+        self.assertEqual(self.Diagnosis.objects.count(), 2)
+        self.Diagnosis.objects.filter(namaste_code='N9').delete()
+
+
+# ============================================================================
+# IMPORTER
+# ============================================================================
+class ImporterTests(DatasetTestCase):
+    """Full and incremental imports agree; incremental runs can be previewed."""
+
+    def setUp(self):
+        super().setUp()
+        with open(DATA_CSV, encoding='utf-8', newline='') as file:
+            self.rows = list(read_rows(file))
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write_csv(self, rows):
+        path = self.directory / 'release.csv'
+        lines = ['term,namaste_code,icd_code'] + [','.join(row) for row in rows]
+        path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        return path
+
+    def test_unchanged_release_writes_nothing(self):
+        self.assertEqual(sync_rows(self.rows).writes, 0)
+
+    def test_duplicate_terms_last_row_wins_in_both_modes(self):
+        term, namaste_code, _icd = self.rows[0]
+        rows = self.rows + [(term, namaste_code, 'ZZ99')]
+        import_rows(rows)
+        self.assertEqual(Diagnosis.objects.get(term=term).icd_code, 'ZZ99')
+        result = sync_rows(rows)
+        self.assertEqual(result.writes, 0)
+
+    def test_incremental_updates_and_retires(self):
+        term, namaste_code, _icd = self.rows[0]
+        result = sync_rows([(term, namaste_code, 'ZZ99')] + self.rows[1:50])
+        self.assertEqual((result.created, result.updated, result.retired), (0, 1, len(self.rows) - 50))
+        self.assertEqual(Diagnosis.objects.count(), 50)
+
+    def test_no_retire_keeps_missing_rows(self):
+        result = sync_rows(self.rows[:10], retire=False)
+        self.assertEqual(result.writes, 0)
+        self.assertEqual(Diagnosis.objects.count(), len(self.rows))
+
+    def test_dry_run_counts_without_writing(self):
+        rows = [('Test Roga (Test Disease)', 'NAM-99-0001', 'ZZ01')] + self.rows[:10]
+        result = sync_rows(rows, dry_run=True)
+        self.assertEqual((result.created, result.updated, result.retired), (1, 0, len(self.rows) - 10))
+        self.assertEqual(Diagnosis.objects.count(), len(self.rows))
+        self.assertFalse(Diagnosis.objects.filter(term='Test Roga (Test Disease)').exists())
+
+    def test_command_dry_run_and_retire_warning(self):
+        path = self.write_csv(self.rows[:10])
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_diagnoses', str(path), '--incremental', '--dry-run', stdout=out, stderr=err)
+        self.assertIn(f'{len(self.rows) - 10} retired', out.getvalue())
+        self.assertEqual(Diagnosis.objects.count(), len(self.rows))
+
+        call_command('import_diagnoses', str(path), '--incremental', stdout=out, stderr=err)
+        self.assertIn(f'Retired {len(self.rows) - 10} stored rows', err.getvalue())
+        self.assertEqual(Diagnosis.objects.count(), 10)
@@ -0,0 +1,104 @@
+"""Bulk Translation for Ayush Bridge
+
+Translates streams of NAMASTE codes or disease terms to ICD-11, one row
+at a time, for insurer claim extracts and other bulk jobs.
+
+Each input value is resolved with the same logic as the public API:
+1. Exact NAMASTE code lookup (as /api/map/namaste/<code>/)
+2. Otherwise, best fuzzy match on the term (as /api/search/)
+"""
+
+import csv
+import json
+
+from .search import rank_query
+from .search_index import get_search_index, normalize_code
+
+
+# Columns of every translated row (CSV header / NDJSON keys)
+TRANSLATION_FIELDS = ['row', 'input', 'status', 'term', 'namaste', 'icd']
+
+# Per-row status values
+STATUS_MAPPED = 'mapped'        # Input was a known NAMASTE code
+STATUS_MATCHED = 'matched'      # Input was fuzzy matched as a term
+STATUS_UNMAPPED = 'unmapped'    # No code or term match found
+STATUS_INVALID = 'invalid'      # Row could not be parsed
+
+# First CSV cell values treated as a header row
+CSV_HEADER_NAMES = {'code', 'term', 'query', 'namaste', 'namaste_code'}
+
+
+def read_csv_values(lines):
+    """
+    Yield (input, value) pairs from CSV text lines, using the first column.
+
+    A leading header row (e.g. "code" or "term") and blank lines are skipped.
+    """
+    for row_number, record in enumerate(csv.reader(lines), start=1):
+        if not record:
+            continue
+        value = record[0].strip()
+        if row_number == 1 and value.lower() in CSV_HEADER_NAMES:
+            continue
+        yield value, value or None
+
+
+def read_ndjson_values(lines):
+    """
+    Yield (input, value) pairs from NDJSON text lines.
+
+    Each line may be a JSON string ("NAM-01-0023") or an object with a
+    "code", "term" or "query" key. Unparseable lines yield value None.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            document = json.loads(line)
+        except ValueError:
+            yield line, None
+            continue
+
+        if isinstance(document, dict):
+            document = document.get('code') or document.get('term') or document.get('query')
+        if isinstance(document, str) and document.strip():
+            yield document, document.strip()
+        else:
+            yield line, None
+
+
+def translate(values):
+    """
+    Translate (input, value) pairs to mapping rows, lazily.
+
+    The search index is fetched once, so a long-running stream sees one
+    consistent snapshot of the dataset.
+
+    Yields:
+        dict: Row with the TRANSLATION_FIELDS keys
+    """
+    index = get_search_index()
+
+    for row_number, (raw, value) in enumerate(values, start=1):
+        row = {'row': row_number, 'input': raw, 'term': None, 'namaste': None, 'icd': None}
+
+        if value is None:
+            row['status'] = STATUS_INVALID
+            yield row
+            continue
+
+        # Step 1: Exact NAMASTE code
+        position = index.by_namaste.get(normalize_code(value))
+        if position is not None:
+            row.update(index.result(position), status=STATUS_MAPPED)
+            yield row
+            continue
+
+        # Step 2: Best fuzzy term match
+        matches = rank_query(value, index, limit=1)
+        if matches:
+            row.update(index.result(matches[0][0]), status=STATUS_MATCHED)
+        else:
+            row['status'] = STATUS_UNMAPPED
+        yield row
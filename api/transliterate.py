@@ -0,0 +1,116 @@
+"""Transliteration and Phonetic Keys for Ayush Bridge
+
+Sanskrit diagnosis names reach the API in many spellings: Devanagari
+("ज्वर"), IAST ("Jvāra"), Harvard-Kyoto ("jvAra") and ad-hoc
+romanisations ("Jwara", "Jwar"). phonetic_key() reduces all of them to
+one canonical key ("jvar"), so variants can be matched with a hash
+lookup instead of fuzzy scoring.
+
+The key is deliberately lossy (long / short vowels, aspiration and
+sibilants are merged); it is only used for exact key lookups.
+"""
+
+import re
+import unicodedata
+
+from .normalize import fold
+from .trigrams import WORD_SEPARATOR
+
+
+# ============================================================================
+# DEVANAGARI -> ROMAN
+# ============================================================================
+# Independent vowels
+VOWELS = {
+    'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ii', 'उ': 'u', 'ऊ': 'uu',
+    'ऋ': 'ri', 'ॠ': 'ri', 'ऌ': 'li', 'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au',
+}
+
+# Dependent vowel signs (replace a consonant's inherent "a")
+VOWEL_SIGNS = {
+    'ा': 'aa', 'ि': 'i', 'ी': 'ii', 'ु': 'u', 'ू': 'uu', 'ृ': 'ri', 'ॄ': 'ri',
+    'ॢ': 'li', 'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au',
+}
+
+CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'n',
+    'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'n',
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n',
+    'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
+    'य': 'y', 'र': 'r', 'ल': 'l', 'ळ': 'l', 'व': 'v',
+    'श': 'sh', 'ष': 'sh', 'स': 's', 'ह': 'h',
+}
+
+VIRAMA = '्'
+
+# Other signs: anusvara, visarga; candrabindu, nukta and avagraha are dropped
+SIGNS = {'ं': 'm', 'ः': 'h', 'ँ': '', '़': '', 'ऽ': ''}
+
+
+def devanagari_to_roman(text):
+    """
+    Transliterate Devanagari to a plain ASCII romanisation.
+
+    Example:
+        "ज्वर" -> "jvara", "श्वास" -> "shvaasa"
+    """
+    # NFD splits nukta letters (e.g. "क़" -> "क" + nukta)
+    chars = unicodedata.normalize('NFD', text)
+    out = []
+    for i, char in enumerate(chars):
+        if char in CONSONANTS:
+            out.append(CONSONANTS[char])
+            following = chars[i + 1] if i + 1 < len(chars) else ''
+            if following == '़':
+                following = chars[i + 2] if i + 2 < len(chars) else ''
+            if following != VIRAMA and following not in VOWEL_SIGNS:
+                out.append('a')  # Inherent vowel
+        elif char in VOWELS:
+            out.append(VOWELS[char])
+        elif char in VOWEL_SIGNS:
+            out.append(VOWEL_SIGNS[char])
+        elif char in SIGNS:
+            out.append(SIGNS[char])
+        elif char != VIRAMA:
+            out.append(char)
+    return ''.join(out)
+
+
+# ============================================================================
+# PHONETIC KEYS
+# ============================================================================
+# Applied in order to each lowercased, accent-folded ASCII word
+PHONETIC_RULES = [
+    (re.compile(r'x'), 'ks'),
+    (re.compile(r'w'), 'v'),              # Jwara / Jvara
+    (re.compile(r'z'), 's'),              # Harvard-Kyoto "z" = ś
+    (re.compile(r'f'), 'ph'),
+    (re.compile(r'q'), 'k'),
+    (re.compile(r'ee'), 'i'),             # Ad-hoc long vowels
+    (re.compile(r'oo'), 'u'),
+    (re.compile(r'ri(?=[^aeiou])'), 'r'),  # ṛ typed as "ri" (Hridroga / Hṛdroga)
+    (re.compile(r'(?<=[^aeiouh])h'), ''),  # Aspirates and sh / ch: kh -> k, sh -> s
+    (re.compile(r'm(?=[^aeiouy])'), 'n'),  # Anusvara before a consonant
+    (re.compile(r'(.)\1+'), r'\1'),        # Long vowels, geminates: aa -> a, tt -> t
+    (re.compile(r'(?<=.)ah$'), 'a'),       # Final visarga: Nidranasah
+    (re.compile(r'(?<=..)a$'), ''),        # Final schwa: Jwara / Jwar
+]
+
+
+def phonetic_word(word):
+    """Reduce one lowercase ASCII word to its phonetic key."""
+    for pattern, replacement in PHONETIC_RULES:
+        word = pattern.sub(replacement, word)
+    return word
+
+
+def phonetic_key(text):
+    """
+    Return the canonical phonetic key of a Sanskrit name in any script.
+
+    Example:
+        "Jwara", "Jvāra", "jvAra", "Jwar", "ज्वर" -> "jvar"
+    """
+    words = WORD_SEPARATOR.split(fold(devanagari_to_roman(text)))
+    return ' '.join(phonetic_word(word) for word in words if word)
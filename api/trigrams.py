@@ -0,0 +1,99 @@
+"""Character-Trigram Inverted Index for Ayush Bridge
+
+Prefilters fuzzy search candidates: only terms sharing enough trigrams
+with the query are passed to the (expensive) ratio/partial_ratio scorer.
+
+Terms are split into words (so both the Sanskrit name and the
+parenthesised English gloss are indexed) and each word is padded with
+spaces, e.g. "jwara (fever)" -> " jw", "jwa", "war", "ara", "ra ",
+" fe", "fev", "eve", "ver", "er ".
+"""
+
+import re
+from array import array
+
+import numpy as np
+
+
+# Anything that is not a letter or digit separates words
+WORD_SEPARATOR = re.compile(r'[\W_]+')
+
+
+def term_trigrams(text):
+    """Return the set of space-padded word trigrams of an index term."""
+    grams = set()
+    for word in WORD_SEPARATOR.split(text):
+        if not word:
+            continue
+        padded = f' {word} '
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def query_trigrams(text):
+    """
+    Return the trigrams of a query.
+
+    Same as term_trigrams(), except the last word is not padded at the end
+    when the query stops mid-word, so typeahead prefixes like "jwar" still
+    share all their trigrams with "jwara".
+    """
+    words = [word for word in WORD_SEPARATOR.split(text) if word]
+    ends_mid_word = bool(text) and text[-1].isalnum()
+    grams = set()
+    for i, word in enumerate(words):
+        is_last = i == len(words) - 1
+        padded = f' {word}' if is_last and ends_mid_word else f' {word} '
+        for j in range(len(padded) - 2):
+            grams.add(padded[j:j + 3])
+    return grams
+
+
+class TrigramIndex:
+    """
+    Inverted index mapping each trigram to the sorted row positions
+    of the index keys that contain it.
+
+    Attributes:
+        size: Number of indexed keys
+        postings: dict of trigram -> numpy array of row positions
+    """
+    __slots__ = ('size', 'postings')
+
+    def __init__(self, keys):
+        postings = {}
+        for position, key in enumerate(keys):
+            for gram in term_trigrams(key):
+                positions = postings.get(gram)
+                if positions is None:
+                    positions = postings[gram] = array('I')
+                positions.append(position)
+
+        self.size = len(keys)
+        # Zero-copy views over the compact arrays
+        self.postings = {
+            gram: np.frombuffer(positions, dtype=np.uintc)
+            for gram, positions in postings.items()
+        }
+
+    def candidates(self, query, min_overlap):
+        """
+        Return row positions sharing enough trigrams with ``query``.
+
+        Args:
+            query (str): Normalised query string
+            min_overlap (float): Fraction (0-1) of the query's trigrams a
+                term must contain to become a candidate (at least one)
+
+        Returns:
+            numpy.ndarray: Sorted candidate row positions
+        """
+        grams = query_trigrams(query)
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not lists:
+            return np.empty(0, dtype=np.intp)
+
+        hits = np.bincount(np.concatenate(lists), minlength=self.size)
+        needed = max(1, int(len(grams) * min_overlap))
+        return np.flatnonzero(hits >= needed)
@@ -5,11 +5,37 @@ All URLs are prefixed with /api/ (configured in backend/urls.py)
 
 Available Endpoints:
     - /api/search/ - Fuzzy search for disease mappings
+    - /api/search/batch/ - Fuzzy search for many terms at once
+    - /api/search/cache/stats/ - Search result cache hit/miss counters
+    - /api/autocomplete/ - Prefix completions for typeahead
+    - /api/map/namaste/<code>/ - Exact NAMASTE -> ICD-11 lookup
+    - /api/map/icd/<code>/ - Exact ICD-11 -> NAMASTE lookup (one-to-many)
+    - /api/translate/bulk/ - Streaming bulk translation (CSV / NDJSON)
     - /api/subscribe/ - Email subscription management
+    - /api/subscribers/export/ - Streaming subscriber export (staff only)
 """
 
+from django.conf import settings
 from django.urls import path
-from .views import search_api, subscribe_api
+from .views import (
+    autocomplete_api,
+    batch_search_api,
+    bulk_translate_api,
+    icd_map_api,
+    namaste_map_api,
+    search_api,
+    search_api_async,
+    search_cache_stats_api,
+    subscribe_api,
+    subscribe_api_async,
+    subscriber_export_api,
+)
+
+# Native async views under ASGI (settings.API_ASYNC_VIEWS), DRF views otherwise
+if settings.API_ASYNC_VIEWS:
+    search_view, subscribe_view = search_api_async, subscribe_api_async
+else:
+    search_view, subscribe_view = search_api, subscribe_api
 
 # ============================================================================
 # API URL PATTERNS
@@ -19,9 +45,37 @@ from .views import search_api, subscribe_api
 urlpatterns = [
     # GET /api/search/?q=<query>
     # Public endpoint for searching NAMASTE <-> ICD-11 mappings
-    path('search/', search_api, name='search_api'),
+    path('search/', search_view, name='search_api'),
+    
+    # POST /api/search/batch/
+    # Public endpoint for searching many terms in one request
+    path('search/batch/', batch_search_api, name='batch_search_api'),
+    
+    # GET /api/search/cache/stats/
+    # Public endpoint for search cache hit/miss counters
+    path('search/cache/stats/', search_cache_stats_api, name='search_cache_stats_api'),
+    
+    # GET /api/autocomplete/?prefix=<text>
+    # Public endpoint for typeahead prefix completions
+    path('autocomplete/', autocomplete_api, name='autocomplete_api'),
+    
+    # GET /api/map/namaste/<code>/
+    # Public endpoint for exact NAMASTE -> ICD-11 mapping
+    path('map/namaste/<str:code>/', namaste_map_api, name='namaste_map_api'),
+    
+    # GET /api/map/icd/<code>/
+    # Public endpoint for exact ICD-11 -> NAMASTE mapping (returns a list)
+    path('map/icd/<str:code>/', icd_map_api, name='icd_map_api'),
+    
+    # POST /api/translate/bulk/
+    # Authenticated endpoint for streaming CSV / NDJSON translation
+    path('translate/bulk/', bulk_translate_api, name='bulk_translate_api'),
     
     # POST /api/subscribe/
     # Public endpoint for email subscription
-    path('subscribe/', subscribe_api, name='subscribe_api'),
+    path('subscribe/', subscribe_view, name='subscribe_api'),
+    
+    # GET /api/subscribers/export/?output=csv|ndjson&since=&until=
+    # Staff-only endpoint streaming the subscriber list
+    path('subscribers/export/', subscriber_export_api, name='subscriber_export_api'),
 ]
\ No newline at end of file
@@ -2,25 +2,71 @@
 
 This module contains all API endpoints for the Ayush Bridge application:
 1. Fuzzy Search API - Search for diseases using fuzzy matching (NAMASTE to ICD-11 mapping)
-2. Subscription API - Email subscription management for updates
+2. Batch Search API - Many fuzzy searches in one request
+3. Autocomplete API - Prefix completions for typeahead search boxes
+4. Code Mapping APIs - Exact NAMASTE -> ICD-11 and ICD-11 -> NAMASTE lookups
+5. Bulk Translation API - Streaming CSV/NDJSON code and term translation
+6. Subscription API - Email subscription management for updates,
+   and a streaming subscriber export for administrators
+7. Async (ASGI) variants of the search and subscription APIs
+8. Metrics endpoint - Prometheus request, database and cache metrics
 
 All endpoints are documented with Swagger/OpenAPI specifications.
 """
 
+import json
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
 # Django REST Framework imports
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 
 # Swagger/OpenAPI documentation imports
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-# Fuzzy matching library for intelligent search
-from thefuzz import fuzz
+# Email subscriptions (direct or buffered writes)
+from .subscriptions import (
+    SUBSCRIBER_FIELDS, asubscribe, is_valid_email, parse_date_bound, subscribe, subscriber_rows,
+)
+
+# Streaming CSV / NDJSON (bulk translation, subscriber export)
+from .streaming import (
+    BLOCK_LINES, CSV_CONTENT_TYPE, NDJSON_CONTENT_TYPE,
+    iter_blocks, iter_csv, iter_lines, iter_ndjson, streaming_content,
+)
+from .translation import TRANSLATION_FIELDS, read_csv_values, read_ndjson_values, translate
+
+# Search service (in-process index + RapidFuzz scoring engine)
+from .search import batch_search_diagnoses, lookup_icd, lookup_namaste, search_page
+from .pagination import InvalidPage, next_page_link, parse_limit
+
+# Prefix autocomplete (sorted word index, no fuzzy scoring)
+from .autocomplete import autocomplete
+
+# Search result cache counters
+from .search_cache import cache_stats
+
+# Conditional GET helpers (ETag / Last-Modified from the dataset version)
+from .conditional import async_dataset_conditional, dataset_cache_control, dataset_conditional
+
+# Bounded thread pool for CPU-heavy work in async views
+from .executor import Saturated, get_search_executor
 
-# Application models
-from .models import Diagnosis, Subscriber
+# Prometheus metrics exposition
+from .metrics import render_metrics
+
+# Accepted Content-Types for NDJSON request bodies
+NDJSON_MEDIA_TYPES = (NDJSON_CONTENT_TYPE, 'application/ndjson', 'application/jsonl')
+
+# Read-only dataset responses: answer If-None-Match / If-Modified-Since
+# with 304 and let browsers and CDNs cache public results (errors excluded)
+dataset_cache_headers = dataset_cache_control(max_age=settings.SEARCH_HTTP_MAX_AGE)
 
 
 # ============================================================================
@@ -37,11 +83,27 @@ from .models import Diagnosis, Subscriber
             type=openapi.TYPE_STRING,
             required=True,
             example="Fever"
+        ),
+        openapi.Parameter(
+            'limit',
+            openapi.IN_QUERY,
+            description="Page size (default 10, max SEARCH_MAX_LIMIT)",
+            type=openapi.TYPE_INTEGER,
+            required=False,
+            example=25
+        ),
+        openapi.Parameter(
+            'cursor',
+            openapi.IN_QUERY,
+            description='Opaque cursor from the rel="next" Link header of the previous page',
+            type=openapi.TYPE_STRING,
+            required=False
         )
     ],
     responses={
         200: openapi.Response(
-            description='List of matching diagnoses',
+            description='List of matching diagnoses. When more results exist, a '
+                        'Link: <...>; rel="next" header points to the next page.',
             schema=openapi.Schema(
                 type=openapi.TYPE_ARRAY,
                 items=openapi.Schema(
@@ -60,11 +122,24 @@ from .models import Diagnosis, Subscriber
                     }
                 ]
             )
+        ),
+        400: openapi.Response(
+            description='Invalid limit or cursor',
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'error': openapi.Schema(type=openapi.TYPE_STRING)
+                },
+                example={'error': 'limit must be an integer between 1 and 100'}
+            )
         )
     }
 )
 @api_view(['GET'])  # Only accept GET requests
 @permission_classes([AllowAny])  # Public endpoint - no authentication required
+@authentication_classes([])  # Skip JWT parsing - a token is never needed here
+@dataset_cache_headers  # Cache-Control: public, max-age=SEARCH_HTTP_MAX_AGE
+@dataset_conditional  # ETag / Last-Modified (URL includes limit / cursor); 304 before any work is done
 def search_api(request):
     """
     Fuzzy search for disease mappings between NAMASTE and ICD-11 codes.
@@ -74,13 +149,16 @@ def search_api(request):
     
     Query Parameters:
         q (str): Search query (e.g., "Fever", "Jwara", "Cough")
+        limit (int): Page size, 1 to SEARCH_MAX_LIMIT (default 10)
+        cursor (str): Cursor of the page to fetch (from the Link header)
     
     Returns:
-        list: Top 10 matching diagnoses with term, NAMASTE code, and ICD-11 code
+        list: One page of matching diagnoses with term, NAMASTE code, and ICD-11 code
               Sorted by relevance score (highest match first)
+        Link header: <url>; rel="next" when more results exist
     
     Example:
-        GET /api/search/?q=fever
+        GET /api/search/?q=fever&limit=25
         Returns: [{"term": "Fever", "namaste": "NS-01", "icd": "BA01.1"}, ...]
     """
     # Extract search query from URL parameters
@@ -90,47 +168,410 @@ def search_api(request):
     if not query:
         return Response([])
 
-    # Step 1: Fetch all disease diagnoses from database
-    all_diagnoses = Diagnosis.objects.all()
-    
-    # Step 2: Score each diagnosis for similarity to the search query
-    scored_results = []  # Will store tuples of (diagnosis, score, term_length)
-    
-    for item in all_diagnoses:
-        # Calculate fuzzy match score using robust matching algorithms
-        # Use two complementary methods for reliable results:
-        # - ratio: Character-level string similarity
-        # - partial_ratio: Best substring match (handles partial queries like "fee" for "Fever")
-        score1 = fuzz.ratio(query.lower(), item.term.lower())
-        score2 = fuzz.partial_ratio(query.lower(), item.term.lower())
-        
-        # Take the maximum score (use best match)
-        combined_score = max(score1, score2)
-        
-        # Step 3: Filter - only keep good matches (score > 60%)
-        if combined_score > 60:
-            # Store: diagnosis, combined score, and term length (for secondary sort)
-            scored_results.append((item, combined_score, len(item.term)))
-    
-    # Step 4: Sort results with multi-criteria ranking
-    # Primary: Higher combined score (better match)
-    # Secondary: Shorter term length (more specific/direct match)
-    # Tertiary: Alphabetical (consistent ordering)
-    scored_results.sort(key=lambda x: (-x[1], x[2], x[0].term))
-    
-    # Step 5: Format and return top 10 results as JSON
+    # Score the query against the in-process index:
+    # - max(ratio, partial_ratio) per term, computed in batch by RapidFuzz
+    # - only good matches (score > 60%) are kept
+    # - ranked by score, then shorter term, then alphabetical
+    # - one page selected with a bounded heap, starting after the cursor
+    try:
+        limit = parse_limit(request.GET.get('limit'), default=10)
+        data, next_cursor = search_page(query, limit=limit, cursor=request.GET.get('cursor'))
+    except InvalidPage as exc:
+        return Response({'error': str(exc)}, status=400)
+    
+    response = Response(data)
+    if next_cursor is not None:
+        response['Link'] = next_page_link(request, next_cursor)
+    return response
+
+
+# ============================================================================
+# SEARCH CACHE STATISTICS ENDPOINT
+# ============================================================================
+# Public endpoint exposing search result cache hit/miss counters
+@swagger_auto_schema(
+    method='get',
+    responses={
+        200: openapi.Response(
+            description='Search cache counters',
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'hits': openapi.Schema(type=openapi.TYPE_INTEGER),
+                    'misses': openapi.Schema(type=openapi.TYPE_INTEGER),
+                    'hit_ratio': openapi.Schema(type=openapi.TYPE_NUMBER),
+                },
+                example={'hits': 1520, 'misses': 310, 'hit_ratio': 0.8306}
+            )
+        )
+    }
+)
+@api_view(['GET'])  # Only accept GET requests
+@permission_classes([AllowAny])  # Public endpoint - counters only, no data
+@authentication_classes([])  # Skip JWT parsing - a token is never needed here
+def search_cache_stats_api(request):
+    """
+    Report search result cache hits, misses and hit ratio.
+    
+    Counters are those of the worker that answers; the
+    ayush_search_cache_lookups_total metric at /metrics covers all workers.
+    
+    Example:
+        GET /api/search/cache/stats/
+    """
+    return Response(cache_stats())
+
+
+# ============================================================================
+# AUTOCOMPLETE API ENDPOINT
+# ============================================================================
+# Public endpoint for typeahead: cheap prefix completions on every keystroke,
+# full fuzzy search only when the user submits
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter(
+            'prefix',
+            openapi.IN_QUERY,
+            description="Text typed so far; matches the start of any word of a term (e.g. jwa, vishama jw, feve)",
+            type=openapi.TYPE_STRING,
+            required=True,
+            example="jwa"
+        )
+    ],
+    responses={
+        200: openapi.Response(
+            description='Diagnoses with a word starting with the prefix, shortest term first',
+            schema=openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'term': openapi.Schema(type=openapi.TYPE_STRING, description='Disease name'),
+                        'namaste': openapi.Schema(type=openapi.TYPE_STRING, description='NAMASTE code'),
+                        'icd': openapi.Schema(type=openapi.TYPE_STRING, description='ICD-11 code'),
+                    }
+                ),
+                example=[
+                    {"term": "Jwara (Fever)", "namaste": "NAM-01-0023", "icd": "MG26"}
+                ]
+            )
+        )
+    }
+)
+@api_view(['GET'])  # Only accept GET requests
+@permission_classes([AllowAny])  # Public endpoint - no authentication required
+@authentication_classes([])  # Skip JWT parsing - a token is never needed here
+@dataset_cache_headers  # Cache-Control: public, max-age=SEARCH_HTTP_MAX_AGE
+@dataset_conditional  # ETag / Last-Modified; 304 before any work is done
+def autocomplete_api(request):
+    """
+    Prefix completions for a typeahead search box.
+    
+    Case and accent insensitive; the prefix can start at any word of a
+    term (Sanskrit name or English gloss) and span several words.
+    
+    Query Parameters:
+        prefix (str): Text typed so far
+    
+    Returns:
+        list: Up to AUTOCOMPLETE_LIMIT diagnoses, shortest term first
+    
+    Example:
+        GET /api/autocomplete/?prefix=jwa
+        Returns: [{"term": "Jwara (Fever)", "namaste": "NAM-01-0023", "icd": "MG26"}, ...]
+    """
+    return Response(autocomplete(request.GET.get('prefix', '')))
+
+
+# ============================================================================
+# BATCH SEARCH API ENDPOINT
+# ============================================================================
+# Public endpoint for searching many terms in one request (EMR imports)
+@swagger_auto_schema(
+    method='post',
+    request_body=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'queries': openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(type=openapi.TYPE_STRING),
+                description='Search queries (e.g. problem-list entries)',
+                example=['Fever', 'Kasa', 'Amavata']
+            )
+        },
+        required=['queries']
+    ),
+    responses={
+        200: openapi.Response(
+            description='Top matches for each query, in request order',
+            schema=openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'query': openapi.Schema(type=openapi.TYPE_STRING),
+                        'results': openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(type=openapi.TYPE_OBJECT)
+                        ),
+                    }
+                ),
+                example=[
+                    {
+                        "query": "Fever",
+                        "results": [{"term": "Jwara (Fever)", "namaste": "NAM-01-0023", "icd": "MG26"}]
+                    }
+                ]
+            )
+        ),
+        400: openapi.Response(
+            description='Invalid request body',
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'error': openapi.Schema(type=openapi.TYPE_STRING)
+                },
+                example={'error': 'queries must be a list of strings'}
+            )
+        )
+    }
+)
+@api_view(['POST'])  # Only accept POST requests
+@permission_classes([AllowAny])  # Public endpoint - no authentication required
+@authentication_classes([])  # Skip JWT parsing - a token is never needed here
+def batch_search_api(request):
+    """
+    Fuzzy search for many disease terms in a single request.
+    
+    All queries are scored together in one RapidFuzz matrix pass using
+    all CPU cores, and each gets the same top 10 ranking as search_api.
+    
+    Request Body:
+        queries (list[str]): Search queries (at most SEARCH_BATCH_MAX_QUERIES)
+    
+    Returns:
+        Success: [{"query": "...", "results": [...]}, ...] (200)
+        Error: {"error": "..."} (400)
+    
+    Example:
+        POST /api/search/batch/
+        Body: {"queries": ["fever", "kasa"]}
+    """
+    # Extract and validate the list of queries
+    if not isinstance(request.data, dict):
+        return Response({'error': 'queries must be a list of strings'}, status=400)
+    queries = request.data.get('queries')
+    
+    if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+        return Response({'error': 'queries must be a list of strings'}, status=400)
+    
+    # Cap the work a single caller can request
+    max_queries = settings.SEARCH_BATCH_MAX_QUERIES
+    if len(queries) > max_queries:
+        return Response(
+            {'error': f'At most {max_queries} queries are allowed per request'},
+            status=400
+        )
+    
+    # Score all queries in one pass (top 10 per query)
+    results = batch_search_diagnoses(queries, limit=10)
+    
     data = [
-        {
-            'term': item[0].term,           # Disease name
-            'namaste': item[0].namaste_code,  # NAMASTE standard code
-            'icd': item[0].icd_code          # ICD-11 standard code
-        }
-        for item in scored_results[:10]  # Limit to top 10 matches
+        {'query': query, 'results': matches}
+        for query, matches in zip(queries, results)
     ]
-    
     return Response(data)
 
 
+# ============================================================================
+# CODE MAPPING API ENDPOINTS
+# ============================================================================
+# Public endpoints for exact code -> mapping lookups (no fuzzy search)
+mapping_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'term': openapi.Schema(type=openapi.TYPE_STRING, description='Disease name'),
+        'namaste': openapi.Schema(type=openapi.TYPE_STRING, description='NAMASTE code'),
+        'icd': openapi.Schema(type=openapi.TYPE_STRING, description='ICD-11 code'),
+    }
+)
+
+not_found_response = openapi.Response(
+    description='Unknown code',
+    schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'error': openapi.Schema(type=openapi.TYPE_STRING)
+        },
+        example={'error': 'No mapping found for code NAM-99-9999'}
+    )
+)
+
+
+@swagger_auto_schema(
+    method='get',
+    responses={
+        200: openapi.Response(
+            description='ICD-11 mapping for the NAMASTE code',
+            schema=mapping_schema,
+            examples={
+                'application/json': {"term": "Jwara (Fever)", "namaste": "NAM-01-0023", "icd": "MG26"}
+            }
+        ),
+        404: not_found_response
+    }
+)
+@api_view(['GET'])  # Only accept GET requests
+@permission_classes([AllowAny])  # Public endpoint - no authentication required
+@authentication_classes([])  # Skip JWT parsing - a token is never needed here
+@dataset_cache_headers  # Cache-Control: public, max-age=SEARCH_HTTP_MAX_AGE
+@dataset_conditional  # ETag / Last-Modified; 304 before any work is done
+def namaste_map_api(request, code):
+    """
+    Map a NAMASTE code to its ICD-11 code (exact, case-insensitive).
+    
+    Returns:
+        Success: {"term": "...", "namaste": "...", "icd": "..."} (200)
+        Unknown code: {"error": "..."} (404)
+    
+    Example:
+        GET /api/map/namaste/NAM-01-0023/
+    """
+    mapping = lookup_namaste(code)
+    if mapping is None:
+        return Response({'error': f'No mapping found for code {code}'}, status=404)
+    return Response(mapping)
+
+
+@swagger_auto_schema(
+    method='get',
+    responses={
+        200: openapi.Response(
+            description='NAMASTE diagnoses mapped to the ICD-11 code',
+            schema=openapi.Schema(type=openapi.TYPE_ARRAY, items=mapping_schema),
+            examples={
+                'application/json': [
+                    {"term": "Shotha (General Edema)", "namaste": "NAM-09-0010", "icd": "MG22"}
+                ]
+            }
+        ),
+        404: not_found_response
+    }
+)
+@api_view(['GET'])  # Only accept GET requests
+@permission_classes([AllowAny])  # Public endpoint - no authentication required
+@authentication_classes([])  # Skip JWT parsing - a token is never needed here
+@dataset_cache_headers  # Cache-Control: public, max-age=SEARCH_HTTP_MAX_AGE
+@dataset_conditional  # ETag / Last-Modified; 304 before any work is done
+def icd_map_api(request, code):
+    """
+    Map an ICD-11 code back to every NAMASTE diagnosis using it.
+    
+    One ICD-11 code can cover several NAMASTE diagnoses (e.g. MG22, ME84),
+    so the response is always a list.
+    
+    Returns:
+        Success: [{"term": "...", "namaste": "...", "icd": "..."}, ...] (200)
+        Unknown code: {"error": "..."} (404)
+    
+    Example:
+        GET /api/map/icd/MG26/
+    """
+    mappings = lookup_icd(code)
+    if not mappings:
+        return Response({'error': f'No mapping found for code {code}'}, status=404)
+    return Response(mappings)
+
+
+# ============================================================================
+# BULK TRANSLATION API ENDPOINT
+# ============================================================================
+# Authenticated endpoint for translating large code/term extracts to ICD-11
+@swagger_auto_schema(
+    method='post',
+    manual_parameters=[
+        openapi.Parameter(
+            'output',
+            openapi.IN_QUERY,
+            description="Response format: csv or ndjson (defaults to the request format)",
+            type=openapi.TYPE_STRING,
+            enum=['csv', 'ndjson'],
+            required=False
+        )
+    ],
+    request_body=openapi.Schema(
+        type=openapi.TYPE_STRING,
+        description=(
+            'text/csv (first column = NAMASTE code or term, optional header row) '
+            'or application/x-ndjson (one "code" string or {"code": ...} / {"term": ...} per line)'
+        ),
+        example='code\nNAM-01-0023\nKasa\n'
+    ),
+    responses={
+        200: openapi.Response(
+            description='One translated row per input row, streamed as it is resolved',
+            examples={
+                'text/csv': (
+                    'row,input,status,term,namaste,icd\r\n'
+                    '1,NAM-01-0023,mapped,Jwara (Fever),NAM-01-0023,MG26\r\n'
+                )
+            }
+        ),
+        415: openapi.Response(description='Unsupported request Content-Type')
+    }
+)
+@api_view(['POST'])  # Only accept POST requests
+@permission_classes([IsAuthenticated])  # Bulk jobs require a JWT access token
+def bulk_translate_api(request):
+    """
+    Translate a streamed CSV or NDJSON list of NAMASTE codes / terms to ICD-11.
+    
+    The request body is read line by line and every translated row is
+    written to the response as soon as it is resolved, so memory use is
+    constant regardless of input size.
+    
+    Each row is resolved by exact NAMASTE code lookup first, then by the
+    best fuzzy term match (same logic as /api/search/). The "status"
+    column is one of: mapped, matched, unmapped, invalid.
+    
+    Query Parameters:
+        output (str): "csv" or "ndjson" (defaults to the request format)
+    
+    Example:
+        POST /api/translate/bulk/?output=ndjson
+        Content-Type: text/csv
+        Body: "code\nNAM-01-0023\nKasa\n"
+    """
+    # Pick the input parser from the request Content-Type
+    media_type = request.content_type.split(';')[0].strip().lower()
+    if media_type == CSV_CONTENT_TYPE:
+        read_values, default_output = read_csv_values, 'csv'
+    elif media_type in NDJSON_MEDIA_TYPES:
+        read_values, default_output = read_ndjson_values, 'ndjson'
+    else:
+        return Response(
+            {'error': f'Content-Type must be {CSV_CONTENT_TYPE} or {NDJSON_CONTENT_TYPE}'},
+            status=415
+        )
+    
+    output = request.query_params.get('output', default_output)
+    if output not in ('csv', 'ndjson'):
+        return Response({'error': 'output must be csv or ndjson'}, status=400)
+    
+    # Lazily translate the body - nothing is read until the response streams
+    body = request.stream  # None for an empty body
+    rows = translate(read_values(iter_lines(body) if body is not None else ()))
+    
+    # Async iterator under ASGI, which would otherwise read it into memory
+    if output == 'csv':
+        return StreamingHttpResponse(
+            streaming_content(request, iter_csv(rows, TRANSLATION_FIELDS)),
+            content_type=f'{CSV_CONTENT_TYPE}; charset=utf-8'
+        )
+    return StreamingHttpResponse(streaming_content(request, iter_ndjson(rows)), content_type=NDJSON_CONTENT_TYPE)
+
+
 # ============================================================================
 # EMAIL SUBSCRIPTION API ENDPOINT
 # ============================================================================
@@ -173,6 +614,7 @@ def search_api(request):
 )
 @api_view(['POST'])  # Only accept POST requests
 @permission_classes([AllowAny])  # Public endpoint - no authentication required
+@authentication_classes([])  # Skip JWT parsing - a token is never needed here
 def subscribe_api(request):
     """
     Subscribe an email address to receive platform updates.
@@ -187,6 +629,7 @@ def subscribe_api(request):
         Success: {"message": "Subscribed successfully!"} (200)
         Already exists: {"message": "You are already subscribed."} (200)
         Error: {"error": "Email is required"} (400)
+        Error: {"error": "Invalid email address"} (400)
     
     Example:
         POST /api/subscribe/
@@ -198,14 +641,230 @@ def subscribe_api(request):
     # Validate that email was provided
     if not email:
         return Response({'error': 'Email is required'}, status=400)
+    if not isinstance(email, str) or not is_valid_email(email):
+        return Response({'error': 'Invalid email address'}, status=400)
     
-    # Create subscriber or get existing one
-    # get_or_create returns (object, created_boolean)
-    # This prevents duplicate subscriptions
-    obj, created = Subscriber.objects.get_or_create(email=email)
+    # Create subscriber unless already subscribed (directly, or queued for
+    # a batched write with SUBSCRIBE_BUFFERED - see api/subscriptions.py)
+    created = subscribe(email)
     
     # Return appropriate message based on whether it's a new subscription
     if created:
         return Response({'message': 'Subscribed successfully!'})
     else:
-        return Response({'message': 'You are already subscribed.'})
\ No newline at end of file
+        return Response({'message': 'You are already subscribed.'})
+
+
+# ============================================================================
+# SUBSCRIBER EXPORT API ENDPOINT
+# ============================================================================
+# Staff-only streaming export of the subscriber list
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter(
+            'output',
+            openapi.IN_QUERY,
+            description="Response format: csv (default) or ndjson",
+            type=openapi.TYPE_STRING,
+            enum=['csv', 'ndjson'],
+            required=False
+        ),
+        openapi.Parameter(
+            'since',
+            openapi.IN_QUERY,
+            description="Only subscribers who joined at or after this date (YYYY-MM-DD or ISO 8601 datetime)",
+            type=openapi.TYPE_STRING,
+            required=False
+        ),
+        openapi.Parameter(
+            'until',
+            openapi.IN_QUERY,
+            description="Only subscribers who joined before this date (YYYY-MM-DD or ISO 8601 datetime)",
+            type=openapi.TYPE_STRING,
+            required=False
+        ),
+    ],
+    responses={
+        200: openapi.Response(
+            description='Subscribers, oldest first, streamed from the database',
+            examples={
+                'text/csv': (
+                    'email,date_joined\r\n'
+                    'user@example.com,2026-01-31T09:15:00+00:00\r\n'
+                )
+            }
+        ),
+        400: openapi.Response(description='Invalid output format or date'),
+        403: openapi.Response(description='Not a staff user')
+    }
+)
+@api_view(['GET'])  # Only accept GET requests
+@permission_classes([IsAdminUser])  # Staff JWT access token required - personal data
+def subscriber_export_api(request):
+    """
+    Export subscribers as CSV or NDJSON, optionally within a date_joined range.
+    
+    Rows are read from the database in chunks (SUBSCRIBER_EXPORT_CHUNK_SIZE)
+    and streamed as they are read, so memory use is constant regardless
+    of the number of subscribers.
+    
+    Query Parameters:
+        output (str): "csv" (default) or "ndjson"
+        since (str): Joined at or after this date / datetime (inclusive)
+        until (str): Joined before this date / datetime (exclusive)
+    
+    Example:
+        GET /api/subscribers/export/?output=ndjson&since=2026-01-01
+    """
+    output = request.query_params.get('output', 'csv')
+    if output not in ('csv', 'ndjson'):
+        return Response({'error': 'output must be csv or ndjson'}, status=400)
+    try:
+        since = parse_date_bound(request.query_params['since']) if request.query_params.get('since') else None
+        until = parse_date_bound(request.query_params['until']) if request.query_params.get('until') else None
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=400)
+    
+    # Lazy - the query runs as the response is sent
+    rows = subscriber_rows(since, until)
+    if output == 'csv':
+        content = iter_blocks(iter_csv(rows, SUBSCRIBER_FIELDS), BLOCK_LINES)
+        content_type = f'{CSV_CONTENT_TYPE}; charset=utf-8'
+    else:
+        content = iter_blocks(iter_ndjson(rows), BLOCK_LINES)
+        content_type = NDJSON_CONTENT_TYPE
+    
+    # Async iterator under ASGI, which would otherwise read it into memory
+    response = StreamingHttpResponse(streaming_content(request, content), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="subscribers.{output}"'
+    return response
+
+
+# ============================================================================
+# METRICS ENDPOINT
+# ============================================================================
+# Prometheus scrape target at /metrics (see api/metrics.py). A plain Django
+# view: the text format needs no DRF content negotiation or authentication.
+@require_GET  # Only accept GET requests
+def metrics_api(request):
+    """
+    Report request latency, response size, database and search cache
+    metrics in the Prometheus text exposition format.
+    
+    Aggregated over all gunicorn workers when PROMETHEUS_MULTIPROC_DIR
+    is set (see backend/gunicorn_metrics.py).
+    
+    Example:
+        GET /metrics
+    """
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
+
+
+# ============================================================================
+# ASYNC (ASGI) VARIANTS
+# ============================================================================
+# Native async versions of search_api and subscribe_api, routed instead of
+# the DRF views when settings.API_ASYNC_VIEWS is on (the default under
+# backend/asgi.py). Same URLs, parameters and response bodies.
+#
+# - Fuzzy scoring runs on a bounded thread pool, never on the event loop
+# - When the pool has SEARCH_ASYNC_MAX_PENDING jobs in flight, requests
+#   get 503 + Retry-After instead of queueing without limit
+# - Subscriptions use the async ORM (aget_or_create); only the buffered
+#   mode (SUBSCRIBE_BUFFERED) runs in a worker thread
+
+def json_response(data, status=200):
+    """JsonResponse rendered like DRF's JSONRenderer (compact, UTF-8)."""
+    return JsonResponse(
+        data,
+        status=status,
+        safe=False,
+        json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')},
+    )
+
+
+def documented_as(documented_view):
+    """
+    Publish an async view's API docs from its DRF twin.
+
+    DRF's @api_view has no async support, and the schema generators
+    (drf-yasg, drf-spectacular) only list URL callbacks carrying the
+    ``cls`` / ``initkwargs`` attributes @api_view sets - that is how they
+    find the APIView to introspect. drf-yasg also reads the
+    @swagger_auto_schema overrides from the callback itself. Copying all
+    three from the DRF view documents the async view identically; Django
+    never dispatches through them, so requests still run natively async.
+    """
+    def decorator(async_view):
+        async_view.cls = documented_view.cls
+        async_view.initkwargs = documented_view.initkwargs
+        if hasattr(documented_view, '_swagger_auto_schema'):
+            async_view._swagger_auto_schema = documented_view._swagger_auto_schema
+        return async_view
+    return decorator
+
+
+@documented_as(search_api)  # Same OpenAPI docs as the DRF view
+@require_GET  # Only accept GET requests
+@async_dataset_conditional(max_age=settings.SEARCH_HTTP_MAX_AGE)  # ETag / Last-Modified / Cache-Control
+async def search_api_async(request):
+    """
+    Async variant of search_api (same parameters and responses).
+    
+    Extra response:
+        Overloaded: {"error": "..."} (503) with a Retry-After header
+    """
+    query = request.GET.get('q', '')
+    if not query:
+        return json_response([])
+
+    try:
+        limit = parse_limit(request.GET.get('limit'), default=10)
+        data, next_cursor = await get_search_executor().run(
+            search_page, query, limit=limit, cursor=request.GET.get('cursor'),
+        )
+    except InvalidPage as exc:
+        return json_response({'error': str(exc)}, status=400)
+    except Saturated:
+        response = json_response({'error': 'Search is overloaded, please retry shortly'}, status=503)
+        response['Retry-After'] = str(settings.SEARCH_ASYNC_RETRY_AFTER)
+        return response
+
+    response = json_response(data)
+    if next_cursor is not None:
+        response['Link'] = next_page_link(request, next_cursor)
+    return response
+
+
+@documented_as(subscribe_api)  # Same OpenAPI docs as the DRF view
+@csrf_exempt  # Token-less public API, like the DRF views
+@require_POST  # Only accept POST requests
+async def subscribe_api_async(request):
+    """
+    Async variant of subscribe_api (same request body and responses).
+    
+    Accepts a JSON or form-encoded body.
+    """
+    if request.content_type == 'application/json':
+        try:
+            payload = json.loads(request.body or b'{}')
+        except ValueError:
+            return json_response({'error': 'Invalid JSON body'}, status=400)
+        email = payload.get('email') if isinstance(payload, dict) else None
+    else:
+        email = request.POST.get('email')
+
+    # Validate that email was provided
+    if not email:
+        return json_response({'error': 'Email is required'}, status=400)
+    if not isinstance(email, str) or not is_valid_email(email):
+        return json_response({'error': 'Invalid email address'}, status=400)
+
+    created = await asubscribe(email)
+
+    if created:
+        return json_response({'message': 'Subscribed successfully!'})
+    else:
+        return json_response({'message': 'You are already subscribed.'})
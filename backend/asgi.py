@@ -13,4 +13,7 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
+# Route search / subscribe to the native async views (see API_ASYNC_VIEWS)
+os.environ.setdefault('API_ASYNC_VIEWS', '1')
+
 application = get_asgi_application()
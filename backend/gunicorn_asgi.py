@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration for serving backend over ASGI.
+
+Runs backend.asgi (native async search / subscribe views) on uvicorn
+workers managed by gunicorn:
+
+    gunicorn backend.asgi:application -c backend/gunicorn_asgi.py
+
+The WSGI deployment is unchanged:
+
+    gunicorn backend.wsgi
+"""
+
+import multiprocessing
+import os
+
+# Aggregate Prometheus metrics across workers (see gunicorn.conf.py)
+from backend.gunicorn_metrics import child_exit, on_exit, on_starting  # noqa: F401
+
+# Bind to the port provided by the platform (Render sets $PORT)
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# One event loop per worker process; scoring runs on each worker's
+# bounded thread pool (SEARCH_ASYNC_WORKERS), so one worker per core
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'uvicorn_worker.UvicornWorker'
+
+# Keep-alive connections are cheap for an event loop
+keepalive = 5
+timeout = 30
+graceful_timeout = 30
+
+# Log to stdout / stderr
+accesslog = '-'
+errorlog = '-'
@@ -0,0 +1,38 @@
+"""
+Gunicorn hooks for Prometheus metrics across workers (api/metrics.py).
+
+Gives each gunicorn master a fresh PROMETHEUS_MULTIPROC_DIR, so every
+worker writes its samples there and /metrics aggregates all of them.
+Imported by gunicorn.conf.py (WSGI) and backend/gunicorn_asgi.py (ASGI).
+"""
+
+import os
+import shutil
+import tempfile
+
+# Must be set before prometheus_client is first imported: it picks its
+# storage then. One directory per master, so several servers on a host
+# do not mix.
+os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(tempfile.gettempdir(), f'ayush-metrics-{os.getpid()}'),
+)
+
+from prometheus_client import multiprocess  # noqa: E402
+
+
+def on_starting(server):
+    """Start from an empty metrics directory."""
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of a dead worker (its counters are kept)."""
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    """Remove the metrics directory on shutdown."""
+    shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
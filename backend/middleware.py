@@ -0,0 +1,161 @@
+"""
+Project middleware for backend.
+
+Every middleware here supports both the sync (WSGI) and async (ASGI)
+chains, so under ASGI Django never adds a sync_to_async thread hop
+for them.
+
+- WhiteNoiseMiddleware: static files (upstream WhiteNoise is sync-only)
+- RequestMetricsMiddleware: Prometheus metrics and Server-Timing header
+- RequestProfilingMiddleware: structured stage log and sampled cProfile dumps
+- QueryGuardMiddleware: N+1 detection and per-route query budgets
+"""
+
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from api import metrics, profiling, query_guard
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """WhiteNoise static file middleware usable in both WSGI and ASGI chains."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)  # In-memory dict
+        if static_file is not None:
+            # Opens the file - keep disk access off the event loop
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record latency, database queries and response size of every request.
+
+    Adds a ``Server-Timing`` header (total and database time) and feeds
+    the Prometheus metrics served at /metrics (api/metrics.py). Placed
+    near the top of MIDDLEWARE so the time includes the other middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = metrics.begin_request(request)
+        response = self.get_response(request)
+        metrics.end_request(token, request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = metrics.begin_request(request)
+        response = await self.get_response(request)
+        metrics.end_request(token, request, response)
+        return response
+
+
+class RequestProfilingMiddleware:
+    """
+    Log stage timings and take sampled cProfile dumps (api/profiling.py).
+
+    Must come after RequestMetricsMiddleware, whose per-request stats it
+    reads. cProfile only sees the thread it runs in, so requests handled
+    by async views (ASGI) get the stage log but no profile dumps.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        profiler, sampled = profiling.start_profile()
+        try:
+            response = self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiling.finish_profile(profiler, sampled, request, elapsed)
+        self.log(request, response, elapsed)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.log(request, response, time.perf_counter() - started)
+        return response
+
+    def log(self, request, response, elapsed):
+        stats = metrics.current_stats()
+        if stats is not None and profiling.logger.isEnabledFor(logging.INFO):
+            profiling.log_stages(request, response, stats, elapsed)
+
+
+class QueryGuardMiddleware:
+    """
+    Flag requests that repeat a SQL statement or exceed their query budget.
+
+    See api/query_guard.py. Must come after RequestMetricsMiddleware,
+    whose per-request stats it reads; in strict mode (tests) the
+    violation is raised as QueryBudgetExceeded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.check(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self.check(request)
+        return response
+
+    def check(self, request):
+        stats = metrics.current_stats()
+        if stats is not None:
+            query_guard.check_request(request, stats)
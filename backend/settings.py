@@ -2,6 +2,7 @@
 Django settings for backend project.
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -61,7 +62,10 @@ SITE_ID = 1
 # Middleware processes requests/responses in the order listed
 
 MIDDLEWARE = [
-    'whitenoise.middleware.WhiteNoiseMiddleware',      # Static file serving
+    'backend.middleware.WhiteNoiseMiddleware',         # Static file serving (WhiteNoise, WSGI + ASGI)
+    'backend.middleware.RequestMetricsMiddleware',     # Prometheus metrics + Server-Timing header
+    'backend.middleware.RequestProfilingMiddleware',   # Stage log + sampled cProfile dumps
+    'backend.middleware.QueryGuardMiddleware',         # N+1 detection + per-route query budgets
     'django.middleware.security.SecurityMiddleware',   # Security enhancements
     'django.contrib.sessions.middleware.SessionMiddleware',  # Session management
     'django.middleware.common.CommonMiddleware',       # Common utilities
@@ -107,6 +111,36 @@ DATABASES = {
 }
 
 
+# ============================================================================
+# CACHE CONFIGURATION
+# ============================================================================
+# 'search' holds ranked search results (api/search_cache.py).
+# LocMemCache is per process with LRU eviction. To share cached results
+# across gunicorn workers, switch the 'search' backend to
+# django.core.cache.backends.filebased.FileBasedCache (LOCATION = a
+# directory) or db.DatabaseCache (LOCATION = a table created with
+# `python manage.py createcachetable`). Both evict a random-like third of
+# the entries at MAX_ENTRIES instead of the least recently used, and every
+# miss then costs a file / database write.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'search': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ayush-search',
+        'TIMEOUT': 300,              # Seconds before a cached result expires
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,     # LocMemCache evicts the least recently used
+        },
+    },
+}
+
+# Cache alias used for search results
+SEARCH_CACHE_ALIAS = 'search'
+
+
 # ============================================================================
 # PASSWORD VALIDATION
 # ============================================================================
@@ -168,8 +202,10 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 REST_FRAMEWORK = {
     # Authentication: Use JWT tokens for all requests
+    # (verified tokens are cached per process - see JWT_AUTH_CACHE_* below)
+    # Public views opt out with @authentication_classes([])
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     
     # Authorization: Require authentication by default
@@ -180,6 +216,12 @@ REST_FRAMEWORK = {
     
     # API Documentation: Use drf-spectacular for OpenAPI 3.0 schema
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    
+    # JSON rendering timed as the "serialize" stage (api/profiling.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.profiling.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 # Enable JWT authentication in dj-rest-auth
@@ -201,6 +243,15 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
 
+# Verified access tokens cached per process (api.authentication.CachedJWTAuthentication)
+# Most tokens kept; 0 disables the cache
+JWT_AUTH_CACHE_SIZE = 10_000
+
+# Seconds a token stays cached (at most until it expires). Bounds how long
+# another worker keeps accepting a user who was deactivated or changed
+# their password; the worker that saved the user forgets them at once.
+JWT_AUTH_CACHE_TTL = 300
+
 # ============================================================================
 # DJANGO-ALLAUTH CONFIGURATION
 # ============================================================================
@@ -228,6 +279,165 @@ ACCOUNT_AUTHENTICATION_METHOD = 'username_email'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# ============================================================================
+# SEARCH CONFIGURATION
+# ============================================================================
+# Settings for the in-process search index (api/search_index.py)
+
+# Search engine used by GET /api/search/:
+# 'python' - in-process index, fuzzy scoring in Python (default)
+# 'fts5'   - SQLite FTS5 trigram shortlist of SEARCH_FTS_SHORTLIST rows
+#            ranked by bm25, fuzzy re-ranked in Python (api/fts.py).
+#            Needs the FTS5 index: `python manage.py fts_index`.
+#            Queries shorter than 3 characters use the 'python' engine.
+SEARCH_ENGINE = 'python'
+SEARCH_FTS_SHORTLIST = 200
+
+# How often (seconds) each worker re-checks the dataset version stamp
+# Changes made in the same process are picked up immediately
+SEARCH_INDEX_VERSION_CHECK_INTERVAL = 1.0
+
+# Trigram prefilter (api/trigrams.py): only terms sharing at least
+# SEARCH_TRIGRAM_MIN_OVERLAP of the query's trigrams are fuzzy scored.
+# Datasets below SEARCH_TRIGRAM_MIN_CORPUS rows and queries shorter than
+# SEARCH_TRIGRAM_MIN_QUERY_LENGTH characters use an exhaustive scan.
+SEARCH_TRIGRAM_MIN_CORPUS = 5000
+SEARCH_TRIGRAM_MIN_QUERY_LENGTH = 4
+SEARCH_TRIGRAM_MIN_OVERLAP = 0.25
+
+# Batch search (POST /api/search/batch/): maximum queries per request and
+# RapidFuzz worker threads used to score them (-1 = all CPU cores)
+SEARCH_BATCH_MAX_QUERIES = 100
+SEARCH_BATCH_WORKERS = -1
+
+# Largest page size accepted by GET /api/search/?limit=
+SEARCH_MAX_LIMIT = 100
+
+# Number of completions returned by GET /api/autocomplete/
+AUTOCOMPLETE_LIMIT = 10
+
+# Serve /api/search/ and /api/subscribe/ with native async views.
+# Enabled by backend/asgi.py (uvicorn); WSGI (gunicorn, runserver) keeps
+# the DRF views.
+API_ASYNC_VIEWS = os.environ.get('API_ASYNC_VIEWS', '0') == '1'
+
+# Async views: scoring thread pool size (None = CPU count), jobs allowed
+# in flight before answering 503 (None = 8 per thread) and the
+# Retry-After (seconds) sent with the 503
+SEARCH_ASYNC_WORKERS = None
+SEARCH_ASYNC_MAX_PENDING = None
+SEARCH_ASYNC_RETRY_AFTER = 1
+
+# Cache-Control max-age (seconds) for public search / code mapping
+# responses. Clients revalidate with the ETag after it expires.
+SEARCH_HTTP_MAX_AGE = 300
+
+
+
+# ============================================================================
+# SUBSCRIPTION CONFIGURATION
+# ============================================================================
+# See api/subscriptions.py. Buffered mode batches subscriber writes so a
+# sign-up spike does not hold SQLite's write lock once per request.
+
+# Queue new subscriptions in memory and write them in batches
+SUBSCRIBE_BUFFERED = os.environ.get('SUBSCRIBE_BUFFERED', '0') == '1'
+
+# Pending emails that trigger a write
+SUBSCRIBE_FLUSH_SIZE = 100
+
+# Seconds between background writes (longest an email waits)
+SUBSCRIBE_FLUSH_INTERVAL = 1.0
+
+# Already-subscribed emails each worker remembers (answered without a query)
+SUBSCRIBE_KNOWN_SIZE = 100_000
+
+# Rows fetched per database round trip by subscriber exports
+SUBSCRIBER_EXPORT_CHUNK_SIZE = 2000
+
+
+# ============================================================================
+# PROFILING CONFIGURATION
+# ============================================================================
+# See api/profiling.py. All off by default; set the environment variables
+# to investigate slow requests in a running deployment.
+
+# Log every request's stage timings as a JSON line ("api.profiling" logger)
+PROFILE_STAGE_LOG = os.environ.get('PROFILE_STAGE_LOG', '0') == '1'
+
+# Fraction of requests profiled with cProfile and dumped (0.01 = 1%)
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+
+# When set, profile every request and dump those slower than this many
+# milliseconds (cProfile slows profiled requests down, roughly 2x)
+PROFILE_SLOW_MS = float(os.environ['PROFILE_SLOW_MS']) if os.environ.get('PROFILE_SLOW_MS') else None
+
+# Directory the .prof (pstats) dumps are written to
+PROFILE_DIR = Path(os.environ.get('PROFILE_DIR', BASE_DIR / 'profiles'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'api.profiling.JsonFormatter'},
+    },
+    'handlers': {
+        'json_console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'api.profiling': {
+            'handlers': ['json_console'],
+            'level': 'INFO' if PROFILE_STAGE_LOG else 'WARNING',
+            'propagate': False,
+        },
+        'api.query_guard': {
+            'handlers': ['json_console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
+
+# ============================================================================
+# QUERY GUARD CONFIGURATION
+# ============================================================================
+# See api/query_guard.py. Violations are logged as JSON lines with the
+# call stack that issued the query.
+
+# A statement (same SQL, any parameters) run this many times in one
+# request is reported as an N+1 pattern
+QUERY_REPEAT_THRESHOLD = 3
+
+# Most queries a request to each route may run (routes as in /metrics).
+# Counted by the database execute wrapper; transaction control (BEGIN,
+# savepoints, COMMIT) is not counted. Checked by api/tests.py.
+QUERY_BUDGETS = {
+    'api/search/': 2,                      # Dataset stamp + index reload (fts5: shortlist query)
+    'api/search/batch/': 2,
+    'api/autocomplete/': 2,
+    'api/map/namaste/<str:code>/': 2,
+    'api/map/icd/<str:code>/': 2,
+    'api/translate/bulk/': 3,              # JWT user (first use of a token) + index
+    'api/subscribe/': 2,                   # Lookup + INSERT (buffered: lookup only)
+    'api/subscribers/export/': 1,          # JWT user; rows are read while streaming
+    'api/auth/token/': 1,                  # Indexed username / email lookup
+    'api/auth/token/refresh/': 1,
+    'api/auth/token/verify/': 0,
+    'metrics': 0,
+}
+
+# Budget of routes not listed above (None = unlimited)
+QUERY_BUDGET_DEFAULT = None
+
+# Raise QueryBudgetExceeded instead of logging. The API tests turn it on
+# with override_settings, whatever the test runner
+QUERY_GUARD_STRICT = os.environ.get('QUERY_GUARD_STRICT', '0') == '1'
+
+
 # ============================================================================
 # DRF-YASG (SWAGGER UI) CONFIGURATION
 # ============================================================================
@@ -5,6 +5,7 @@ Defines all URL routes for the application including:
 - Authentication endpoints (JWT, registration)
 - API endpoints (via api.urls)
 - API documentation (Swagger, ReDoc)
+- Prometheus metrics (/metrics)
 
 For more information see:
 https://docs.djangoproject.com/en/stable/topics/http/urls/
@@ -25,6 +26,7 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 from api.auth import UsernameEmailTokenObtainPairView
+from api.views import metrics_api
 
 
 # ============================================================================
@@ -88,9 +90,20 @@ urlpatterns = [
     # -------------------------------------------------------------------------
     # Include all API endpoints from api.urls
     # GET /api/search/ - Disease search
+    # POST /api/search/batch/ - Batch disease search
+    # GET /api/autocomplete/ - Typeahead prefix completions
+    # GET /api/map/namaste/<code>/, /api/map/icd/<code>/ - Exact code mapping
+    # POST /api/translate/bulk/ - Streaming bulk translation (JWT required)
     # POST /api/subscribe/ - Email subscription
+    # GET /api/subscribers/export/ - Streaming subscriber export (staff JWT required)
     path('api/', include('api.urls')),
     
+    # -------------------------------------------------------------------------
+    # MONITORING
+    # -------------------------------------------------------------------------
+    # GET /metrics - Prometheus scrape target (request / DB / cache metrics)
+    path('metrics', metrics_api, name='metrics'),
+    
     # -------------------------------------------------------------------------
     # API DOCUMENTATION
     # -------------------------------------------------------------------------
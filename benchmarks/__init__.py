@@ -0,0 +1,8 @@
+"""Benchmarks for Ayush Bridge
+
+Run from the project root:
+    python -m benchmarks.corpus 100000 -o corpus.csv   # Synthetic dataset
+    python -m benchmarks.search                        # Search micro-benchmark
+    python -m benchmarks.loadtest                      # End-to-end API load test
+    python -m benchmarks.login                         # User lookup / login at 1M users
+"""
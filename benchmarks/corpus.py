@@ -0,0 +1,194 @@
+"""Synthetic Corpus Generator for Ayush Bridge
+
+Builds datasets of any size shaped like ayush_data.csv:
+- Terms: "Sanskrit Name (English Gloss)", e.g. "Kaphaja Kasaroga (Chronic Cough)"
+- NAMASTE codes: "NAM-07-0412", with about one row in ten using the
+  "AAB-123" format
+- ICD-11 codes: drawn from a fixed pool, so several diagnoses share one
+  code as in the real data
+
+Generation is deterministic for a given (size, seed): the same corpus and
+query sets are produced on every machine, so benchmark runs compare.
+
+Usage:
+    python -m benchmarks.corpus 100000 -o corpus.csv
+    python manage.py import_diagnoses corpus.csv
+"""
+
+import argparse
+import csv
+import random
+import sys
+
+
+# ============================================================================
+# VOCABULARY
+# ============================================================================
+ONSETS = [
+    'k', 'kh', 'g', 'gh', 'ch', 'j', 't', 'th', 'd', 'dh', 'n', 'p', 'ph',
+    'b', 'bh', 'm', 'y', 'r', 'l', 'v', 'sh', 's', 'h', 'kr', 'pr', 'tr',
+    'shv', 'sv', 'jv', 'st', 'sn', 'br',
+]
+
+VOWELS = ['a', 'a', 'a', 'aa', 'i', 'ee', 'u', 'e', 'o', 'ai', 'ri']
+
+# Common final elements of Ayurvedic disease names
+SUFFIXES = [
+    'roga', 'jwara', 'shula', 'meha', 'kasa', 'shotha', 'vata', 'pitta',
+    'kapha', 'arsha', 'gulma', 'kushtha', 'bheda', 'daha', 'pandu', 'graha',
+    'ah', 'a', 'ta', 'ka',
+]
+
+ENGLISH = [
+    'fever', 'cough', 'diabetes', 'anaemia', 'jaundice', 'asthma', 'arthritis',
+    'headache', 'piles', 'ulcer', 'skin', 'disease', 'pain', 'disorder',
+    'gastritis', 'obesity', 'insomnia', 'epilepsy', 'malaria', 'typhoid',
+    'tuberculosis', 'migraine', 'vertigo', 'eczema', 'psoriasis', 'dysentery',
+    'colic', 'cataract', 'swelling', 'bleeding', 'loss', 'of', 'taste',
+    'hearing', 'vision', 'bloating', 'tremor', 'fatigue', 'numbness', 'itching',
+]
+
+QUALIFIERS = [
+    'Chronic', 'Acute', 'Severe', 'Vata Type', 'Pitta Type', 'Kapha Type',
+    'Intermittent', 'Recurrent',
+]
+
+ICD_CODES = [
+    '1A00', '1B10', '1F40', '5A11', '5B80', '6B20', '6C00', '7A00', '8A00',
+    '8A80', '8A80.1', '8B90', '9A00', '9B10', '9D00', 'AA80', 'AB50', 'BA00',
+    'CA23', 'DA01', 'DA08.0', 'DB60', 'DD91', 'EA80', 'ED70', 'ED70.Y', 'FA00',
+    'FA20', 'GA10', 'GB90', 'MB40', 'MB50', 'MD21', 'ME10', 'ME84', 'MG22',
+    'MG26', 'MG30',
+]
+
+NAMASTE_CHAPTERS = 20
+
+# Share of rows using the "AAB-<n>" code format
+AAB_SHARE = 0.1
+
+
+# ============================================================================
+# CORPUS
+# ============================================================================
+def sanskrit_word(rng):
+    """Return one capitalised pseudo-Sanskrit word (e.g. "Shvaakaroga")."""
+    syllables = ''.join(rng.choice(ONSETS) + rng.choice(VOWELS) for _ in range(rng.randint(1, 3)))
+    if rng.random() < 0.6:
+        syllables += rng.choice(SUFFIXES)
+    return syllables.capitalize()
+
+
+def english_gloss(rng):
+    """Return an English gloss (e.g. "Chronic Cough", "Skin Disease - Pitta Type")."""
+    gloss = ' '.join(rng.sample(ENGLISH, rng.randint(1, 3))).title()
+    if rng.random() < 0.15:
+        gloss = f'{gloss} - {rng.choice(QUALIFIERS)}'
+    elif rng.random() < 0.15:
+        gloss = f'{rng.choice(QUALIFIERS)} {gloss}'
+    return gloss
+
+
+def generate_corpus(size, seed=0):
+    """
+    Generate ``size`` unique diagnosis rows.
+
+    Returns:
+        list[tuple]: (term, namaste_code, icd_code) rows, unique by term
+            and by NAMASTE code
+    """
+    rng = random.Random(seed)
+    rows = []
+    terms = set()
+    aab_serial = 0
+    nam_serial = 0
+
+    while len(rows) < size:
+        name = ' '.join(sanskrit_word(rng) for _ in range(rng.choice((1, 1, 2))))
+        term = f'{name} ({english_gloss(rng)})'
+        if term in terms:
+            continue
+        terms.add(term)
+
+        if rng.random() < AAB_SHARE:
+            aab_serial += 1
+            namaste_code = f'AAB-{aab_serial}'
+        else:
+            serial, chapter = divmod(nam_serial, NAMASTE_CHAPTERS)
+            nam_serial += 1
+            namaste_code = f'NAM-{chapter + 1:02d}-{serial + 1:04d}'
+        rows.append((term, namaste_code, rng.choice(ICD_CODES)))
+    return rows
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+QUERY_KINDS = ('exact', 'prefix', 'typo')
+
+
+def make_typo(rng, text):
+    """Apply one random substitution, deletion, insertion or transposition."""
+    if len(text) < 3:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    operation = rng.randrange(4)
+    if operation == 0:
+        return text[:i] + rng.choice('aeiouknrstvh') + text[i + 1:]
+    if operation == 1:
+        return text[:i] + text[i + 1:]
+    if operation == 2:
+        return text[:i] + rng.choice('aeiouknrstvh') + text[i:]
+    return text[:i - 1] + text[i] + text[i - 1] + text[i + 1:]
+
+
+def generate_queries(rows, count, seed=1):
+    """
+    Generate ``count`` queries of each kind against a corpus.
+
+    - exact:  a full term or its Sanskrit name, as stored
+    - prefix: the first 3-6 characters of a word in the term
+    - typo:   a Sanskrit name or gloss word with one edit
+
+    Returns:
+        dict: kind -> list of query strings
+    """
+    rng = random.Random(seed)
+    queries = {kind: [] for kind in QUERY_KINDS}
+    for _ in range(count):
+        term = rng.choice(rows)[0]
+        name = term.partition(' (')[0]
+        queries['exact'].append(term if rng.random() < 0.5 else name)
+
+        word = rng.choice(rng.choice(rows)[0].replace('(', ' ').replace(')', ' ').split())
+        queries['prefix'].append(word[:rng.randint(3, 6)])
+
+        source = rng.choice(rows)[0].partition(' (')
+        target = source[0] if rng.random() < 0.7 else source[2].rstrip(')')
+        queries['typo'].append(make_typo(rng, target))
+    return queries
+
+
+def write_csv(rows, out):
+    """Write rows in the ayush_data.csv format (see import_diagnoses)."""
+    writer = csv.writer(out)
+    writer.writerow(['term', 'namaste_code', 'icd_code'])
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic ayush_data.csv-style corpus.')
+    parser.add_argument('size', type=int, help='Number of rows')
+    parser.add_argument('-o', '--output', help='CSV file to write (default: stdout)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args(argv)
+
+    rows = generate_corpus(args.size, args.seed)
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as out:
+            write_csv(rows, out)
+    else:
+        write_csv(rows, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,435 @@
+"""End-to-End Load Test for Ayush Bridge
+
+Drives the HTTP API of a locally started server with many concurrent
+keep-alive clients and reports latency percentiles, error rate and
+throughput per endpoint.
+
+A run:
+1. Recreates benchmarks/loadtest.sqlite3 (benchmarks/settings_loadtest.py),
+   never the development db.sqlite3
+2. Imports diagnoses with import_diagnoses - ayush_data.csv, or a
+   synthetic corpus of --rows rows (benchmarks/corpus.py)
+3. Seeds --users test users, like the create_test_user command
+4. Starts gunicorn (WSGI or ASGI) on --port with the load test settings
+5. Runs --concurrency virtual users for --duration seconds. Each one
+   logs in once, then picks endpoints at random according to --mix:
+   - search:    GET  /api/search/?q=...            (exact, prefix, typo queries)
+   - subscribe: POST /api/subscribe/               (a new email each time)
+   - token:     POST /api/auth/token/              (username + password login)
+   - refresh:   POST /api/auth/token/refresh/      (the user's refresh token)
+6. Prints a per-endpoint table and writes JSON to benchmarks/results/
+
+Usage:
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --rows 10000 --concurrency 32 --duration 30
+    python -m benchmarks.loadtest --server asgi --workers 2
+    python -m benchmarks.loadtest --mix search=90,token=10 --threads 8
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --skip-prepare
+
+Only the Python standard library (plus the project's own requirements)
+is used; the client is a minimal asyncio HTTP/1.1 implementation.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from .corpus import generate_corpus, generate_queries, write_csv
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+SETTINGS_MODULE = 'benchmarks.settings_loadtest'
+
+# Seeded users: loadtest0 ... loadtest<N-1>, all with the same password
+USERNAME = 'loadtest{}'
+PASSWORD = 'TestPassword123!'
+
+DEFAULT_MIX = 'search=70,subscribe=10,token=10,refresh=10'
+
+ENDPOINTS = {
+    'search': ('GET', '/api/search/'),
+    'subscribe': ('POST', '/api/subscribe/'),
+    'token': ('POST', '/api/auth/token/'),
+    'refresh': ('POST', '/api/auth/token/refresh/'),
+}
+
+# Queries generated per kind (exact / prefix / typo) for the search mix
+SEARCH_QUERIES = 500
+
+
+# ============================================================================
+# PREPARATION
+# ============================================================================
+def prepare(rows, users, seed):
+    """
+    Recreate the load test database, import diagnoses and seed users.
+
+    Returns:
+        list[tuple]: The imported (term, namaste_code, icd_code) rows
+    """
+    # Forced, not setdefault: never prepare the development database
+    os.environ['DJANGO_SETTINGS_MODULE'] = SETTINGS_MODULE
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from django.core.management import call_command
+
+    database = Path(settings.DATABASES['default']['NAME'])
+    for path in (database, database.with_name(database.name + '-journal')):
+        path.unlink(missing_ok=True)
+    call_command('migrate', verbosity=0)
+
+    # Load data the way simple_load.py does
+    if rows:
+        data = generate_corpus(rows, seed)
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', encoding='utf-8', delete=False) as out:
+            write_csv(data, out)
+        try:
+            call_command('import_diagnoses', out.name)
+        finally:
+            os.unlink(out.name)
+    else:
+        with open(BASE_DIR / 'ayush_data.csv', newline='', encoding='utf-8') as source:
+            data = [(row['term'], row['namaste_code'], row['icd_code']) for row in csv.DictReader(source)]
+        call_command('import_diagnoses', str(BASE_DIR / 'ayush_data.csv'))
+
+    # Same users create_test_user makes, hashed once instead of per user
+    User = get_user_model()
+    password = make_password(PASSWORD)
+    User.objects.bulk_create(
+        User(username=USERNAME.format(n), email=f'{USERNAME.format(n)}@example.com', password=password, is_active=True)
+        for n in range(users)
+    )
+    print(f'Prepared {database.name}: {len(data)} diagnoses, {users} users', file=sys.stderr)
+    return data
+
+
+def start_server(kind, port, workers, threads, log):
+    """Start gunicorn with the load test settings and wait until it accepts connections."""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=SETTINGS_MODULE)
+    command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(workers)]
+    if kind == 'asgi':
+        command += ['--config', str(BASE_DIR / 'backend' / 'gunicorn_asgi.py'), 'backend.asgi:application']
+    else:
+        command += ['--threads', str(threads), 'backend.wsgi']
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f'Server exited with status {process.returncode}, see {log.name}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit(f'Server did not start within 60 seconds, see {log.name}')
+
+
+# ============================================================================
+# HTTP CLIENT
+# ============================================================================
+class Connection:
+    """One keep-alive HTTP/1.1 connection (Content-Length and chunked bodies)."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        """
+        Send one request and read the whole response.
+
+        Returns:
+            tuple: (status, body bytes)
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        head = f'{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n'
+        payload = b''
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            head += f'Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n'
+        self.writer.write(head.encode('latin-1') + b'\r\n' + payload)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by server')
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            data = bytearray()
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    break
+                data += await self.reader.readexactly(size)
+                await self.reader.readexactly(2)  # CRLF after each chunk
+            # Trailers end with an empty line
+            while (await self.reader.readline()) not in (b'\r\n', b''):
+                pass
+            content = bytes(data)
+        else:
+            content = await self.reader.readexactly(int(headers.get('content-length', 0)))
+
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, content
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+# ============================================================================
+# LOAD GENERATION
+# ============================================================================
+def parse_mix(value):
+    """Parse "search=70,token=30" into {endpoint: weight}."""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f'unknown endpoint {name!r} (choose from {", ".join(ENDPOINTS)})')
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'invalid weight for {name!r}: {weight!r}')
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError('at least one endpoint needs a positive weight')
+    return mix
+
+
+class VirtualUser:
+    """One simulated client: its own connection, account and random stream."""
+
+    def __init__(self, number, host, port, queries, users, seed):
+        self.number = number
+        self.connection = Connection(host, port)
+        self.queries = queries
+        self.username = USERNAME.format(number % users)
+        self.rng = random.Random(seed * 100_003 + number)
+        self.refresh_token = None
+        self.subscriptions = 0
+
+    def build(self, endpoint):
+        """Return (method, path, body) for one request to ``endpoint``."""
+        method, path = ENDPOINTS[endpoint]
+        if endpoint == 'search':
+            return method, f"{path}?{urlencode({'q': self.rng.choice(self.queries)})}", None
+        if endpoint == 'subscribe':
+            self.subscriptions += 1
+            return method, path, {'email': f'loadtest-{self.number}-{self.subscriptions}@example.com'}
+        if endpoint == 'token':
+            return method, path, {'username': self.username, 'password': PASSWORD}
+        return method, path, {'refresh': self.refresh_token}
+
+    async def call(self, endpoint):
+        """Send one request; returns (status or None on a connection error, seconds, body)."""
+        method, path, body = self.build(endpoint)
+        started = time.perf_counter()
+        try:
+            status, content = await self.connection.request(method, path, body)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+            self.connection.close()
+            return None, time.perf_counter() - started, b''
+        return status, time.perf_counter() - started, content
+
+    async def login(self):
+        """Obtain this user's refresh token (not recorded)."""
+        status, _seconds, content = await self.call('token')
+        if status != 200:
+            raise SystemExit(f'Login failed for {self.username} with status {status}: {content[:200]!r}')
+        self.refresh_token = json.loads(content)['refresh']
+
+    async def run(self, mix, deadline, samples):
+        """Issue requests until ``deadline``, appending (endpoint, status, seconds) to ``samples``."""
+        endpoints = list(mix)
+        weights = list(mix.values())
+        while time.perf_counter() < deadline:
+            endpoint = self.rng.choices(endpoints, weights)[0]
+            status, seconds, content = await self.call(endpoint)
+            samples.append((endpoint, status, seconds))
+            if endpoint == 'refresh' and status == 200:
+                # Follow rotation if ROTATE_REFRESH_TOKENS is on
+                self.refresh_token = json.loads(content).get('refresh', self.refresh_token)
+        self.connection.close()
+
+
+async def generate_load(url, mix, concurrency, duration, warmup, queries, users, seed):
+    """Run the virtual users; returns the recorded samples and the measured seconds."""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    vus = [VirtualUser(number, host, port, queries, users, seed) for number in range(concurrency)]
+    await asyncio.gather(*(vu.login() for vu in vus))
+
+    if warmup:
+        # Builds each worker's search index and warms caches (not recorded)
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(vu.run(mix, deadline, []) for vu in vus))
+
+    samples = []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(vu.run(mix, deadline, samples) for vu in vus))
+    return samples, time.perf_counter() - started
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(samples, seconds):
+    """Per-endpoint (and total) latency, error and throughput statistics."""
+    groups = {}
+    for endpoint, status, latency in samples:
+        groups.setdefault(endpoint, []).append((status, latency))
+    groups['all'] = [(status, latency) for _endpoint, status, latency in samples]
+
+    report = {}
+    for endpoint, results in groups.items():
+        latencies = sorted(latency for _status, latency in results)
+        statuses = {}
+        for status, _latency in results:
+            key = str(status) if status is not None else 'connection_error'
+            statuses[key] = statuses.get(key, 0) + 1
+        errors = sum(1 for status, _latency in results if status is None or status >= 400)
+        report[endpoint] = {
+            'requests': len(results),
+            'errors': errors,
+            'error_rate': round(errors / len(results), 4),
+            'rps': round(len(results) / seconds, 1),
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'max_ms': round(latencies[-1] * 1000, 2),
+            'status_codes': statuses,
+        }
+    return report
+
+
+def print_report(endpoints):
+    """Print the per-endpoint results as a table."""
+    print(f"{'endpoint':>10} {'requests':>9} {'rps':>8} {'errors':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for endpoint, stats in endpoints.items():
+        print(
+            f"{endpoint:>10} {stats['requests']:>9} {stats['rps']:>8.1f} {stats['error_rate']:>7.1%} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+    print('(latencies in ms)')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the API against a locally started server.')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f'Endpoint weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--concurrency', type=int, default=16, help='Virtual users (default: 16)')
+    parser.add_argument('--duration', type=float, default=20, help='Measured seconds (default: 20)')
+    parser.add_argument('--warmup', type=float, default=3, help='Unrecorded seconds before measuring (default: 3)')
+    parser.add_argument('--rows', type=int, default=0,
+                        help='Synthetic corpus size (default: 0 = import ayush_data.csv)')
+    parser.add_argument('--users', type=int, default=10, help='Seeded test users (default: 10)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus, query and client seed (default: 0)')
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), default='wsgi', help='Server to start (default: wsgi)')
+    parser.add_argument('--workers', type=int, default=1, help='gunicorn workers (default: 1)')
+    parser.add_argument('--threads', type=int, default=1, help='Threads per WSGI worker (default: 1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to start the server on (default: 8765)')
+    parser.add_argument('--url', help='Use an already running server instead of starting one')
+    parser.add_argument('--skip-prepare', action='store_true',
+                        help='Reuse the existing load test database (requires an earlier run)')
+    parser.add_argument('-o', '--output', help='JSON file to write (default: benchmarks/results/loadtest-<time>.json)')
+    args = parser.parse_args(argv)
+
+    if args.skip_prepare:
+        if args.rows:
+            data = generate_corpus(args.rows, args.seed)
+        else:
+            with open(BASE_DIR / 'ayush_data.csv', newline='', encoding='utf-8') as source:
+                data = [(row['term'], row['namaste_code'], row['icd_code']) for row in csv.DictReader(source)]
+    else:
+        data = prepare(args.rows, args.users, args.seed)
+    queries = [query for kind in generate_queries(data, SEARCH_QUERIES, args.seed + 1).values() for query in kind]
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    server = None
+    url = args.url
+    if url is None:
+        log = open(RESULTS_DIR / f'loadtest-{stamp}-server.log', 'wb')
+        server = start_server(args.server, args.port, args.workers, args.threads, log)
+        url = f'http://127.0.0.1:{args.port}'
+
+    try:
+        print(f'Load testing {url}: {args.concurrency} users for {args.duration:g}s...', file=sys.stderr)
+        samples, seconds = asyncio.run(generate_load(
+            url, args.mix, args.concurrency, args.duration, args.warmup, queries, args.users, args.seed,
+        ))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+            log.close()
+
+    report = {
+        'benchmark': 'loadtest',
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'parameters': {
+            'url': url,
+            'server': None if args.url else args.server,
+            'workers': None if args.url else args.workers,
+            'threads': None if args.url or args.server == 'asgi' else args.threads,
+            'mix': args.mix,
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'rows': len(data),
+            'users': args.users,
+            'seed': args.seed,
+            'cpu_count': os.cpu_count(),
+        },
+        'seconds': round(seconds, 3),
+        'endpoints': summarize(samples, seconds),
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f'loadtest-{stamp}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + '\n')
+
+    print_report(report['endpoints'])
+    print(f'Results written to {output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""Login Benchmark for Ayush Bridge
+
+Measures the token-obtain path (api/auth.py) against a user table of a
+realistic size (default 1M users), in the load test database
+(benchmarks/settings_loadtest.py), never the development db.sqlite3:
+
+- lookup (iexact): the previous user lookup, Q(username__iexact) |
+  Q(email__iexact) - LIKE / UPPER() comparisons that scan the table
+- lookup (indexed): find_login_user(), LOWER(column) = LOWER(%s) served
+  by the functional indexes from migration 0010
+- login (before): iexact lookup + authenticate(), which queries again
+- login: UsernameEmailTokenObtainPairSerializer.validate() - one query,
+  password check, token signing
+
+Identifiers are drawn at random, half usernames and half emails, in
+mixed case. Each query's SQLite plan is printed, so a SCAN (no index)
+is easy to spot. Logins include the password hasher (PBKDF2), which
+dominates their time once the lookup is indexed.
+
+Usage:
+    python -m benchmarks.login                      # 1M users
+    python -m benchmarks.login --users 100000 --lookups 500
+    python -m benchmarks.login --skip-prepare       # Reuse the users from the last run
+
+Results are written as JSON (default benchmarks/results/login-<time>.json).
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .loadtest import PASSWORD, SETTINGS_MODULE
+
+# Forced, not setdefault: never fill the development database
+os.environ['DJANGO_SETTINGS_MODULE'] = SETTINGS_MODULE
+
+from .search import RESULTS_DIR, environment, summarize  # noqa: E402
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import authenticate, get_user_model  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db.models import Q, Value  # noqa: E402
+from django.db.models.functions import Lower  # noqa: E402
+from django.db.models.lookups import Exact  # noqa: E402
+
+from api.auth import UsernameEmailTokenObtainPairSerializer, find_login_user  # noqa: E402
+
+
+USERNAME = 'user{:07d}'
+
+# Users inserted per bulk_create batch
+BATCH_SIZE = 5000
+
+
+# ============================================================================
+# SETUP
+# ============================================================================
+def prepare(users):
+    """Recreate the load test database with ``users`` users sharing one password hash."""
+    database = Path(settings.DATABASES['default']['NAME'])
+    for path in (database, database.with_name(database.name + '-journal')):
+        path.unlink(missing_ok=True)
+    call_command('migrate', verbosity=0)
+
+    User = get_user_model()
+    password = make_password(PASSWORD)
+    started = time.perf_counter()
+    for first in range(0, users, BATCH_SIZE):
+        User.objects.bulk_create(
+            User(username=USERNAME.format(n), email=f'{USERNAME.format(n)}@Example.org', password=password)
+            for n in range(first, min(first + BATCH_SIZE, users))
+        )
+    print(f'Prepared {database.name}: {users} users in {time.perf_counter() - started:.1f} s', file=sys.stderr)
+
+
+def identifiers(users, count, seed):
+    """Random login identifiers: half usernames, half emails, in mixed case."""
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        name = USERNAME.format(rng.randrange(users))
+        identifier = name if rng.random() < 0.5 else f'{name}@example.org'
+        result.append(''.join(c.upper() if rng.random() < 0.5 else c for c in identifier))
+    return result
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+def iexact_lookup(identifier):
+    """The user lookup api/auth.py used before migration 0010."""
+    User = get_user_model()
+    return User.objects.filter(Q(username__iexact=identifier) | Q(email__iexact=identifier)).first()
+
+
+def login_before(identifier):
+    """The previous token-obtain path: iexact lookup, then authenticate()."""
+    user = iexact_lookup(identifier)
+    return authenticate(username=user.username, password=PASSWORD)
+
+
+def login(identifier):
+    """The current token-obtain path."""
+    serializer = UsernameEmailTokenObtainPairSerializer(
+        data={'username': identifier, 'password': PASSWORD}, context={'request': None},
+    )
+    serializer.is_valid(raise_exception=True)
+    return serializer.user
+
+
+def query_plan(identifier, indexed):
+    """Return SQLite's plan for the indexed or the iexact lookup."""
+    User = get_user_model()
+    if indexed:
+        value = Lower(Value(identifier))
+        condition = Q(Exact(Lower('username'), value)) | Q(Exact(Lower('email'), value))
+    else:
+        condition = Q(username__iexact=identifier) | Q(email__iexact=identifier)
+    return User.objects.filter(condition).order_by('pk')[:1].explain()
+
+
+def measure(function, identifiers):
+    """Time ``function`` on each identifier; every call must find a user."""
+    samples = []
+    for identifier in identifiers:
+        started = time.perf_counter()
+        user = function(identifier)
+        samples.append(time.perf_counter() - started)
+        if user is None:
+            raise RuntimeError(f'{function.__name__}({identifier!r}) found no user')
+    return summarize(samples, [1] * len(samples))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark user lookup and login against a large user table.')
+    parser.add_argument('--users', type=int, default=1_000_000, help='Users to create (default: 1000000)')
+    parser.add_argument('--lookups', type=int, default=100, help='Timed lookups per variant (default: 100)')
+    parser.add_argument('--logins', type=int, default=20, help='Timed logins per variant (default: 20)')
+    parser.add_argument('--seed', type=int, default=0, help='Identifier seed (default: 0)')
+    parser.add_argument('--skip-prepare', action='store_true', help='Reuse the existing load test database')
+    parser.add_argument('-o', '--output', help='JSON file to write (default: benchmarks/results/login-<time>.json)')
+    args = parser.parse_args(argv)
+
+    if not args.skip_prepare:
+        prepare(args.users)
+    users = get_user_model().objects.count()
+
+    lookups = identifiers(users, args.lookups, args.seed)
+    logins = identifiers(users, args.logins, args.seed + 1)
+    variants = [
+        ('lookup (iexact)', iexact_lookup, lookups),
+        ('lookup (indexed)', find_login_user, lookups),
+        ('login (before)', login_before, logins),
+        ('login', login, logins),
+    ]
+
+    report = {
+        'benchmark': 'login',
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'parameters': {'users': users, 'lookups': args.lookups, 'logins': args.logins, 'seed': args.seed},
+        'plans': {
+            'iexact': query_plan(lookups[0], indexed=False),
+            'indexed': query_plan(lookups[0], indexed=True),
+        },
+        'results': {},
+    }
+    for name, function, sample in variants:
+        print(f'Measuring {name}...', file=sys.stderr)
+        function(sample[0])  # Warm up connection and caches
+        report['results'][name] = measure(function, sample)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"login-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + '\n')
+    print(f'Results written to {output}', file=sys.stderr)
+
+    for name, plan in report['plans'].items():
+        print(f'{name} plan: ' + ' / '.join(line.split(' ', 3)[-1] for line in plan.splitlines()))
+    print(f"{users} users")
+    print(f"{'':>17} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'per s':>8}")
+    for name, stats in report['results'].items():
+        print(
+            f"{name:>17} {stats['mean_ms']:>8.2f} {stats['p50_ms']:>8.2f} "
+            f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['qps']:>8.1f}"
+        )
+    print('(latencies in ms)')
+
+
+if __name__ == '__main__':
+    main()
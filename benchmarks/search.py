@@ -0,0 +1,294 @@
+"""Search Micro-Benchmark for Ayush Bridge
+
+Measures the search hot path - query normalisation, phonetic lookup,
+trigram prefilter, RapidFuzz scoring and result formatting, exactly what
+search_page() computes on a cache miss - against synthetic corpora
+(benchmarks/corpus.py) of several sizes.
+
+For each corpus size it records:
+- Index build time and memory (retained and peak, via tracemalloc)
+- Per-query latency distribution (mean, p50, p95, p99, max) and
+  throughput, for each query kind: exact, prefix, typo
+- Peak memory allocated while answering the queries
+
+The search cache and database are not involved: the index is built in
+memory from the generated rows.
+
+Usage:
+    python -m benchmarks.search                              # 10k and 100k rows
+    python -m benchmarks.search --sizes 10000 100000 1000000 --queries 500
+    python -m benchmarks.search --baseline benchmarks/results/before.json
+    python -m benchmarks.search --results after.json --baseline before.json
+
+Results are written as JSON (default benchmarks/results/search-<time>.json).
+With --baseline, p50 / p95 / p99 latency and throughput are compared and
+the exit status is 1 if any of them regressed by more than --tolerance.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+import numpy  # noqa: E402
+import rapidfuzz  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+from api.search import make_page, rank_query  # noqa: E402
+from api.search_index import SearchIndex  # noqa: E402
+
+from .corpus import QUERY_KINDS, generate_corpus, generate_queries  # noqa: E402
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+# Queries run before timing starts (first-call overhead, CPU caches)
+WARMUP_QUERIES = 20
+
+# Metrics compared against a baseline: (name, True if higher is better)
+COMPARED_METRICS = [('p50_ms', False), ('p95_ms', False), ('p99_ms', False), ('qps', True)]
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+def run_query(query, index, limit):
+    """Answer one query the way search_page() does on a cache miss."""
+    return make_page(index, rank_query(query, index, limit + 1), limit)[0]
+
+
+def summarize(samples, result_counts):
+    """Summarise per-query timings (seconds) as milliseconds and queries/second."""
+    p50, p95, p99 = numpy.percentile(samples, [50, 95, 99]) * 1000
+    return {
+        'count': len(samples),
+        'mean_ms': round(float(numpy.mean(samples)) * 1000, 3),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'max_ms': round(float(max(samples)) * 1000, 3),
+        'qps': round(len(samples) / sum(samples), 1),
+        'mean_results': round(sum(result_counts) / len(result_counts), 2),
+    }
+
+
+def measure_build(rows):
+    """
+    Build a SearchIndex, timing it and then measuring its memory separately.
+
+    tracemalloc slows allocation-heavy code down, so the timed build and
+    the traced build are two different runs.
+
+    Returns:
+        tuple: (SearchIndex, stats dict)
+    """
+    started = time.perf_counter()
+    index = SearchIndex(rows)
+    build_seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    traced = SearchIndex(rows)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del traced
+
+    return index, {
+        'build_seconds': round(build_seconds, 3),
+        'index_bytes': retained,
+        'build_peak_bytes': peak,
+    }
+
+
+def measure_queries(index, queries, limit):
+    """Time every query, grouped by kind, plus one traced pass for memory."""
+    warmup = [query for kind in QUERY_KINDS for query in queries[kind][:WARMUP_QUERIES // len(QUERY_KINDS)]]
+    for query in warmup:
+        run_query(query, index, limit)
+
+    stats = {}
+    all_samples = []
+    all_counts = []
+    for kind in QUERY_KINDS:
+        samples = []
+        counts = []
+        for query in queries[kind]:
+            started = time.perf_counter()
+            results = run_query(query, index, limit)
+            samples.append(time.perf_counter() - started)
+            counts.append(len(results))
+        stats[kind] = summarize(samples, counts)
+        all_samples.extend(samples)
+        all_counts.extend(counts)
+    stats['all'] = summarize(all_samples, all_counts)
+
+    tracemalloc.start()
+    for kind in QUERY_KINDS:
+        for query in queries[kind]:
+            run_query(query, index, limit)
+    query_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return stats, query_peak
+
+
+def benchmark_size(size, query_count, limit, seed):
+    """Run the benchmark for one corpus size."""
+    rows = generate_corpus(size, seed)
+    queries = generate_queries(rows, query_count, seed + 1)
+
+    index, result = measure_build(rows)
+    result = {'size': size, **result}
+    result['queries'], result['query_peak_bytes'] = measure_queries(index, queries, limit)
+    return result
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+def git_commit():
+    """Return the current git commit hash, or None outside a git checkout."""
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def environment():
+    """Describe the machine and library versions a run was made with."""
+    return {
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'rapidfuzz': rapidfuzz.__version__,
+        'numpy': numpy.__version__,
+    }
+
+
+def search_settings():
+    """Return the search settings that affect the measured code path."""
+    return {
+        name: getattr(settings, name, None)
+        for name in (
+            'SEARCH_TRIGRAM_MIN_CORPUS',
+            'SEARCH_TRIGRAM_MIN_QUERY_LENGTH',
+            'SEARCH_TRIGRAM_MIN_OVERLAP',
+        )
+    }
+
+
+def print_results(report):
+    """Print a run as a table."""
+    print(f"{'rows':>9} {'kind':>6} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'qps':>8}")
+    for result in report['results']:
+        for kind, stats in result['queries'].items():
+            print(
+                f"{result['size']:>9} {kind:>6} {stats['mean_ms']:>8.2f} {stats['p50_ms']:>8.2f} "
+                f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['qps']:>8.1f}"
+            )
+        print(
+            f"{'':>9} build {result['build_seconds']:.2f} s, index {result['index_bytes'] / 2**20:.1f} MiB, "
+            f"query peak {result['query_peak_bytes'] / 2**20:.1f} MiB"
+        )
+    print('(latencies in ms)')
+
+
+def compare(baseline, report, tolerance):
+    """
+    Print the change of each compared metric against a baseline run.
+
+    Returns:
+        list[str]: Descriptions of the metrics that regressed by more
+        than ``tolerance`` (a fraction, e.g. 0.1 = 10%)
+    """
+    previous = {result['size']: result for result in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        before = previous.get(result['size'])
+        if before is None:
+            continue
+        for kind, stats in result['queries'].items():
+            old = before['queries'].get(kind)
+            if old is None:
+                continue
+            changes = []
+            for metric, higher_is_better in COMPARED_METRICS:
+                change = (stats[metric] - old[metric]) / old[metric] if old[metric] else 0.0
+                worse = -change if higher_is_better else change
+                flag = ''
+                if worse > tolerance:
+                    flag = ' !'
+                    regressions.append(f"{result['size']} rows / {kind} / {metric}: {change:+.1%}")
+                changes.append(f'{metric} {change:+.1%}{flag}')
+            print(f"{result['size']:>9} {kind:>6}  " + ', '.join(changes))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the search hot path on synthetic corpora.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Corpus sizes (rows)')
+    parser.add_argument('--queries', type=int, default=200, help='Queries per kind (default: 200)')
+    parser.add_argument('--limit', type=int, default=10, help='Results per query (default: 10)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed (default: 0)')
+    parser.add_argument('-o', '--output', help='JSON file to write (default: benchmarks/results/search-<time>.json)')
+    parser.add_argument('--results', help='Compare an existing results file instead of running')
+    parser.add_argument('--baseline', help='Results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Allowed regression (default: 0.1 = 10%%)')
+    args = parser.parse_args(argv)
+
+    if args.results:
+        report = json.loads(Path(args.results).read_text())
+    else:
+        report = {
+            'benchmark': 'search',
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'environment': environment(),
+            'parameters': {
+                'sizes': args.sizes,
+                'queries_per_kind': args.queries,
+                'limit': args.limit,
+                'seed': args.seed,
+                'settings': search_settings(),
+            },
+            'results': [],
+        }
+        for size in args.sizes:
+            print(f'Benchmarking {size} rows...', file=sys.stderr)
+            report['results'].append(benchmark_size(size, args.queries, args.limit, args.seed))
+        # ru_maxrss is in KiB on Linux
+        report['max_rss_bytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+        output = Path(args.output) if args.output else RESULTS_DIR / f"search-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2) + '\n')
+        print(f'Results written to {output}', file=sys.stderr)
+
+    print_results(report)
+
+    if args.baseline:
+        print(f'\nChange against {args.baseline}:')
+        regressions = compare(json.loads(Path(args.baseline).read_text()), report, args.tolerance)
+        if regressions:
+            print('\nRegressions:\n  ' + '\n  '.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
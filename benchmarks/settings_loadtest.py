@@ -0,0 +1,19 @@
+"""
+Django settings for load tests (benchmarks/loadtest.py).
+
+Identical to backend.settings except for the database, so a load test
+never reads or writes the development db.sqlite3.
+"""
+
+from backend.settings import *  # noqa: F401,F403
+from backend.settings import BASE_DIR
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'benchmarks' / 'loadtest.sqlite3',
+        # Concurrent subscribe writes from several workers wait for the
+        # write lock instead of failing immediately
+        'OPTIONS': {'timeout': 20},
+    }
+}
@@ -0,0 +1,9 @@
+"""
+Gunicorn configuration, loaded automatically by `gunicorn backend.wsgi`
+when started from the project root.
+
+Only adds the metrics hooks; bind, workers etc. keep gunicorn's defaults
+(or $PORT / WEB_CONCURRENCY / command line options as before).
+"""
+
+from backend.gunicorn_metrics import child_exit, on_exit, on_starting  # noqa: F401
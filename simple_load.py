@@ -1,4 +1,3 @@
-import csv
 import os
 import django
 
@@ -6,6 +5,8 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings') # Change 'backend' if your project folder is named 'ayush_project'
 django.setup()
 
+from django.core.management import call_command
+
 from api.models import Diagnosis
 
 def run_import():
@@ -17,32 +18,10 @@ def run_import():
 
     print("✅ Found file! Importing data...")
     
-    with open(file_path, 'r', encoding='utf-8') as file:
-        reader = csv.reader(file)
-        
-        # Skip the first row (headers)
-        next(reader, None)
-
-        count = 0
-        for row in reader:
-            # Skip empty lines or Series headers
-            if not row or row[0].startswith("---"):
-                continue
-            
-            # Ensure the row has enough columns (term, namaste, icd)
-            if len(row) >= 3:
-                obj, created = Diagnosis.objects.get_or_create(
-                    term=row[0],
-                    defaults={
-                        'namaste_code': row[1],
-                        'icd_code': row[2]
-                    }
-                )
-                if created:
-                    count += 1
-                    print(f"   Added: {row[0]}")
+    # Batched, transactional import (see api/management/commands/import_diagnoses.py)
+    call_command('import_diagnoses', file_path)
 
     print(f"\n🎉 SUCCESS: Database now has {Diagnosis.objects.count()} total records!")
 
 if __name__ == '__main__':
-    run_import()
\ No newline at end of file
+    run_import()